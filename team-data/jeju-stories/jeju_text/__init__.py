@@ -0,0 +1,7 @@
+"""
+제주 설화 텍스트 처리 공용 모듈 (tools/converters와 scripts가 함께 사용)
+"""
+
+from .keyword_automaton import KeywordAutomaton, KeywordStream
+
+__all__ = ['KeywordAutomaton', 'KeywordStream']
@@ -0,0 +1,110 @@
+"""
+Aho-Corasick 다중 키워드 매칭
+변환기(tools/converters)의 텍스트 분석/분류기와 학습 데이터 스크립트(scripts)의
+가제티어/문체 변환이 함께 쓰는 키워드 오토마톤
+"""
+
+from collections import deque
+
+
+class KeywordAutomaton:
+    """Aho-Corasick 다중 키워드 매칭 오토마톤
+
+    겹치는 매치를 포함해 모든 키워드 출현을 한 번의 스캔으로 보고한다.
+    같은 키워드를 여러 값(라벨)으로 등록할 수 있다.
+    """
+
+    def __init__(self, entries=None):
+        """
+        Args:
+            entries: (키워드, 값) 쌍 목록 (선택)
+        """
+        self._goto = [{}]
+        self._fail = [0]
+        self._own = [[]]  # 노드에서 끝나는 키워드
+        self._out = [[]]  # 실패 링크를 따라 합친 출력 (build 후)
+        self._size = 0
+        self._built = True
+
+        for keyword, value in entries or []:
+            self.add(keyword, value)
+
+    def __len__(self):
+        return self._size
+
+    def add(self, keyword: str, value=None):
+        """키워드 등록 (등록 후 첫 검색 전에 실패 링크를 다시 계산)"""
+        if not keyword:
+            raise ValueError("빈 키워드는 등록할 수 없습니다")
+
+        state = 0
+        for ch in keyword:
+            nxt = self._goto[state].get(ch)
+            if nxt is None:
+                nxt = len(self._goto)
+                self._goto.append({})
+                self._fail.append(0)
+                self._own.append([])
+                self._goto[state][ch] = nxt
+            state = nxt
+
+        self._own[state].append((keyword, value))
+        self._size += 1
+        self._built = False
+
+    def build(self):
+        """BFS로 실패 링크와 출력 목록 계산"""
+        goto, fail = self._goto, self._fail
+        out = [list(own) for own in self._own]
+
+        queue = deque()
+        for nxt in goto[0].values():
+            fail[nxt] = 0
+            queue.append(nxt)
+
+        while queue:
+            state = queue.popleft()
+            for ch, nxt in goto[state].items():
+                queue.append(nxt)
+                f = fail[state]
+                while f and ch not in goto[f]:
+                    f = fail[f]
+                fail[nxt] = goto[f].get(ch, 0)
+                out[nxt] += out[fail[nxt]]
+
+        self._out = out
+        self._built = True
+
+    def iter_matches(self, text: str):
+        """(start, end, keyword, value)를 끝 위치 순서로 생성"""
+        return self.stream().feed(text)
+
+    def stream(self):
+        """텍스트를 조각으로 나눠 넣어도 한 번에 넣은 것과 같은 매치를 내는 스캐너"""
+        if not self._built:
+            self.build()
+        return KeywordStream(self)
+
+
+class KeywordStream:
+    """KeywordAutomaton 상태와 전체 텍스트 기준 위치를 조각 사이에 이어 가는 스캐너"""
+
+    def __init__(self, automaton: KeywordAutomaton):
+        self._automaton = automaton
+        self.state = 0
+        self.offset = 0  # 지금까지 넣은 글자 수
+
+    def feed(self, text: str):
+        """조각을 스캔하여 (start, end, keyword, value) 생성 (위치는 전체 텍스트 기준)"""
+        goto, fail, out = self._automaton._goto, self._automaton._fail, self._automaton._out
+        state, offset = self.state, self.offset
+        for i, ch in enumerate(text):
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0)
+            if out[state]:
+                end = offset + i + 1
+                for keyword, value in out[state]:
+                    yield end - len(keyword), end, keyword, value
+        self.state = state
+        self.offset = offset + len(text)
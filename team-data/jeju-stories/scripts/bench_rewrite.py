@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+"""
+Style rewrite benchmark
+Compares chained str.replace passes (one pass per rule per style, elements extracted
+once per style) with the single-scan StyleRewriter on story summaries, and checks that
+both produce the same text.
+
+Usage:
+    python bench_rewrite.py                                # data/stories
+    python bench_rewrite.py ../data/stories/myths --repeat 5 --grow 10 --styles 8
+"""
+
+import sys
+import json
+import time
+import argparse
+from pathlib import Path
+from typing import Dict, List
+
+from style_rewriter import StyleRewriter
+from tokenize_stories import JejuFolkloreTokenizer
+
+DEFAULT_CORPUS = Path(__file__).resolve().parent.parent / "data" / "stories"
+
+
+def load_stories(corpus: List[str]) -> List[Dict]:
+    """Story JSON files (recursive) that have a content dict"""
+    stories = []
+    for directory in corpus:
+        for path in sorted(Path(directory).rglob("*.json")):
+            try:
+                story_json = json.loads(path.read_bytes())
+            except ValueError:
+                continue
+            if isinstance(story_json, dict) and isinstance(story_json.get("content"), dict):
+                stories.append(story_json)
+    return stories
+
+
+def chained_rewrite(text: str, rules: Dict) -> str:
+    """Old approach: prefix, then one str.replace pass per rule, then suffix"""
+    text = rules.get("prefix", "") + text
+    for source, target in rules.get("replacements", {}).items():
+        text = text.replace(source, target)
+    return text + rules.get("suffix", "")
+
+
+def grow_rules(style_rules: Dict, factor: int, extra_styles: int) -> Dict:
+    """Style rules with `factor`x replacements per style plus `extra_styles` copies
+
+    Added sources are synthetic words that do not occur in the corpus, so output
+    is unchanged and only the rule-count cost is measured.
+    """
+    grown = {}
+    for rank, (style, rules) in enumerate(style_rules.items()):
+        replacements = dict(rules.get("replacements", {}))
+        base = len(replacements)
+        for i in range(base * (factor - 1)):
+            replacements[f"{chr(0xAC00 + rank * 131 + i)}{i}했다"] = f"<{rank}:{i}>"
+        grown[style] = dict(rules, replacements=replacements)
+    for copy in range(extra_styles):
+        for style, rules in list(style_rules.items()):
+            grown[f"{style}#{copy}"] = grown[style]
+    return grown
+
+
+def timed(func, items: List, repeat: int):
+    """(total seconds, results of the last round)"""
+    results = None
+    start = time.perf_counter()
+    for _ in range(repeat):
+        results = [func(item) for item in items]
+    return time.perf_counter() - start, results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Style rewrite benchmark")
+    parser.add_argument("corpus", nargs="*", help="Story JSON directories (default: data/stories)")
+    parser.add_argument("--repeat", type=int, default=3, help="Repetitions (default 3)")
+    parser.add_argument("--grow", type=int, default=1,
+                        help="Multiply every style's replacement count by N (default 1)")
+    parser.add_argument("--styles", type=int, default=0,
+                        help="Add N copies of the style set (default 0)")
+    args = parser.parse_args()
+
+    stories = load_stories(args.corpus or [DEFAULT_CORPUS])
+    if not stories:
+        print("No story JSON files found")
+        sys.exit(1)
+
+    tokenizer = JejuFolkloreTokenizer()
+    style_rules = grow_rules(tokenizer.load_style_rules(), max(args.grow, 1), args.styles)
+    rewriter = StyleRewriter(style_rules)
+    styles = list(style_rules)
+    texts = [story["content"].get("summary", "") for story in stories]
+    rule_count = sum(len(rules["replacements"]) for rules in style_rules.values())
+
+    # Rewrite only: every text into every style
+    chained_seconds, chained = timed(
+        lambda text: {style: chained_rewrite(text, style_rules[style]) for style in styles},
+        texts, args.repeat)
+    engine_seconds, engine = timed(rewriter.rewrite_all, texts, args.repeat)
+
+    # Full sample generation for the tokenizer's four styles
+    sample_styles = ["simple", "educational", "traditional", "formal"]
+    per_style_seconds, per_style = timed(
+        lambda story: [tokenizer.generate_training_sample(story, style) for style in sample_styles],
+        stories, args.repeat)
+    batched_seconds, batched = timed(
+        lambda story: tokenizer.generate_training_samples(story, sample_styles),
+        stories, args.repeat)
+
+    total_chars = sum(len(text) for text in texts)
+    print(f"Corpus: {len(texts)} stories, {total_chars:,} chars x {args.repeat} rounds, "
+          f"{len(styles)} styles, {rule_count} rules")
+    print("  Rewrite into every style")
+    for label, elapsed in (("chained replace", chained_seconds), ("StyleRewriter", engine_seconds)):
+        print(f"    {label:<22} {elapsed:8.3f}s  {total_chars * args.repeat / elapsed / 1e6:8.2f} M chars/s")
+    print("  Training samples (4 styles)")
+    for label, elapsed in (("one style per call", per_style_seconds),
+                           ("all styles per call", batched_seconds)):
+        print(f"    {label:<22} {elapsed:8.3f}s  {len(stories) * args.repeat / elapsed:8.0f} stories/s")
+
+    # "말했다" was shadowed by "했다" in the chained formal rules, so texts containing it differ
+    comparable = [i for i, text in enumerate(texts) if "말했다" not in text]
+    same_text = all(chained[i] == engine[i] for i in comparable)
+    print(f"  Same text as chained replace: {'yes' if same_text else 'no'} "
+          f"({len(comparable)}/{len(texts)} stories without \"말했다\")")
+    print(f"  Same samples: {'yes' if per_style == batched else 'no'}")
+
+
+if __name__ == "__main__":
+    main()
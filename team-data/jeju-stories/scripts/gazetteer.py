@@ -0,0 +1,186 @@
+#!/usr/bin/env python3
+"""
+Jeju Folklore Gazetteer
+Maps character / place / plot surface forms to training tokens with a single
+Aho-Corasick pass over the text (KeywordAutomaton from the shared jeju_text package)
+
+Sources, in priority order (the first source to register a surface form wins):
+  1. JejuFolkloreTokenizer.token_definitions (curated tokens)
+  2. data/locations/*/spots.json   -> [LOC:<grid_id>:<spot_id>]
+  3. data/locations/*/grids.json   -> [LOC:<grid_id>:Area]
+  4. story JSON elements           -> [CHR:<name>:<role>] / [LOC:<name>:<type>]
+
+Loaded (non-curated) surface forms shorter than `min_length` characters are skipped,
+since one-syllable words like "개" would match inside almost any text.
+"""
+
+import re
+import json
+from pathlib import Path
+from typing import Dict, List, Iterable, NamedTuple
+
+from jeju_text import KeywordAutomaton
+
+# Token dictionary section -> gazetteer category
+SECTION_CATEGORIES = {
+    "characters": "character",
+    "locations": "location",
+    "plot_elements": "plot"
+}
+
+OVERLAP_RULES = ("longest", "all")
+
+
+class GazetteerHit(NamedTuple):
+    start: int
+    end: int
+    surface: str
+    category: str
+    token: str
+
+
+class Gazetteer:
+    """Surface form -> token dictionary compiled into one keyword automaton"""
+
+    def __init__(self, min_length: int = 2):
+        """
+        Args:
+            min_length: minimum surface length for entries loaded from data files
+        """
+        self.min_length = min_length
+        self.entries: Dict[str, tuple] = {}  # surface -> (category, token)
+        self.automaton = KeywordAutomaton()
+
+    def __len__(self):
+        return len(self.entries)
+
+    def add(self, surface: str, category: str, token: str, min_length: int = 1) -> bool:
+        """Register a surface form (ignored if too short or already registered)"""
+        surface = surface.strip()
+        if len(surface) < max(min_length, 1) or surface in self.entries:
+            return False
+        self.entries[surface] = (category, token)
+        self.automaton.add(surface, (category, token))
+        return True
+
+    @staticmethod
+    def surface_forms(name: str) -> List[str]:
+        """Name plus aliases: "우도 (소섬)" -> ["우도", "소섬"], "송당리·덕천리 일대" -> ["송당리", "덕천리"]
+
+        Parenthesized notes with digits ("오름 (360여 개)") are not aliases.
+        """
+        forms = []
+        for alias in re.findall(r'\(([^)]*)\)', name):
+            if not re.search(r'\d', alias):
+                forms.append(alias)
+        base = re.sub(r'\([^)]*\)', '', name)
+        base = re.sub(r'\s*일대$', '', base.strip())
+        forms[:0] = re.split(r'[·,/]', base)
+        return [form.strip() for form in forms if form.strip()]
+
+    def add_token_definitions(self, token_definitions: Dict):
+        """Curated tokens from JejuFolkloreTokenizer.load_token_definitions()"""
+        for section, category in SECTION_CATEGORIES.items():
+            for surface, token in token_definitions.get(section, {}).items():
+                self.add(surface, category, token)
+
+    def load_spots(self, path) -> int:
+        """spots.json -> one [LOC:<grid_id>:<spot_id>] token per spot (name and aliases)"""
+        with open(path, 'r', encoding='utf-8') as f:
+            spots = json.load(f).get("spots", [])
+        added = 0
+        for spot in spots:
+            token = f"[LOC:{spot['grid_id']}:{spot['spot_id']}]"
+            for form in self.surface_forms(spot.get("name", "")):
+                added += self.add(form, "location", token, self.min_length)
+        return added
+
+    def load_grids(self, path) -> int:
+        """grids.json -> [LOC:<grid_id>:Area] for every village in the grid's area name"""
+        with open(path, 'r', encoding='utf-8') as f:
+            grids = json.load(f).get("grids", [])
+        added = 0
+        for grid in grids:
+            token = f"[LOC:{grid['grid_id']}:Area]"
+            for form in self.surface_forms(grid.get("area_name", "")):
+                added += self.add(form, "location", token, self.min_length)
+        return added
+
+    def load_locations_dir(self, locations_dir) -> int:
+        """All data/locations/<region>/spots.json and grids.json (spots first)"""
+        root = Path(locations_dir)
+        added = 0
+        for path in sorted(root.glob("*/spots.json")):
+            added += self.load_spots(path)
+        for path in sorted(root.glob("*/grids.json")):
+            added += self.load_grids(path)
+        return added
+
+    def add_story_elements(self, story_json: Dict) -> int:
+        """Characters and locations listed in a story's `elements` field"""
+        elements = story_json.get("elements", {})
+        added = 0
+        for character in elements.get("characters", []):
+            if isinstance(character, str):
+                character = {"name": character}
+            forms = self.surface_forms(character.get("name", ""))
+            if not forms:
+                continue
+            token = f"[CHR:{forms[0]}:{character.get('role') or 'Story'}]"
+            for form in forms:
+                added += self.add(form, "character", token, self.min_length)
+        for location in elements.get("locations", []):
+            if isinstance(location, str):
+                location = {"name": location}
+            forms = self.surface_forms(location.get("name", ""))
+            if not forms:
+                continue
+            token = f"[LOC:{forms[0]}:{location.get('type') or 'Story'}]"
+            for form in forms:
+                added += self.add(form, "location", token, self.min_length)
+        return added
+
+    def load_story_elements(self, stories_dir) -> int:
+        """`elements` of every story JSON under a directory (recursive)"""
+        added = 0
+        for path in sorted(Path(stories_dir).rglob("*.json")):
+            try:
+                with open(path, 'r', encoding='utf-8') as f:
+                    story_json = json.load(f)
+            except ValueError:
+                continue
+            if isinstance(story_json, dict):
+                added += self.add_story_elements(story_json)
+        return added
+
+    def find(self, text: str, overlap: str = "longest") -> List[GazetteerHit]:
+        """Token hits in text order from a single scan
+
+        Args:
+            overlap: "longest" - leftmost-longest, non-overlapping (e.g. "설문대할망" wins
+                     over "할망" inside it); "all" - every hit, including nested ones
+        """
+        return self.find_parts([text], overlap=overlap)
+
+    def find_parts(self, parts: Iterable[str], overlap: str = "longest",
+                   sep: str = " ") -> List[GazetteerHit]:
+        """Like find(sep.join(parts)) without building the joined string"""
+        if overlap not in OVERLAP_RULES:
+            raise ValueError(f"Unknown overlap rule: {overlap} (expected one of {OVERLAP_RULES})")
+
+        stream = self.automaton.stream()
+        hits = []
+        for i, part in enumerate(parts):
+            if i:
+                hits.extend(stream.feed(sep))
+            hits.extend(stream.feed(part))
+
+        hits.sort(key=lambda hit: (hit[0], hit[0] - hit[1]))
+        result = []
+        last_end = 0
+        for start, end, surface, (category, token) in hits:
+            if overlap == "longest" and start < last_end:
+                continue
+            result.append(GazetteerHit(start, end, surface, category, token))
+            last_end = max(last_end, end)
+        return result
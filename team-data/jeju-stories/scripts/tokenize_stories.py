@@ -7,12 +7,38 @@ Converts raw story JSON files into tokenized training data for controlled genera
 import json
 import re
 import os
-from typing import Dict, List, Any
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Any, Iterable, Iterator, Tuple
 from pathlib import Path
 
+from gazetteer import Gazetteer
+from style_rewriter import StyleRewriter
+from training_shards import ShardWriter, DEFAULT_SHARD_BYTES
+from training_stats import TrainingStats
+
+TRAINING_DATA_NAME = "jeju_folklore_training_data"
+TOKEN_SYSTEM_VERSION = "1.0"
+
+# Gazetteer category -> extract_story_elements key
+ELEMENT_KEYS = {
+    "character": "characters",
+    "location": "locations",
+    "plot": "plot_points"
+}
+
 class JejuFolkloreTokenizer:
-    def __init__(self):
+    def __init__(self, locations_dir: str = None, stories_dir: str = None):
+        """
+        Args:
+            locations_dir: data/locations root; adds spots.json / grids.json tokens to the gazetteer
+            stories_dir: story JSON directory whose `elements` are added to the gazetteer
+        """
+        # Kept so worker processes can rebuild an identical tokenizer
+        self.init_kwargs = {"locations_dir": locations_dir, "stories_dir": stories_dir}
         self.token_definitions = self.load_token_definitions()
+        self.gazetteer = self.build_gazetteer(locations_dir, stories_dir)
+        self.rewriter = StyleRewriter(self.load_style_rules())
         
     def load_token_definitions(self) -> Dict:
         """Load predefined token categories and mappings"""
@@ -49,6 +75,16 @@ class JejuFolkloreTokenizer:
             }
         }
     
+    def build_gazetteer(self, locations_dir: str = None, stories_dir: str = None) -> Gazetteer:
+        """Compile curated tokens (highest priority) plus optional gazetteer sources"""
+        gazetteer = Gazetteer()
+        gazetteer.add_token_definitions(self.token_definitions)
+        if locations_dir:
+            gazetteer.load_locations_dir(locations_dir)
+        if stories_dir:
+            gazetteer.load_story_elements(stories_dir)
+        return gazetteer
+    
     def extract_story_elements(self, story_json: Dict) -> Dict:
         """Extract tokenizable elements from a story JSON"""
         elements = {
@@ -58,31 +94,22 @@ class JejuFolkloreTokenizer:
             "cultural_markers": []
         }
         
-        # Extract content text for analysis
-        content_text = ""
+        # Content text parts for analysis (scanned in place, not concatenated)
+        content_parts = []
         if "content" in story_json:
             if "summary" in story_json["content"]:
-                content_text += story_json["content"]["summary"] + " "
+                content_parts.append(story_json["content"]["summary"])
             
             if "episodes" in story_json["content"]:
                 for episode in story_json["content"]["episodes"]:
                     if "content" in episode:
-                        content_text += episode["content"] + " "
-        
-        # Character detection
-        for char_name, token in self.token_definitions["characters"].items():
-            if char_name in content_text:
-                elements["characters"].append(token)
+                        content_parts.append(episode["content"])
         
-        # Location detection  
-        for loc_name, token in self.token_definitions["locations"].items():
-            if loc_name in content_text:
-                elements["locations"].append(token)
-                
-        # Plot element detection
-        for plot_keyword, token in self.token_definitions["plot_elements"].items():
-            if plot_keyword in content_text:
-                elements["plot_points"].append(token)
+        # Character / location / plot detection: one gazetteer pass, tokens in text order
+        for hit in self.gazetteer.find_parts(content_parts):
+            found = elements[ELEMENT_KEYS[hit.category]]
+            if hit.token not in found:
+                found.append(hit.token)
         
         # Cultural markers
         if "cultural_significance" in story_json.get("content", {}):
@@ -114,107 +141,101 @@ class JejuFolkloreTokenizer:
         
         return " ".join(prompt_parts)
     
-    def rewrite_for_style(self, original_text: str, target_style: str) -> str:
-        """Rewrite story content for different target audiences"""
-        
-        if target_style == "[STYLE:Child:3-5]":
-            # Simplify language for preschoolers
-            simplified = self.simplify_language(original_text)
-            return self.add_child_friendly_elements(simplified)
-            
-        elif target_style == "[STYLE:Child:6-10]":
-            # Educational version for elementary age
-            return self.add_educational_elements(original_text)
-            
-        elif target_style == "[STYLE:Elder:Traditional]":
-            # Traditional storytelling format
-            return self.add_traditional_storytelling_markers(original_text)
-            
-        elif target_style == "[STYLE:Academic:Formal]":
+    def load_style_rules(self) -> Dict:
+        """Per-style rewrite rules, keyed by style token
+
+        Replacements are applied in one leftmost-longest pass (see style_rewriter.py);
+        prefix/suffix are added around the rewritten text.
+        """
+        return {
+            # Simplified language and engaging elements for preschoolers
+            "[STYLE:Child:3-5]": {
+                "prefix": "옛날에 ",
+                "suffix": " 정말 멋진 이야기죠?",
+                "replacements": {
+                    "설문대할망": "아주 큰 할머니",
+                    "창조했다": "만들었어요",
+                    "형성했다": "만들어졌어요",
+                    "거대한": "아주 큰",
+                    "신비로운": "신기한",
+                    ".": "요!",
+                    "했다": "했답니다"
+                }
+            },
+            # Questions and learning prompts for elementary age children
+            "[STYLE:Child:6-10]": {
+                "prefix": "알고 있니? ",
+                "suffix": " 어떻게 생각해?",
+                "replacements": {
+                    ".": "이에요.",
+                    "했다": "했어요"
+                }
+            },
+            # Traditional Korean storytelling markers
+            "[STYLE:Elder:Traditional]": {
+                "prefix": "옛적에 ",
+                "replacements": {
+                    "했다": "했습니다",
+                    "이다": "입니다"
+                }
+            },
             # Formal, scholarly tone
-            return self.add_formal_academic_tone(original_text)
-            
-        else:
-            return original_text
-    
-    def simplify_language(self, text: str) -> str:
-        """Convert complex text to child-friendly language"""
-        # Replace complex words with simpler alternatives
-        replacements = {
-            "설문대할망": "아주 큰 할머니",
-            "창조했다": "만들었어요",
-            "형성했다": "만들어졌어요", 
-            "거대한": "아주 큰",
-            "신비로운": "신기한"
+            "[STYLE:Academic:Formal]": {
+                "replacements": {
+                    "말했다": "기술되어 있습니다",
+                    "했다": "한 것으로 전승됩니다",
+                    "이다": "로 여겨집니다"
+                }
+            }
         }
-        
-        result = text
-        for complex_word, simple_word in replacements.items():
-            result = result.replace(complex_word, simple_word)
-            
-        return result
-    
-    def add_child_friendly_elements(self, text: str) -> str:
-        """Add engaging elements for young children"""
-        # Add excitement and direct address
-        text = "옛날에 " + text
-        text = text.replace(".", "요!")
-        text = text.replace("했다", "했답니다")
-        return text + " 정말 멋진 이야기죠?"
-    
-    def add_educational_elements(self, text: str) -> str:
-        """Add educational elements for elementary age children"""
-        # Add questions and learning prompts
-        text = "알고 있니? " + text
-        text = text.replace(".", "이에요.")
-        text = text.replace("했다", "했어요")
-        return text + " 어떻게 생각해?"
-    
-    def add_traditional_storytelling_markers(self, text: str) -> str:
-        """Add traditional Korean storytelling elements"""
-        # Use formal storytelling language
-        text = "옛적에 " + text
-        text = text.replace("했다", "했습니다")
-        text = text.replace("이다", "입니다")
-        return text
-    
-    def add_formal_academic_tone(self, text: str) -> str:
-        """Convert to formal academic writing style"""
-        # Use scholarly language
-        text = text.replace("했다", "한 것으로 전승됩니다")
-        text = text.replace("이다", "로 여겨집니다")
-        text = text.replace("말했다", "기술되어 있습니다")
-        return text
-    
+
+    def rewrite_for_style(self, original_text: str, target_style: str) -> str:
+        """Rewrite story content for different target audiences"""
+        return self.rewriter.rewrite(original_text, target_style)
+
+    def rewrite_for_styles(self, original_text: str, target_styles: List[str]) -> Dict[str, str]:
+        """Rewrite story content for several target styles from a single scan"""
+        return self.rewriter.rewrite_all(original_text, target_styles)
+
     def generate_training_sample(self, story_json: Dict, target_style: str) -> Dict:
         """Generate a complete training sample from a story"""
+        return self.generate_training_samples(story_json, [target_style])[0]
+
+    def generate_training_samples(self, story_json: Dict, target_styles: List[str]) -> List[Dict]:
+        """Generate one training sample per target style
+
+        Story elements are extracted once and the base content is rewritten into
+        every style from one scan.
+        """
         
         # Extract story elements
         elements = self.extract_story_elements(story_json)
         
-        # Generate tokenized prompt
-        prompt = self.generate_tokenized_prompt(elements, target_style)
-        
         # Get base content
         base_content = ""
         if "content" in story_json and "summary" in story_json["content"]:
             base_content = story_json["content"]["summary"]
         
-        # Rewrite for target style
-        styled_content = self.rewrite_for_style(base_content, self.token_definitions["styles"][target_style])
-        
-        return {
-            "id": f"{story_json.get('id', 'unknown')}_{target_style}",
-            "prompt": prompt,
-            "response": styled_content,
-            "metadata": {
-                "source_story": story_json.get("id", "unknown"),
-                "target_style": target_style,
-                "extracted_elements": elements,
-                "cultural_context": story_json.get("content", {}).get("cultural_significance", []),
-                "complexity_score": self.calculate_complexity_score(styled_content)
-            }
-        }
+        # Rewrite for all target styles
+        style_tokens = [self.token_definitions["styles"][style] for style in target_styles]
+        styled = self.rewrite_for_styles(base_content, style_tokens)
+        
+        samples = []
+        for target_style, style_token in zip(target_styles, style_tokens):
+            styled_content = styled[style_token]
+            samples.append({
+                "id": f"{story_json.get('id', 'unknown')}_{target_style}",
+                "prompt": self.generate_tokenized_prompt(elements, target_style),
+                "response": styled_content,
+                "metadata": {
+                    "source_story": story_json.get("id", "unknown"),
+                    "target_style": target_style,
+                    "extracted_elements": elements,
+                    "cultural_context": story_json.get("content", {}).get("cultural_significance", []),
+                    "complexity_score": self.calculate_complexity_score(styled_content)
+                }
+            })
+        return samples
     
     def calculate_complexity_score(self, text: str) -> int:
         """Calculate text complexity for training weighting"""
@@ -235,91 +256,181 @@ class JejuFolkloreTokenizer:
         with open(story_file_path, 'r', encoding='utf-8') as f:
             story_json = json.load(f)
         
-        training_samples = []
-        
         # Generate samples for different styles
         styles = ["simple", "educational", "traditional", "formal"]
         
-        for style in styles:
-            sample = self.generate_training_sample(story_json, style)
-            training_samples.append(sample)
-        
-        return training_samples
+        return self.generate_training_samples(story_json, styles)
     
-    def process_all_stories(self, input_dir: str, output_dir: str):
-        """Process all story files in a directory"""
+    def process_all_stories(self, input_dir: str, output_dir: str, workers: int = 1,
+                            output_format: str = "json", shard_bytes: int = DEFAULT_SHARD_BYTES):
+        """Process all story files in a directory
+
+        Samples are streamed to disk as each story is processed, and statistics are
+        accumulated from the same stream, so memory stays flat regardless of corpus size.
+
+        Args:
+            workers: number of worker processes (1 = process in this process)
+            output_format: "jsonl" writes one sample per line as it is produced;
+                           "json" additionally assembles the consolidated document
+                           (same layout as before) from that stream at the end;
+                           "shards" writes size-bounded JSONL shards plus a binary
+                           offset index for random access (see training_shards.py)
+            shard_bytes: shard size limit for "shards"
+        """
         
         input_path = Path(input_dir)
         output_path = Path(output_dir)
         output_path.mkdir(exist_ok=True)
         
-        all_training_data = []
+        story_files = sorted(input_path.glob("*.json"))
+        
+        stats = TrainingStats()
+        jsonl_file = output_path / f"{TRAINING_DATA_NAME}.jsonl"
         
-        # Process each JSON file
-        for json_file in input_path.glob("*.json"):
-            print(f"Processing {json_file.name}...")
+        if output_format == "shards":
+            sink = ShardWriter(output_path, TRAINING_DATA_NAME, shard_bytes)
+            write_sample = sink.write
+        else:
+            sink = open(jsonl_file, 'w', encoding='utf-8')
             
-            try:
-                training_samples = self.process_story_file(str(json_file))
-                all_training_data.extend(training_samples)
+            def write_sample(sample: Dict):
+                sink.write(json.dumps(sample, ensure_ascii=False) + "\n")
+        
+        # Stream samples to disk as stories finish (input order is preserved)
+        with sink:
+            for json_file, samples, error in self.iter_story_samples(story_files, workers):
+                print(f"Processing {json_file.name}...")
+                
+                if error is not None:
+                    print(f"Error processing {json_file.name}: {error}")
+                    continue
                 
-            except Exception as e:
-                print(f"Error processing {json_file.name}: {e}")
-                continue
+                for sample in samples:
+                    write_sample(sample)
+                    stats.add(sample)
+        
+        metadata = {
+            "total_samples": stats.total_samples,
+            "source_stories": len(story_files),
+            "generation_date": "2025-12-03",
+            "token_system_version": TOKEN_SYSTEM_VERSION
+        }
         
-        # Save consolidated training data
-        output_file = output_path / "jeju_folklore_training_data.json"
-        with open(output_file, 'w', encoding='utf-8') as f:
-            json.dump({
-                "metadata": {
-                    "total_samples": len(all_training_data),
-                    "source_stories": len(list(input_path.glob("*.json"))),
-                    "generation_date": "2025-12-03",
-                    "token_system_version": "1.0"
-                },
-                "training_samples": all_training_data
-            }, f, ensure_ascii=False, indent=2)
+        if output_format == "shards":
+            output_file = sink.close(metadata)
+        elif output_format == "json":
+            # Save consolidated training data (built from the stream, not from memory)
+            output_file = output_path / f"{TRAINING_DATA_NAME}.json"
+            self.write_consolidated_json(jsonl_file, output_file, metadata)
+            jsonl_file.unlink()
+        else:
+            output_file = jsonl_file
+            with open(output_path / f"{TRAINING_DATA_NAME}.meta.json", 'w', encoding='utf-8') as f:
+                json.dump(metadata, f, ensure_ascii=False, indent=2)
         
-        print(f"Generated {len(all_training_data)} training samples")
+        print(f"Generated {stats.total_samples} training samples")
         print(f"Saved to {output_file}")
         
-        # Generate summary statistics
-        self.generate_statistics_report(all_training_data, output_path)
+        # Save summary statistics
+        self.save_statistics(stats, output_path)
     
-    def generate_statistics_report(self, training_data: List[Dict], output_dir: Path):
-        """Generate a report on the training data characteristics"""
-        
-        stats = {
-            "total_samples": len(training_data),
-            "style_distribution": {},
-            "complexity_distribution": {},
-            "character_frequency": {},
-            "location_frequency": {}
-        }
-        
-        for sample in training_data:
-            # Style distribution
-            style = sample["metadata"]["target_style"]
-            stats["style_distribution"][style] = stats["style_distribution"].get(style, 0) + 1
+    def iter_story_samples(self, story_files: List[Path],
+                           workers: int = 1) -> Iterator[Tuple[Path, List[Dict], Any]]:
+        """Yield (story_file, samples, error) in input order
+
+        With workers > 1 stories are processed in a process pool; results are
+        still yielded in input order so the output is identical to a serial run.
+        """
+        if workers <= 1 or len(story_files) <= 1:
+            for json_file in story_files:
+                yield (json_file,) + _process_story_safely(self, str(json_file))
+            return
+        
+        # Hand out several stories per task so small files don't drown in IPC overhead
+        chunksize = max(1, len(story_files) // (workers * 4))
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                 initargs=(self.init_kwargs,)) as executor:
+            results = executor.map(_process_story_in_worker,
+                                   [str(f) for f in story_files], chunksize=chunksize)
+            for json_file, (samples, error) in zip(story_files, results):
+                yield json_file, samples, error
+    
+    @staticmethod
+    def write_consolidated_json(jsonl_file: Path, output_file: Path, metadata: Dict):
+        """Write the {"metadata", "training_samples"} document from a JSONL stream
+
+        Output is byte-identical to json.dump(..., indent=2) of the whole document,
+        but only one sample is held in memory at a time.
+        """
+        with open(jsonl_file, 'r', encoding='utf-8') as src, \
+                open(output_file, 'w', encoding='utf-8') as f:
+            header = json.dumps({"metadata": metadata}, ensure_ascii=False, indent=2)
+            f.write(header[:-2] + ',\n  "training_samples": [')
             
-            # Complexity distribution
-            complexity = sample["metadata"]["complexity_score"]
-            stats["complexity_distribution"][complexity] = stats["complexity_distribution"].get(complexity, 0) + 1
-        
-        # Save statistics report
-        stats_file = output_dir / "training_statistics.json"
-        with open(stats_file, 'w', encoding='utf-8') as f:
-            json.dump(stats, f, ensure_ascii=False, indent=2)
-        
+            count = 0
+            for line in src:
+                sample = json.dumps(json.loads(line), ensure_ascii=False, indent=2)
+                f.write(",\n" if count else "\n")
+                f.write("\n".join("    " + part for part in sample.split("\n")))
+                count += 1
+            
+            f.write("\n  ]\n}" if count else "]\n}")
+    
+    def save_statistics(self, stats: TrainingStats, output_dir: Path):
+        """Save the statistics report"""
+        stats_file = stats.save(output_dir / "training_statistics.json")
         print(f"Statistics report saved to {stats_file}")
+    
+    def generate_statistics_report(self, training_data: Iterable[Dict], output_dir: Path):
+        """Generate a report on the training data characteristics"""
+        self.save_statistics(TrainingStats.from_samples(training_data), output_dir)
+
+def _process_story_safely(tokenizer: JejuFolkloreTokenizer, story_file: str) -> Tuple[List[Dict], Any]:
+    """Return (samples, None) or ([], error message) so failures cross process boundaries"""
+    try:
+        return tokenizer.process_story_file(story_file), None
+    except Exception as e:
+        return [], str(e)
+
+
+_worker_tokenizer = None
+
+
+def _init_worker(tokenizer_kwargs: Dict):
+    """Build the tokenizer (and its gazetteer) once per worker process"""
+    global _worker_tokenizer
+    _worker_tokenizer = JejuFolkloreTokenizer(**tokenizer_kwargs)
+
+
+def _process_story_in_worker(story_file: str) -> Tuple[List[Dict], Any]:
+    return _process_story_safely(_worker_tokenizer, story_file)
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Jeju folklore story -> training data tokenizer")
+    parser.add_argument("--input", "-i", default="../cleaned/stories/myths/",
+                        help="Directory of story JSON files")
+    parser.add_argument("--output", "-o", default="./training_data/",
+                        help="Output directory for training data and statistics")
+    parser.add_argument("--workers", "-w", type=int, default=1,
+                        help="Number of worker processes (default 1)")
+    parser.add_argument("--format", choices=["json", "jsonl", "shards"], default="json",
+                        help="json: consolidated document (default); jsonl: one sample per line; "
+                             "shards: size-bounded JSONL shards with a random-access index")
+    parser.add_argument("--shard-size", type=float, default=DEFAULT_SHARD_BYTES / (1024 * 1024),
+                        help="Shard size limit in MB for --format shards (default 64)")
+    parser.add_argument("--locations-dir",
+                        help="data/locations root: add spots.json / grids.json place tokens")
+    parser.add_argument("--story-elements",
+                        help="Story JSON directory: add characters/locations from `elements`")
+    args = parser.parse_args()
+    
     # Initialize tokenizer
-    tokenizer = JejuFolkloreTokenizer()
+    tokenizer = JejuFolkloreTokenizer(locations_dir=args.locations_dir,
+                                      stories_dir=args.story_elements)
     
     # Process stories from cleaned directory
-    input_directory = "../cleaned/stories/myths/"
-    output_directory = "./training_data/"
+    input_directory = args.input
+    output_directory = args.output
     
     # Check if input directory exists
     if not os.path.exists(input_directory):
@@ -333,5 +444,7 @@ if __name__ == "__main__":
         exit(1)
     
     print("Starting Jeju Folklore tokenization process...")
-    tokenizer.process_all_stories(input_directory, output_directory)
+    tokenizer.process_all_stories(input_directory, output_directory,
+                                  workers=args.workers, output_format=args.format,
+                                  shard_bytes=int(args.shard_size * 1024 * 1024))
     print("Tokenization complete!")
\ No newline at end of file
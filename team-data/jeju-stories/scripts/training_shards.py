@@ -0,0 +1,287 @@
+#!/usr/bin/env python3
+"""
+Jeju Folklore Training Shards
+Size-bounded JSONL shards plus a binary offset index, for reading single samples
+or random batches without parsing the whole training set
+
+Files written for a data set named <name>:
+  <name>-00000.jsonl, ...   one sample per line, each shard at most max_shard_bytes
+                            (a single larger sample still gets a shard of its own)
+  <name>.idx                binary index (little-endian, see INDEX_HEADER)
+  <name>.meta.json          generation metadata plus the shard list
+
+Index layout, for N samples:
+  header        INDEX_HEADER: magic, version, N, shard count
+  entries       N x INDEX_ENTRY (shard, length, offset), in write order
+  id keys       N x uint64, sorted      id positions     N x uint32
+  story keys    N x uint64, sorted      story positions  N x uint32
+
+Keys are 64-bit BLAKE2b hashes of the sample id / metadata.source_story; lookups
+binary-search the memory-mapped key tables and confirm the match against the record.
+"""
+
+import io
+import json
+import mmap
+import random
+import struct
+import hashlib
+import argparse
+from array import array
+from bisect import bisect_left
+from pathlib import Path
+from typing import Dict, List, Iterator, Optional
+
+INDEX_MAGIC = b"JJSHARD\0"
+INDEX_VERSION = 1
+INDEX_HEADER = struct.Struct("<8sIII4x")   # magic, version, sample count, shard count
+INDEX_ENTRY = struct.Struct("<IIQ")        # shard number, record length, byte offset
+
+DEFAULT_SHARD_BYTES = 64 * 1024 * 1024
+
+
+def key_hash(value: str) -> int:
+    """64-bit lookup key for a sample id or story id"""
+    return int.from_bytes(hashlib.blake2b(str(value).encode("utf-8"), digest_size=8).digest(), "little")
+
+
+def shard_name(name: str, number: int) -> str:
+    return f"{name}-{number:05d}.jsonl"
+
+
+class ShardWriter:
+    """Streams samples into size-bounded JSONL shards and writes the index on close"""
+
+    def __init__(self, output_dir, name: str, max_shard_bytes: int = DEFAULT_SHARD_BYTES):
+        """
+        Args:
+            output_dir: directory for shards, index and metadata
+            name: data set name (file prefix)
+            max_shard_bytes: shard size limit in bytes
+        """
+        if max_shard_bytes <= 0:
+            raise ValueError(f"max_shard_bytes must be positive: {max_shard_bytes}")
+        self.output_dir = Path(output_dir)
+        self.name = name
+        self.max_shard_bytes = max_shard_bytes
+
+        self.shards: List[Dict] = []  # {"file", "samples", "bytes"}
+        self._file: Optional[io.BufferedWriter] = None
+        self._shard_numbers = array("I")
+        self._lengths = array("I")
+        self._offsets = array("Q")
+        self._id_keys = array("Q")
+        self._story_keys = array("Q")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self._close_shard()
+
+    def __len__(self):
+        return len(self._id_keys)
+
+    def write(self, sample: Dict):
+        """Append one training sample"""
+        line = (json.dumps(sample, ensure_ascii=False) + "\n").encode("utf-8")
+        if self._file is None or (self.shards[-1]["bytes"]
+                                  and self.shards[-1]["bytes"] + len(line) > self.max_shard_bytes):
+            self._open_shard()
+
+        shard = self.shards[-1]
+        self._shard_numbers.append(len(self.shards) - 1)
+        self._lengths.append(len(line))
+        self._offsets.append(shard["bytes"])
+        self._id_keys.append(key_hash(sample.get("id", "")))
+        self._story_keys.append(key_hash(sample.get("metadata", {}).get("source_story", "")))
+
+        self._file.write(line)
+        shard["bytes"] += len(line)
+        shard["samples"] += 1
+
+    def close(self, metadata: Dict = None) -> Path:
+        """Finish the last shard, write the index and metadata; returns the metadata path"""
+        self._close_shard()
+        index_file = self.output_dir / f"{self.name}.idx"
+        with open(index_file, "wb") as f:
+            self._write_index(f)
+
+        meta_file = self.output_dir / f"{self.name}.meta.json"
+        with open(meta_file, "w", encoding="utf-8") as f:
+            json.dump(dict(metadata or {}, index=index_file.name, shards=self.shards),
+                      f, ensure_ascii=False, indent=2)
+        return meta_file
+
+    def _open_shard(self):
+        self._close_shard()
+        file_name = shard_name(self.name, len(self.shards))
+        self.shards.append({"file": file_name, "samples": 0, "bytes": 0})
+        self._file = open(self.output_dir / file_name, "wb")
+
+    def _close_shard(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def _write_index(self, f):
+        count = len(self._id_keys)
+        f.write(INDEX_HEADER.pack(INDEX_MAGIC, INDEX_VERSION, count, len(self.shards)))
+        for entry in zip(self._shard_numbers, self._lengths, self._offsets):
+            f.write(INDEX_ENTRY.pack(*entry))
+        for keys in (self._id_keys, self._story_keys):
+            order = sorted(range(count), key=keys.__getitem__)
+            array("Q", (keys[i] for i in order)).tofile(f)
+            array("I", order).tofile(f)
+
+
+class TrainingShards:
+    """Random-access reader over ShardWriter output (index and shards are memory-mapped)"""
+
+    def __init__(self, directory, name: str = None):
+        """
+        Args:
+            directory: directory written by ShardWriter
+            name: data set name (default: the only *.idx in the directory)
+        """
+        self.directory = Path(directory)
+        if name is None:
+            indexes = sorted(self.directory.glob("*.idx"))
+            if len(indexes) != 1:
+                raise ValueError(f"Expected one shard index in {self.directory}, found {len(indexes)}")
+            name = indexes[0].stem
+        self.name = name
+
+        with open(self.directory / f"{name}.meta.json", "r", encoding="utf-8") as f:
+            self.metadata = json.load(f)
+
+        self._shard_files = [self.directory / shard["file"] for shard in self.metadata["shards"]]
+        self._shard_maps: Dict[int, mmap.mmap] = {}
+
+        with open(self.directory / f"{name}.idx", "rb") as f:
+            self._index = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, self.count, shard_count = INDEX_HEADER.unpack_from(self._index)
+        if magic != INDEX_MAGIC or version != INDEX_VERSION:
+            raise ValueError(f"Not a version {INDEX_VERSION} shard index: {name}.idx")
+        if shard_count != len(self._shard_files):
+            raise ValueError(f"Index lists {shard_count} shards, metadata lists {len(self._shard_files)}")
+
+        self._view = view = memoryview(self._index)
+        pos = INDEX_HEADER.size + self.count * INDEX_ENTRY.size
+        tables = []
+        for _ in range(2):
+            keys = view[pos:pos + 8 * self.count].cast("Q")
+            pos += 8 * self.count
+            positions = view[pos:pos + 4 * self.count].cast("I")
+            pos += 4 * self.count
+            tables.append((keys, positions))
+        (self._id_keys, self._id_pos), (self._story_keys, self._story_pos) = tables
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def __len__(self):
+        return self.count
+
+    def __getitem__(self, position: int) -> Dict:
+        return json.loads(self.raw(position))
+
+    def __iter__(self) -> Iterator[Dict]:
+        for position in range(self.count):
+            yield self[position]
+
+    def close(self):
+        for table in (self._id_keys, self._id_pos, self._story_keys, self._story_pos, self._view):
+            table.release()
+        for shard_map in self._shard_maps.values():
+            shard_map.close()
+        self._shard_maps.clear()
+        self._index.close()
+
+    def raw(self, position: int) -> bytes:
+        """Encoded JSON line of the sample at a write-order position"""
+        if position < 0:
+            position += self.count
+        if not 0 <= position < self.count:
+            raise IndexError(f"Sample position out of range: {position}")
+        shard, length, offset = INDEX_ENTRY.unpack_from(
+            self._index, INDEX_HEADER.size + position * INDEX_ENTRY.size)
+        return self._shard(shard)[offset:offset + length]
+
+    def get(self, sample_id: str) -> Optional[Dict]:
+        """Sample by id (None if absent)"""
+        for position in self._lookup(self._id_keys, self._id_pos, sample_id):
+            sample = self[position]
+            if sample.get("id") == sample_id:
+                return sample
+        return None
+
+    def by_story(self, story_id: str) -> List[Dict]:
+        """All samples generated from one source story, in write order"""
+        samples = []
+        for position in sorted(self._lookup(self._story_keys, self._story_pos, story_id)):
+            sample = self[position]
+            if sample.get("metadata", {}).get("source_story") == story_id:
+                samples.append(sample)
+        return samples
+
+    def random_batch(self, batch_size: int, rng: random.Random = None) -> List[Dict]:
+        """batch_size distinct samples drawn uniformly (reads only those records)"""
+        positions = (rng or random).sample(range(self.count), min(batch_size, self.count))
+        return [self[position] for position in positions]
+
+    def iter_batches(self, batch_size: int, shuffle: bool = True,
+                     rng: random.Random = None) -> Iterator[List[Dict]]:
+        """One pass over every sample in batches (shuffled order by default)"""
+        positions = list(range(self.count))
+        if shuffle:
+            (rng or random).shuffle(positions)
+        for start in range(0, self.count, batch_size):
+            yield [self[position] for position in positions[start:start + batch_size]]
+
+    def _lookup(self, keys, positions, value: str) -> List[int]:
+        key = key_hash(value)
+        found = []
+        i = bisect_left(keys, key)
+        while i < self.count and keys[i] == key:
+            found.append(positions[i])
+            i += 1
+        return found
+
+    def _shard(self, number: int) -> mmap.mmap:
+        shard_map = self._shard_maps.get(number)
+        if shard_map is None:
+            with open(self._shard_files[number], "rb") as f:
+                shard_map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            self._shard_maps[number] = shard_map
+        return shard_map
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Inspect sharded training data")
+    parser.add_argument("directory", help="Directory written with --format shards")
+    parser.add_argument("--name", help="Data set name (default: the only *.idx in the directory)")
+    group = parser.add_mutually_exclusive_group()
+    group.add_argument("--id", help="Print the sample with this id")
+    group.add_argument("--story", help="Print all samples from this source story")
+    group.add_argument("--batch", type=int, help="Print N random samples")
+    parser.add_argument("--seed", type=int, help="Random seed for --batch")
+    args = parser.parse_args()
+
+    with TrainingShards(args.directory, args.name) as shards:
+        if args.id:
+            result = shards.get(args.id)
+        elif args.story:
+            result = shards.by_story(args.story)
+        elif args.batch:
+            result = shards.random_batch(args.batch, random.Random(args.seed))
+        else:
+            result = {
+                "samples": len(shards),
+                "shards": len(shards.metadata["shards"]),
+                "bytes": sum(shard["bytes"] for shard in shards.metadata["shards"])
+            }
+        print(json.dumps(result, ensure_ascii=False, indent=2))
@@ -0,0 +1,202 @@
+#!/usr/bin/env python3
+"""
+Jeju Folklore Training Statistics
+Mergeable aggregates over training samples
+
+A TrainingStats holds only counters, so partial aggregates computed independently
+(per worker, per shard, per JSONL file) combine by addition into the same report a
+single pass over all samples would give:
+
+  total_samples             samples seen
+  style_distribution        samples per target style
+  complexity_distribution   histogram of metadata.complexity_score
+  character_frequency       samples mentioning each character / location / plot token
+  location_frequency        (from metadata.extracted_elements; every style variant of a
+  plot_frequency             story counts, like the style distribution)
+  complexity_by_style       complexity histogram per target style
+  token_cooccurrence        samples in which two element tokens appear together
+
+Merging in input order gives the same key order as a serial pass, so the saved report
+is identical however the work was split.
+
+Usage:
+    python training_stats.py scan training_data/*.jsonl -o stats.json --workers 4
+    python training_stats.py merge part1.json part2.json -o stats.json
+"""
+
+import json
+import argparse
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from itertools import combinations
+from pathlib import Path
+from typing import Dict, Iterable, List
+
+# extracted_elements key -> report section
+ELEMENT_SECTIONS = {
+    "characters": "character_frequency",
+    "locations": "location_frequency",
+    "plot_points": "plot_frequency"
+}
+
+
+def by_count(counter: Counter) -> List[tuple]:
+    """(key, count) by descending count, ties by key, so the order never depends on merge order"""
+    return sorted(counter.items(), key=lambda item: (-item[1], item[0]))
+
+
+class TrainingStats:
+    """Counter-based training data statistics (add samples, merge partials, save a report)"""
+
+    def __init__(self):
+        self.total_samples = 0
+        self.style_distribution = Counter()
+        self.complexity_distribution = Counter()
+        self.frequencies = {section: Counter() for section in ELEMENT_SECTIONS.values()}
+        self.complexity_by_style: Dict[str, Counter] = {}
+        self.token_cooccurrence = Counter()
+
+    @classmethod
+    def from_samples(cls, samples: Iterable[Dict]) -> "TrainingStats":
+        stats = cls()
+        stats.update(samples)
+        return stats
+
+    @classmethod
+    def combine(cls, partials: Iterable["TrainingStats"]) -> "TrainingStats":
+        """Merge partial aggregates in order"""
+        stats = cls()
+        for partial in partials:
+            stats.merge(partial)
+        return stats
+
+    def add(self, sample: Dict):
+        """Add one training sample"""
+        metadata = sample["metadata"]
+        self.total_samples += 1
+
+        style = metadata["target_style"]
+        complexity = metadata["complexity_score"]
+        self.style_distribution[style] += 1
+        self.complexity_distribution[complexity] += 1
+        self.complexity_by_style.setdefault(style, Counter())[complexity] += 1
+
+        # Each token counts once per sample, however often it was matched
+        elements = metadata.get("extracted_elements", {})
+        tokens = set()
+        for key, section in ELEMENT_SECTIONS.items():
+            found = set(elements.get(key, []))
+            self.frequencies[section].update(found)
+            tokens.update(found)
+        self.token_cooccurrence.update(combinations(sorted(tokens), 2))
+
+    def update(self, samples: Iterable[Dict]):
+        for sample in samples:
+            self.add(sample)
+
+    def merge(self, other: "TrainingStats") -> "TrainingStats":
+        """Add another partial aggregate into this one"""
+        self.total_samples += other.total_samples
+        self.style_distribution.update(other.style_distribution)
+        self.complexity_distribution.update(other.complexity_distribution)
+        for section, counter in other.frequencies.items():
+            self.frequencies[section].update(counter)
+        for style, counter in other.complexity_by_style.items():
+            self.complexity_by_style.setdefault(style, Counter()).update(counter)
+        self.token_cooccurrence.update(other.token_cooccurrence)
+        return self
+
+    def __iadd__(self, other: "TrainingStats") -> "TrainingStats":
+        return self.merge(other)
+
+    def __add__(self, other: "TrainingStats") -> "TrainingStats":
+        return TrainingStats.combine([self, other])
+
+    def __eq__(self, other) -> bool:
+        return isinstance(other, TrainingStats) and self.to_dict() == other.to_dict()
+
+    def to_dict(self) -> Dict:
+        """Report layout (frequency and co-occurrence lists are sorted by count, then key)"""
+        report = {
+            "total_samples": self.total_samples,
+            "style_distribution": dict(self.style_distribution),
+            "complexity_distribution": dict(self.complexity_distribution)
+        }
+        for section in ELEMENT_SECTIONS.values():
+            report[section] = dict(by_count(self.frequencies[section]))
+        report["complexity_by_style"] = {style: dict(counter)
+                                         for style, counter in self.complexity_by_style.items()}
+        report["token_cooccurrence"] = [{"tokens": list(pair), "count": count}
+                                        for pair, count in by_count(self.token_cooccurrence)]
+        return report
+
+    @classmethod
+    def from_dict(cls, report: Dict) -> "TrainingStats":
+        """Rebuild a partial aggregate from a saved report (JSON turns int keys into strings)"""
+        stats = cls()
+        stats.total_samples = report.get("total_samples", 0)
+        stats.style_distribution.update(report.get("style_distribution", {}))
+        stats.complexity_distribution.update(
+            {int(score): count for score, count in report.get("complexity_distribution", {}).items()})
+        for section in ELEMENT_SECTIONS.values():
+            stats.frequencies[section].update(report.get(section, {}))
+        for style, histogram in report.get("complexity_by_style", {}).items():
+            stats.complexity_by_style[style] = Counter(
+                {int(score): count for score, count in histogram.items()})
+        for entry in report.get("token_cooccurrence", []):
+            stats.token_cooccurrence[tuple(entry["tokens"])] += entry["count"]
+        return stats
+
+    def save(self, path) -> Path:
+        path = Path(path)
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(self.to_dict(), f, ensure_ascii=False, indent=2)
+        return path
+
+    @classmethod
+    def load(cls, path) -> "TrainingStats":
+        with open(path, 'r', encoding='utf-8') as f:
+            return cls.from_dict(json.load(f))
+
+
+def stats_for_jsonl(path: str) -> TrainingStats:
+    """Partial aggregate of one JSONL file (training data or a shard)"""
+    stats = TrainingStats()
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            if line.strip():
+                stats.add(json.loads(line))
+    return stats
+
+
+def scan_files(paths: List[str], workers: int = 1) -> TrainingStats:
+    """Aggregate JSONL files, one partial per file (in a process pool if workers > 1)"""
+    if workers <= 1 or len(paths) <= 1:
+        return TrainingStats.combine(stats_for_jsonl(path) for path in paths)
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        return TrainingStats.combine(executor.map(stats_for_jsonl, paths))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Training data statistics from mergeable partials")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    scan_parser = subparsers.add_parser("scan", help="Aggregate JSONL training data / shard files")
+    scan_parser.add_argument("files", nargs="+", help="JSONL files (one partial per file)")
+    scan_parser.add_argument("--workers", "-w", type=int, default=1,
+                             help="Number of worker processes (default 1)")
+
+    merge_parser = subparsers.add_parser("merge", help="Combine saved statistics reports")
+    merge_parser.add_argument("files", nargs="+", help="training_statistics.json files")
+
+    for sub in (scan_parser, merge_parser):
+        sub.add_argument("--output", "-o", default="training_statistics.json",
+                         help="Report path (default training_statistics.json)")
+    args = parser.parse_args()
+
+    if args.command == "scan":
+        stats = scan_files(args.files, args.workers)
+    else:
+        stats = TrainingStats.combine(TrainingStats.load(path) for path in args.files)
+
+    print(f"{stats.total_samples} samples -> {stats.save(args.output)}")
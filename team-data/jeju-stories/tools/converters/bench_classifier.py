@@ -0,0 +1,155 @@
+"""
+병합기 분류기 벤치마크
+코퍼스 JSON의 텍스트로 세 가지 방식의 처리 속도를 비교하고,
+같은 입력을 두 번 분류해 결과가 같은지(결정성) 확인한다.
+
+- 기존: 카테고리마다 any(kw in text)로 첫 번째로 걸린 카테고리 (점수 없음, 조기 종료)
+- 키워드별 count: 같은 점수를 str.count로 구하는 방식 (키워드 수에 비례)
+- StoryClassifier: 키워드 오토마톤 1회 스캔 (키워드 수와 무관)
+
+사용법:
+    python bench_classifier.py                                  # data/stories + raw
+    python bench_classifier.py ../../raw/ocr --repeat 5 --grow 10
+"""
+
+import re
+import sys
+import json
+import time
+import argparse
+from pathlib import Path
+
+from story_classifier import StoryClassifier, SUBCATEGORY_PATTERNS
+
+DEFAULT_CORPUS = [
+    Path(__file__).resolve().parents[2] / 'data' / 'stories',
+    Path(__file__).resolve().parents[2] / 'raw'
+]
+
+
+def iter_strings(value):
+    """JSON 값 안의 모든 문자열"""
+    if isinstance(value, str):
+        yield value
+    elif isinstance(value, dict):
+        for item in value.values():
+            yield from iter_strings(item)
+    elif isinstance(value, list):
+        for item in value:
+            yield from iter_strings(item)
+
+
+def load_corpus(dirs: list) -> list:
+    """디렉토리들의 JSON 파일마다 텍스트 하나 (raw_text가 있으면 그것, 없으면 모든 문자열)"""
+    texts = []
+    for directory in dirs:
+        for path in sorted(Path(directory).rglob('*.json')):
+            try:
+                data = json.loads(path.read_bytes())
+            except ValueError:
+                continue
+            content = data.get('content') if isinstance(data, dict) else None
+            raw_text = content.get('raw_text') if isinstance(content, dict) else None
+            if isinstance(raw_text, str) and raw_text:
+                texts.append(raw_text)
+            else:
+                texts.append('\n'.join(iter_strings(data)))
+    return texts
+
+
+def legacy_classify(text: str, patterns: dict) -> tuple:
+    """예전 StoryMerger.determine_subcategory + extract_narrator (비교 기준)"""
+    subcategory = '기타'
+    for category, keywords in patterns.items():
+        if any(kw in text for kw in keywords):
+            subcategory = category
+            break
+
+    narrator = {}
+    name_match = re.search(r'구연자[:\s]*([가-힣]+)', text)
+    if name_match:
+        narrator['name'] = name_match.group(1)
+    if re.search(r'[남자|남성|할아버지|하르방]', text):
+        narrator['gender'] = '남'
+    elif re.search(r'[여자|여성|할머니|할망]', text):
+        narrator['gender'] = '여'
+    age_match = re.search(r'(\d{2,3})\s*세', text)
+    if age_match:
+        narrator['age'] = int(age_match.group(1))
+    location_match = re.search(r'([가-힣]+[리읍면동])', text)
+    if location_match:
+        narrator['location'] = location_match.group(1)
+    return subcategory, narrator
+
+
+def count_scores(text: str, patterns: dict) -> dict:
+    """키워드마다 str.count로 카테고리 점수/출현 수 계산 (StoryClassifier와 같은 값)"""
+    scores = {}
+    hits = {}
+    for category, keywords in patterns.items():
+        counts = [text.count(kw) for kw in keywords]
+        if any(counts):
+            scores[category] = sum(1 for count in counts if count)
+            hits[category] = sum(counts)
+    return scores, hits
+
+
+def grow_patterns(patterns: dict, factor: int) -> dict:
+    """카테고리마다 키워드를 factor배로 늘린 사전 (코퍼스에 없을 합성 키워드 추가)"""
+    if factor <= 1:
+        return patterns
+    grown = {}
+    for rank, (category, keywords) in enumerate(patterns.items()):
+        extra = [f'{keywords[0]}{chr(0xAC00 + rank * 97 + i)}{i}'
+                 for i in range(len(keywords) * (factor - 1))]
+        grown[category] = keywords + extra
+    return grown
+
+
+def timed(func, texts: list, repeat: int) -> tuple:
+    """(총 초, 마지막 결과 목록)"""
+    results = None
+    start = time.perf_counter()
+    for _ in range(repeat):
+        results = [func(text) for text in texts]
+    return time.perf_counter() - start, results
+
+
+def main():
+    parser = argparse.ArgumentParser(description='병합기 분류기 벤치마크')
+    parser.add_argument('corpus', nargs='*', help='JSON 디렉토리 (기본: data/stories, raw)')
+    parser.add_argument('--repeat', type=int, default=3, help='반복 횟수 (기본 3)')
+    parser.add_argument('--grow', type=int, default=1,
+                        help='카테고리 키워드 수를 N배로 늘려 측정 (기본 1)')
+    args = parser.parse_args()
+
+    texts = load_corpus(args.corpus or DEFAULT_CORPUS)
+    if not texts:
+        print("코퍼스에 JSON 텍스트가 없습니다")
+        sys.exit(1)
+    total_chars = sum(len(text) for text in texts) * args.repeat
+
+    patterns = grow_patterns(SUBCATEGORY_PATTERNS, args.grow)
+    keyword_count = sum(len(keywords) for keywords in patterns.values())
+    classifier = StoryClassifier(patterns)
+
+    legacy_seconds, _ = timed(lambda text: legacy_classify(text, patterns), texts, args.repeat)
+    count_seconds, counted = timed(lambda text: count_scores(text, patterns), texts, args.repeat)
+    seconds, first = timed(lambda text: classifier.classify(t_text=text), texts, args.repeat)
+    _, second = timed(lambda text: classifier.classify(t_text=text), texts, 1)
+
+    print(f"코퍼스: 텍스트 {len(texts)}개, {total_chars // args.repeat:,}자 × {args.repeat}회, "
+          f"키워드 {keyword_count}개")
+    for label, elapsed in (('기존 (첫 카테고리)', legacy_seconds),
+                           ('키워드별 count', count_seconds),
+                           ('StoryClassifier', seconds)):
+        print(f"  {label:<16} {elapsed:8.3f}초  {total_chars / elapsed / 1e6:8.2f} M자/초")
+
+    # 겹치는 키워드(예: '도깨비'와 '도깨비불')는 count와 오토마톤 모두 따로 센다
+    same_scores = all((r['scores'], r['hits']) == c for r, c in zip(first, counted))
+    print(f"  점수 일치 (count 기준): {'예' if same_scores else '아니오'}")
+    print(f"  결정성: {'같음' if first == second else '다름'}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,133 @@
+"""
+설화 JSON 스트리밍 출력 (JSONL, 크기 기준 분할)
+변환이 끝난 설화를 한 줄짜리 JSON으로 바로 추가 기록하여 후속 도구가
+수백 개의 작은 파일을 glob/파싱하지 않고 순서대로 읽을 수 있게 한다.
+
+파일명: <prefix>-00000.jsonl, <prefix>-00001.jsonl, ...
+"""
+
+import os
+import json
+import shutil
+import logging
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+
+class RotatingJsonlWriter:
+    """크기 한도를 넘으면 다음 번호 파일로 넘어가는 JSONL 기록기
+
+    레코드마다 flush 하므로 중단되어도 완료된 줄은 남는다
+    (쓰다 만 마지막 줄은 읽는 쪽에서 건너뛴다 - iter_jsonl 참고).
+    """
+
+    def __init__(self, output_dir: str, prefix: str = 'stories',
+                 max_bytes: int = 64 << 20, resume: bool = False):
+        """
+        Args:
+            output_dir: 출력 디렉토리
+            prefix: 파일명 접두어
+            max_bytes: 파일 하나의 최대 크기 (넘으면 다음 파일로)
+            resume: True면 마지막 파일에 이어서 기록, False면 기존 파일을 지우고 새로 시작
+        """
+        self.output_dir = Path(output_dir)
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        self.prefix = prefix
+        self.max_bytes = max_bytes
+
+        existing = sorted(self.output_dir.glob(f'{prefix}-*.jsonl'))
+        if resume and existing:
+            self._index = int(existing[-1].stem.rsplit('-', 1)[1])
+        else:
+            for path in existing:
+                path.unlink()
+            if existing:
+                logger.info(f"기존 JSONL 출력 {len(existing)}개 삭제")
+            self._index = 0
+
+        self._file = None
+        self._open()
+
+    def _path(self, index: int) -> Path:
+        return self.output_dir / f'{self.prefix}-{index:05d}.jsonl'
+
+    def _open(self):
+        path = self._path(self._index)
+        self._file = open(path, 'ab')
+        self._size = self._file.tell()
+        if self._size:
+            # 중단되어 쓰다 만 줄이 있으면 다음 레코드와 붙지 않게 줄을 끊어 둠
+            with open(path, 'rb') as f:
+                f.seek(-1, os.SEEK_END)
+                if f.read(1) != b'\n':
+                    self._file.write(b'\n')
+                    self._size += 1
+
+    @property
+    def path(self) -> Path:
+        """현재 기록 중인 파일"""
+        return self._path(self._index)
+
+    def _rotate_for(self, size: int):
+        """size 바이트를 더하면 한도를 넘는 경우 다음 파일로 (빈 파일에는 항상 기록)"""
+        if self._size and self._size + size > self.max_bytes:
+            self._file.close()
+            self._index += 1
+            self._open()
+
+    def write(self, record: dict) -> str:
+        """레코드 한 줄 추가 후 기록된 파일 경로 반환"""
+        line = (json.dumps(record, ensure_ascii=False) + '\n').encode('utf-8')
+        self._rotate_for(len(line))
+        self._file.write(line)
+        self._file.flush()
+        self._size += len(line)
+        return str(self.path)
+
+    def write_file(self, path) -> str:
+        """한 줄짜리 JSON 파일 내용을 그대로 한 줄로 추가 (파일 전체를 메모리에 올리지 않음)"""
+        size = os.path.getsize(path) + 1
+        self._rotate_for(size)
+        with open(path, 'rb') as f:
+            shutil.copyfileobj(f, self._file)
+        self._file.write(b'\n')
+        self._file.flush()
+        self._size += size
+        return str(self.path)
+
+    def close(self):
+        if self._file:
+            self._file.close()
+            self._file = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def iter_jsonl(input_dir: str, prefix: str = 'stories'):
+    """RotatingJsonlWriter 출력 파일들을 순서대로 읽어 레코드 생성
+
+    쓰다 만 줄(중단된 실행)은 건너뛴다. 이어서 변환(resume)하면 같은 설화가
+    두 번 기록될 수 있으므로 metadata.source_id(파일 이름, 매니페스트/재개 기준) 별로
+    마지막 레코드를 쓰면 된다. id는 같은 설화의 C_/T_가 공유하므로 중복 제거 키로 쓰면 안 된다.
+    """
+    for path in sorted(Path(input_dir).glob(f'{prefix}-*.jsonl')):
+        with open(path, 'r', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    yield json.loads(line)
+                except ValueError:
+                    logger.warning(f"손상된 JSONL 줄 건너뜀: {path.name}")
+
+
+def write_json_atomic(path, data):
+    """임시 파일에 쓴 뒤 os.replace로 교체 (읽는 쪽이 쓰다 만 파일을 보지 않음)"""
+    path = Path(path)
+    tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, ensure_ascii=False, indent=2)
+    os.replace(tmp_path, path)
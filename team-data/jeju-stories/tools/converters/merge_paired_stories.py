@@ -4,6 +4,8 @@ OCR로 추출된 개별 JSON 파일들을 하나의 설화 JSON으로 병합
 
 사용법:
     python merge_paired_stories.py --ocr-dir ../../raw/ocr --output ../../data/stories
+    python merge_paired_stories.py --ocr-dir ../../raw/ocr --output ../../data/stories --workers 8
+    python merge_paired_stories.py --ocr-dir ../../raw/ocr --output ../../data/stories --dedup
 """
 
 import os
@@ -14,6 +16,9 @@ import logging
 from pathlib import Path
 from datetime import datetime
 from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+
+from story_classifier import StoryClassifier, SUBCATEGORY_PATTERNS
 
 logging.basicConfig(
     level=logging.INFO,
@@ -32,21 +37,23 @@ class StoryMerger:
         'L': {'type': 'legend', 'folder': 'legends', 'name_ko': '전설'}
     }
 
-    # 세부 카테고리 추정 키워드
-    SUBCATEGORY_PATTERNS = {
-        '창조신화': ['창조', '만들', '생겨', '태초', '세상'],
-        '본풀이': ['본풀이', '굿', '제사', '신앙', '무속'],
-        '지명유래': ['지명', '이름', '불리', '마을', '오름'],
-        '역사전설': ['역사', '조선', '왕', '장수', '전쟁'],
-        '인물전설': ['인물', '효자', '열녀', '선비', '부자'],
-        '자연전설': ['도깨비', '도채비', '귀신', '용', '뱀'],
-        '동물담': ['개', '닭', '소', '말', '돼지', '동물'],
-        '교훈담': ['교훈', '착한', '욕심', '벌', '복']
-    }
+    # 세부 카테고리 추정 키워드 (story_classifier.SUBCATEGORY_PATTERNS)
+    SUBCATEGORY_PATTERNS = SUBCATEGORY_PATTERNS
+
+    # 파일명 패턴: C_F_001_제목
+    FILE_ID_REGEX = re.compile(r'([CT])_([FML])_(\d+)_(.+)')
 
-    def __init__(self, ocr_dir: str, output_dir: str):
+    def __init__(self, ocr_dir: str, output_dir: str, workers: int = 1):
+        """
+        Args:
+            ocr_dir: OCR 추출 JSON 디렉토리
+            output_dir: 병합 결과 저장 디렉토리
+            workers: 병렬 병합 워커 프로세스 수 (1이면 순차 처리)
+        """
         self.ocr_dir = Path(ocr_dir)
         self.output_dir = Path(output_dir)
+        self.workers = workers
+        self.classifier = StoryClassifier(self.SUBCATEGORY_PATTERNS)
         self.stats = {
             'paired': 0,
             'c_only': 0,
@@ -64,7 +71,7 @@ class StoryMerger:
         name = filename.replace('.json', '')
 
         # 패턴 매칭
-        match = re.match(r'([CT])_([FML])_(\d+)_(.+)', name)
+        match = self.FILE_ID_REGEX.match(name)
         if match:
             return {
                 'content_type': 'content' if match.group(1) == 'C' else 'text',
@@ -77,62 +84,46 @@ class StoryMerger:
         return None
 
     def find_pairs(self) -> dict:
-        """C_/T_ 파일 쌍 찾기"""
+        """C_/T_ 파일 쌍 찾기 (디렉토리 한 번 훑기)"""
         pairs = defaultdict(lambda: {'C': None, 'T': None})
 
-        for json_file in self.ocr_dir.glob('*.json'):
-            if json_file.name.startswith('_'):  # 메타 파일 제외
-                continue
-
-            info = self.parse_file_id(json_file.name)
-            if info:
-                pair_key = info['pair_key']
-                pairs[pair_key][info['type_code']] = {
-                    'file': json_file,
-                    'info': info
-                }
+        with os.scandir(self.ocr_dir) as entries:
+            for entry in entries:
+                name = entry.name
+                if not name.endswith('.json') or name.startswith('_'):  # 메타 파일 제외
+                    continue
+                if not entry.is_file():
+                    continue
+
+                info = self.parse_file_id(name)
+                if info:
+                    pair_key = info['pair_key']
+                    pairs[pair_key][info['type_code']] = {
+                        'file': self.ocr_dir / name,
+                        'info': info
+                    }
 
         return dict(pairs)
 
     def extract_narrator(self, text: str) -> dict:
         """T_ 파일에서 구연자 정보 추출"""
-        narrator = {}
-
-        # 구연자 이름 패턴
-        name_match = re.search(r'구연자[:\s]*([가-힣]+)', text)
-        if name_match:
-            narrator['name'] = name_match.group(1)
-
-        # 성별 패턴
-        if re.search(r'[남자|남성|할아버지|하르방]', text):
-            narrator['gender'] = '남'
-        elif re.search(r'[여자|여성|할머니|할망]', text):
-            narrator['gender'] = '여'
-
-        # 나이 패턴
-        age_match = re.search(r'(\d{2,3})\s*세', text)
-        if age_match:
-            narrator['age'] = int(age_match.group(1))
-
-        # 지역 패턴
-        location_match = re.search(r'([가-힣]+[리읍면동])', text)
-        if location_match:
-            narrator['location'] = location_match.group(1)
-
-        return narrator if narrator else None
+        return self.classifier.extract_narrator(text)
 
     def determine_subcategory(self, content: str, category_code: str) -> str:
-        """내용 기반 세부 카테고리 추정"""
-        for category, keywords in self.SUBCATEGORY_PATTERNS.items():
-            if any(kw in content for kw in keywords):
-                return category
+        """내용 기반 세부 카테고리 추정 (키워드 점수가 가장 높은 카테고리)"""
+        return self.classifier.classify(content, category_code=category_code)['subcategory']
+
+    @staticmethod
+    def load_json(path) -> dict:
+        """파일 전체를 한 번에 읽어 파싱 (줄 단위 버퍼 읽기 없이)"""
+        return json.loads(Path(path).read_bytes())
 
-        # 기본값
-        defaults = {'M': '기타 신화', 'F': '기타 민담', 'L': '기타 전설'}
-        return defaults.get(category_code, '기타')
+    def merge_pair(self, pair_key: str, c_data: dict, t_data: dict,
+                   c_content: dict = None, t_content: dict = None) -> dict:
+        """C_/T_ 쌍을 하나의 JSON으로 병합
 
-    def merge_pair(self, pair_key: str, c_data: dict, t_data: dict) -> dict:
-        """C_/T_ 쌍을 하나의 JSON으로 병합"""
+        c_content/t_content를 넘기면 파일을 다시 읽지 않는다.
+        """
         # 기본 정보 (C_ 파일 우선, 없으면 T_ 파일)
         primary = c_data or t_data
         info = primary['info']
@@ -140,29 +131,19 @@ class StoryMerger:
         category_info = self.CATEGORY_MAP.get(info['category_code'], {})
 
         # 파일 내용 로드
-        c_content = {}
-        t_content = {}
-
-        if c_data:
-            with open(c_data['file'], 'r', encoding='utf-8') as f:
-                c_content = json.load(f)
-
-        if t_data:
-            with open(t_data['file'], 'r', encoding='utf-8') as f:
-                t_content = json.load(f)
+        if c_content is None:
+            c_content = self.load_json(c_data['file']) if c_data else {}
+        if t_content is None:
+            t_content = self.load_json(t_data['file']) if t_data else {}
 
         # 텍스트 추출
         c_text = c_content.get('content', {}).get('raw_text', '')
         t_text = t_content.get('content', {}).get('raw_text', '')
 
-        # 구연자 정보 추출 (T_ 파일에서)
-        narrator = None
-        if t_text:
-            narrator = self.extract_narrator(t_text)
-
-        # 세부 카테고리 추정
-        combined_text = c_text + t_text
-        subcategory = self.determine_subcategory(combined_text, info['category_code'])
+        # 세부 카테고리 점수 + 구연자 정보 (T_ 파일에서) - 한 번의 스캔
+        classification = self.classifier.classify(c_text, t_text, info['category_code'])
+        narrator = classification['narrator']
+        subcategory = classification['subcategory']
 
         # 병합된 JSON 생성
         merged = {
@@ -198,6 +179,7 @@ class StoryMerger:
             "metadata": {
                 "source_ids": [],
                 "has_dialect": bool(t_text),
+                "subcategory_scores": classification['scores'],
                 "converted_at": datetime.now().isoformat(),
                 "converter_version": "2.0.0"
             }
@@ -227,42 +209,87 @@ class StoryMerger:
 
         return merged, category_info.get('folder', 'unknown')
 
-    def process_all(self):
-        """모든 파일 쌍 처리"""
-        pairs = self.find_pairs()
-        logger.info(f"총 {len(pairs)}개 설화 쌍 발견")
+    @staticmethod
+    def pair_kind(pair: dict) -> str:
+        """통계 항목 이름: 'paired' | 'c_only' | 't_only'"""
+        if pair['C'] and pair['T']:
+            return 'paired'
+        return 'c_only' if pair['C'] else 't_only'
 
-        # 출력 폴더 생성
+    def prepare_output(self):
+        """카테고리별 출력 폴더 생성"""
         for cat_info in self.CATEGORY_MAP.values():
             (self.output_dir / cat_info['folder']).mkdir(parents=True, exist_ok=True)
 
-        for pair_key, pair in pairs.items():
-            try:
-                c_data = pair['C']
-                t_data = pair['T']
+    def merge_and_save(self, pair_key: str, pair: dict,
+                       c_content: dict = None, t_content: dict = None) -> dict:
+        """쌍 하나를 읽고 병합하여 저장 (예외는 결과로 반환)
 
-                # 통계 업데이트
-                if c_data and t_data:
-                    self.stats['paired'] += 1
-                elif c_data:
-                    self.stats['c_only'] += 1
-                else:
-                    self.stats['t_only'] += 1
+        c_content/t_content를 넘기면 파일 대신 그 내용을 병합한다 (story_pipeline).
 
-                # 병합
-                merged, folder = self.merge_pair(pair_key, c_data, t_data)
+        Returns:
+            {'pair_key', 'id', 'error'} - 성공하면 error가 None
+        """
+        try:
+            merged, folder = self.merge_pair(pair_key, pair['C'], pair['T'],
+                                             c_content=c_content, t_content=t_content)
+
+            # 직렬화 후 한 번에 기록
+            output_file = self.output_dir / folder / f"{merged['id']}.json"
+            output_file.write_bytes(
+                json.dumps(merged, ensure_ascii=False, indent=2).encode('utf-8')
+            )
+            return {'pair_key': pair_key, 'id': merged['id'], 'error': None}
+
+        except Exception as e:
+            return {'pair_key': pair_key, 'id': None, 'error': str(e)}
+
+    def record_result(self, pair: dict, result: dict):
+        """merge_and_save 결과를 통계에 반영"""
+        self.stats[self.pair_kind(pair)] += 1
+
+        if result['error'] is None:
+            self.stats['merged'] += 1
+            logger.debug(f"병합 완료: {result['id']}")
+        else:
+            logger.error(f"병합 실패 [{result['pair_key']}]: {result['error']}")
+            self.stats['errors'] += 1
+
+    def _iter_merges(self, pairs: dict):
+        """쌍 목록을 순서대로 병합하여 (pair, result) 반환 (workers > 1이면 병렬)"""
+        items = list(pairs.items())
+        if self.workers <= 1 or len(items) <= 1:
+            for pair_key, pair in items:
+                yield pair, self.merge_and_save(pair_key, pair)
+            return
+
+        logger.info(f"병렬 병합: 워커 {self.workers}개")
+        # 작은 파일 수천 개를 작업 하나씩 주고받지 않도록 묶어서 전달
+        chunksize = max(1, len(items) // (self.workers * 4))
+        with ProcessPoolExecutor(
+            max_workers=self.workers,
+            initializer=_init_worker,
+            initargs=(str(self.ocr_dir), str(self.output_dir))
+        ) as executor:
+            results = executor.map(
+                _merge_in_worker,
+                [pair_key for pair_key, _ in items],
+                [pair for _, pair in items],
+                chunksize=chunksize
+            )
+            yield from zip((pair for _, pair in items), results)
 
-                # 저장
-                output_file = self.output_dir / folder / f"{merged['id']}.json"
-                with open(output_file, 'w', encoding='utf-8') as f:
-                    json.dump(merged, f, ensure_ascii=False, indent=2)
+    def process_all(self):
+        """모든 파일 쌍 처리"""
+        pairs = self.find_pairs()
+        logger.info(f"총 {len(pairs)}개 설화 쌍 발견")
 
-                self.stats['merged'] += 1
-                logger.debug(f"병합 완료: {merged['id']}")
+        # 출력 폴더 생성
+        self.prepare_output()
 
-            except Exception as e:
-                logger.error(f"병합 실패 [{pair_key}]: {e}")
-                self.stats['errors'] += 1
+        # 통계는 결과를 받는 부모 프로세스에서만 갱신
+        for pair, result in self._iter_merges(pairs):
+            self.record_result(pair, result)
 
         # 결과 요약
         self.print_summary()
@@ -280,6 +307,20 @@ class StoryMerger:
         print("="*50)
 
 
+_worker_merger = None
+
+
+def _init_worker(ocr_dir: str, output_dir: str):
+    """워커 초기화: 프로세스마다 병합기 하나 생성"""
+    global _worker_merger
+    _worker_merger = StoryMerger(ocr_dir, output_dir)
+
+
+def _merge_in_worker(pair_key: str, pair: dict) -> dict:
+    """워커에서 쌍 하나 병합 (예외는 부모 프로세스로 전달하기 위해 결과로 반환)"""
+    return _worker_merger.merge_and_save(pair_key, pair)
+
+
 def main():
     parser = argparse.ArgumentParser(
         description='C_/T_ 설화 파일 쌍 병합기'
@@ -289,12 +330,24 @@ def main():
                         help='OCR 추출된 JSON 디렉토리')
     parser.add_argument('--output', '-o', required=True,
                         help='병합 결과 저장 디렉토리')
+    parser.add_argument('--workers', '-w', type=int, default=1,
+                        help='병렬 병합 워커 프로세스 수 (기본 1)')
+    parser.add_argument('--dedup', action='store_true',
+                        help='병합 후 유사 중복(이본) 묶음을 찾아 _duplicates.json에 기록')
+    parser.add_argument('--dedup-threshold', type=float, default=0.5,
+                        help='유사 중복으로 볼 최소 유사도 (기본 0.5)')
 
     args = parser.parse_args()
 
-    merger = StoryMerger(args.ocr_dir, args.output)
+    merger = StoryMerger(args.ocr_dir, args.output, workers=args.workers)
     merger.process_all()
 
+    if args.dedup:
+        # NumPy는 중복 검출에만 필요하므로 여기서 불러온다
+        from story_dedup import find_duplicates
+        find_duplicates(args.output, Path(args.output) / '_duplicates.json',
+                        threshold=args.dedup_threshold)
+
 
 if __name__ == '__main__':
     main()
@@ -0,0 +1,145 @@
+"""
+페이지 단위 OCR 결과 디스크 캐시
+PDF 내용 해시 + 페이지 번호 + DPI + OCR 언어를 키로 readtext 결과를 저장하고,
+전체 용량이 한도를 넘으면 가장 오래 사용되지 않은 엔트리부터 삭제 (LRU)
+
+파싱 규칙(parse_sections, extract_locations 등)만 바뀐 재실행에서는
+렌더링/OCR 없이 캐시된 결과만 읽어 전체 코퍼스를 다시 파싱할 수 있다.
+"""
+
+import os
+import json
+import hashlib
+import logging
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+
+def file_sha256(path: str, chunk_size: int = 1 << 20) -> str:
+    """파일 내용의 SHA-256 해시 (파일명/경로가 바뀌어도 같은 키 유지)"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class OCRCache:
+    """content-addressed 페이지 OCR 캐시
+
+    엔트리는 `<cache_dir>/<키 앞 2자리>/<키>.json` 파일 하나로 저장된다.
+    조회에 성공하면 파일 mtime을 갱신하여 최근 사용 시각으로 쓰고,
+    용량 초과시 mtime이 오래된 순서로 삭제한다. 쓰기는 임시 파일 후
+    os.replace로 교체하므로 여러 워커 프로세스가 같은 디렉토리를 공유해도 된다.
+
+    용량은 프로세스마다 자기 쓰기만 더해 추정하므로, 쓴 양이 한도의 SYNC_RATIO를 넘을
+    때마다 디스크를 다시 세어 다른 워커가 쓴 양을 반영한다. 워커 N개가 공유하면
+    한도를 넘는 양은 최대 N x SYNC_RATIO x max_bytes 정도다.
+    """
+
+    # 한도 초과시 이 비율까지 줄여서 매 put마다 삭제가 반복되지 않게 함
+    EVICT_TARGET_RATIO = 0.9
+    # 이 프로세스가 한도의 이 비율만큼 쓰면 디스크 용량을 다시 셈 (다른 워커의 쓰기 반영)
+    SYNC_RATIO = 0.01
+
+    def __init__(self, cache_dir: str, max_bytes: int = 2 << 30):
+        """
+        Args:
+            cache_dir: 캐시 디렉토리
+            max_bytes: 최대 캐시 용량 (바이트)
+        """
+        self.cache_dir = Path(cache_dir)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._size = sum(size for _, size, _ in self._scan())
+        self._unsynced = 0  # 마지막으로 디스크를 센 뒤 이 프로세스가 쓴 바이트
+
+    @staticmethod
+    def make_key(pdf_hash: str, page_num: int, dpi, languages: list, variant: str = '') -> str:
+        """캐시 키 생성
+
+        Args:
+            pdf_hash: PDF 파일 내용 해시
+            page_num: 0부터 시작하는 페이지 번호
+            dpi: 렌더링 DPI
+            languages: OCR 언어 목록
+            variant: readtext 옵션 등 결과 형식을 구분하는 문자열
+        """
+        raw = f"{pdf_hash}|{page_num}|{dpi}|{','.join(languages)}|{variant}"
+        return hashlib.sha256(raw.encode('utf-8')).hexdigest()
+
+    def _path(self, key: str) -> Path:
+        return self.cache_dir / key[:2] / f"{key}.json"
+
+    def _scan(self) -> list:
+        """(mtime, size, path) 목록 (다른 워커가 지운 파일은 무시)"""
+        entries = []
+        for path in self.cache_dir.glob('*/*.json'):
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+        return entries
+
+    def get(self, key: str):
+        """캐시 조회 (없거나 손상된 엔트리면 None)"""
+        path = self._path(key)
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                value = json.load(f)
+            os.utime(path)  # LRU 순서 갱신
+        except (OSError, ValueError):
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        return value
+
+    def put(self, key: str, value):
+        """캐시 저장 후 용량 초과시 LRU 삭제"""
+        path = self._path(key)
+        path.parent.mkdir(exist_ok=True)
+
+        try:
+            old_size = path.stat().st_size
+        except FileNotFoundError:
+            old_size = 0
+
+        tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(value, f, ensure_ascii=False)
+        os.replace(tmp_path, path)
+
+        delta = path.stat().st_size - old_size
+        self._size += delta
+        self._unsynced += max(delta, 0)
+        if self._unsynced >= self.max_bytes * self.SYNC_RATIO:
+            self._size = sum(size for _, size, _ in self._scan())
+            self._unsynced = 0
+        if self._size > self.max_bytes:
+            self._evict()
+
+    def _evict(self):
+        """가장 오래 사용되지 않은 엔트리부터 삭제"""
+        entries = sorted(self._scan(), key=lambda e: e[0])
+        total = sum(size for _, size, _ in entries)
+        target = self.max_bytes * self.EVICT_TARGET_RATIO
+
+        removed = 0
+        for _, size, path in entries:
+            if total <= target:
+                break
+            try:
+                path.unlink()
+            except FileNotFoundError:
+                pass
+            total -= size
+            removed += 1
+
+        self._size = total
+        self._unsynced = 0
+        logger.debug(f"OCR 캐시 정리: {removed}개 삭제, 현재 {total / (1 << 20):.1f}MB")
@@ -0,0 +1,302 @@
+"""
+상주 OCR 서버 / 클라이언트 (Unix 소켓)
+EasyOCR 모델을 한 번만 로드해 두고 페이지 이미지 또는 PDF 작업을 받아 처리한다.
+--sample 테스트나 스크립트 재실행마다 Reader 생성(모델 로드) 시간을 들이지 않기 위함.
+
+사용법:
+    python pdf_to_json_converter.py --serve /tmp/jeju_ocr.sock --input ./pdfs  # 서버 (모델 로드 후 대기)
+    python pdf_to_json_converter.py --sample a.pdf --ocr-server /tmp/jeju_ocr.sock  # 클라이언트
+
+메시지 형식: [4바이트 헤더 길이][JSON 헤더][바이너리 블롭...]
+헤더의 'blobs'에 뒤따르는 블롭 길이 목록이 들어간다 (페이지 이미지는 ndarray 원시 바이트).
+    요청: {'op': 'ping' | 'readtext' | 'readtext_batched' | 'pdf' | 'shutdown', ...}
+    응답: {'ok': True, ...} 또는 {'ok': False, 'error': 메시지}
+"""
+
+import os
+import json
+import socket
+import struct
+import logging
+import threading
+import socketserver
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+_HEADER = struct.Struct('>I')
+
+
+class OCRServerError(RuntimeError):
+    """서버가 작업 실패를 응답했거나 연결이 끊김"""
+
+
+def _recv_exact(sock: socket.socket, size: int) -> bytes:
+    chunks = []
+    while size:
+        chunk = sock.recv(min(size, 1 << 20))
+        if not chunk:
+            raise ConnectionError("OCR 서버 연결이 끊어졌습니다")
+        chunks.append(chunk)
+        size -= len(chunk)
+    return b''.join(chunks)
+
+
+def send_message(sock: socket.socket, header: dict, blobs: list = ()):
+    """헤더(JSON)와 바이너리 블롭 전송"""
+    header = dict(header, blobs=[len(blob) for blob in blobs])
+    data = json.dumps(header, ensure_ascii=False).encode('utf-8')
+    sock.sendall(_HEADER.pack(len(data)) + data)
+    for blob in blobs:
+        sock.sendall(blob)
+
+
+def recv_message(sock: socket.socket) -> tuple:
+    """(헤더, 블롭 목록) 수신"""
+    size, = _HEADER.unpack(_recv_exact(sock, _HEADER.size))
+    header = json.loads(_recv_exact(sock, size).decode('utf-8'))
+    blobs = [_recv_exact(sock, length) for length in header.pop('blobs', [])]
+    return header, blobs
+
+
+def _encode_image(image) -> tuple:
+    """ndarray → (메타데이터, 원시 바이트) (복사 없이 연속 메모리면 그대로)"""
+    import numpy as np
+
+    image = np.ascontiguousarray(image)
+    return {'shape': list(image.shape), 'dtype': str(image.dtype)}, memoryview(image).cast('B')
+
+
+def _decode_image(meta: dict, blob: bytes):
+    import numpy as np
+
+    return np.frombuffer(blob, dtype=meta['dtype']).reshape(meta['shape'])
+
+
+class _LockedReader:
+    """여러 연결이 모델을 동시에 부르지 않도록 readtext 호출을 직렬화"""
+
+    def __init__(self, reader, lock: threading.Lock):
+        self._reader = reader
+        self._lock = lock
+
+    def readtext(self, image, **kwargs):
+        with self._lock:
+            return self._reader.readtext(image, **kwargs)
+
+    def readtext_batched(self, images, **kwargs):
+        with self._lock:
+            return self._reader.readtext_batched(images, **kwargs)
+
+
+class _RequestHandler(socketserver.BaseRequestHandler):
+    """연결 하나에서 요청을 순서대로 처리 (클라이언트가 닫을 때까지)"""
+
+    def handle(self):
+        server = self.server
+        while True:
+            try:
+                request, blobs = recv_message(self.request)
+            except (ConnectionError, OSError):
+                return
+
+            op = request.get('op')
+            try:
+                response, response_blobs = server.ocr_server.handle(op, request, blobs)
+            except Exception as e:
+                logger.error(f"OCR 서버 작업 실패 [{op}]: {e}")
+                response, response_blobs = {'ok': False, 'error': str(e)}, []
+
+            try:
+                send_message(self.request, response, response_blobs)
+            except OSError:
+                return
+
+            if op == 'shutdown':
+                # serve_forever를 돌리는 스레드가 아니므로 여기서 바로 종료 요청 가능
+                threading.Thread(target=server.shutdown, daemon=True).start()
+                return
+
+
+class _UnixServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+
+class OCRServer:
+    """EasyOCR Reader를 한 번 로드해 두고 Unix 소켓으로 OCR 작업을 받는 서버
+
+    연결마다 스레드 하나가 처리하며, 모델 호출(readtext)은 잠금으로 직렬화하고
+    PDF 작업은 변환기 상태(중복 페이지 기억, 캐시)를 공유하므로 한 번에 하나씩 처리한다.
+
+    소켓은 소유자만 접근할 수 있게(0600) 만들고, PDF 작업은 input_root 아래 경로만 받는다.
+    """
+
+    def __init__(self, converter, socket_path: str, input_root: str = None):
+        """
+        Args:
+            converter: PDF 작업에 쓸 JejuFolkloreConverter (Reader도 여기서 로드)
+            socket_path: Unix 소켓 경로
+            input_root: PDF 작업을 허용할 디렉토리 (None이면 PDF 작업 거부)
+        """
+        self.converter = converter
+        self.socket_path = socket_path
+        self.input_root = Path(input_root).resolve() if input_root else None
+        self._reader_lock = threading.Lock()
+        self._convert_lock = threading.Lock()
+        # 처리한 요청 수 (연결 스레드마다 올리므로 잠금으로 보호)
+        self._jobs_lock = threading.Lock()
+        self.jobs = 0
+
+    def handle(self, op: str, request: dict, blobs: list) -> tuple:
+        """요청 하나 처리 → (응답 헤더, 응답 블롭)"""
+        reader = self.converter.reader
+        with self._jobs_lock:
+            self.jobs += 1
+            jobs = self.jobs
+
+        if op == 'ping':
+            return {'ok': True, 'jobs': jobs}, []
+
+        if op == 'readtext':
+            image = _decode_image(request['image'], blobs[0])
+            results = reader.readtext(image, **request.get('kwargs', {}))
+            return {'ok': True, 'results': self._normalize(results, request)}, []
+
+        if op == 'readtext_batched':
+            images = [_decode_image(meta, blob) for meta, blob in zip(request['images'], blobs)]
+            results = reader.readtext_batched(images, **request.get('kwargs', {}))
+            return {'ok': True, 'results': [self._normalize(r, request) for r in results]}, []
+
+        if op == 'pdf':
+            pdf_path = self._allowed_path(request['path'])
+            with self._convert_lock:
+                story = self.converter.convert_pdf_to_json(str(pdf_path))
+            return {'ok': True, 'story': story}, []
+
+        if op == 'shutdown':
+            return {'ok': True}, []
+
+        raise ValueError(f"알 수 없는 작업: {op}")
+
+    def _allowed_path(self, path: str) -> Path:
+        """PDF 작업 경로를 input_root 기준으로 확인 (심볼릭 링크/.. 해석 후, 밖이면 PermissionError)"""
+        if self.input_root is None:
+            raise PermissionError("PDF 작업이 허용되지 않음 (서버에 입력 디렉토리가 설정되지 않음)")
+        resolved = Path(path).resolve()
+        try:
+            resolved.relative_to(self.input_root)
+        except ValueError:
+            raise PermissionError(f"입력 디렉토리 밖의 경로: {path}") from None
+        return resolved
+
+    def _normalize(self, results: list, request: dict) -> list:
+        """readtext 결과를 JSON으로 보낼 수 있는 형태로 (detail=0이면 문자열 목록)"""
+        if request.get('kwargs', {}).get('detail', 1) == 0:
+            return [str(text) for text in results]
+        return self.converter._normalize_boxes(results)
+
+    def serve_forever(self):
+        """모델을 로드하고 소켓에서 요청 대기 (shutdown 요청 또는 Ctrl+C까지)"""
+        # 첫 요청 전에 모델 로드, 이후 모든 연결이 잠금을 거쳐 같은 Reader를 씀
+        self.converter._reader = _LockedReader(self.converter.reader, self._reader_lock)
+
+        if os.path.exists(self.socket_path):
+            os.unlink(self.socket_path)  # 이전 실행이 남긴 소켓 파일
+
+        # 바인드 순간부터 소유자 전용으로 만들고, umask와 무관하게 권한을 한 번 더 고정
+        old_umask = os.umask(0o177)
+        try:
+            server = _UnixServer(self.socket_path, _RequestHandler)
+        finally:
+            os.umask(old_umask)
+        os.chmod(self.socket_path, 0o600)
+        server.ocr_server = self
+        logger.info(f"OCR 서버 대기 중: {self.socket_path}")
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            server.server_close()
+            if os.path.exists(self.socket_path):
+                os.unlink(self.socket_path)
+            logger.info(f"OCR 서버 종료 (처리 작업 {self.jobs}개)")
+
+
+class OCRClient:
+    """OCRServer에 연결하는 클라이언트
+
+    readtext / readtext_batched는 easyocr.Reader와 같은 형태로 호출할 수 있으므로
+    변환기의 Reader 자리에 그대로 넣어 렌더링/캐시/적응형 DPI는 로컬에서, 모델 추론만
+    서버에서 수행한다. convert_pdf는 PDF 작업 전체를 서버에 맡긴다.
+    """
+
+    def __init__(self, socket_path: str, timeout: float = None):
+        """
+        Args:
+            socket_path: 서버 Unix 소켓 경로
+            timeout: 응답 대기 최대 시간 (초, None이면 무제한)
+        """
+        self.socket_path = socket_path
+        self.timeout = timeout
+        self._sock = None
+
+    def _request(self, header: dict, blobs: list = ()) -> dict:
+        if self._sock is None:
+            sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            sock.settimeout(self.timeout)
+            try:
+                sock.connect(self.socket_path)
+            except OSError as e:
+                sock.close()
+                raise OCRServerError(f"OCR 서버에 연결할 수 없습니다 ({self.socket_path}): {e}")
+            self._sock = sock
+
+        try:
+            send_message(self._sock, header, blobs)
+            response, _ = recv_message(self._sock)
+        except (ConnectionError, OSError) as e:
+            self.close()
+            raise OCRServerError(f"OCR 서버 통신 실패: {e}")
+
+        if not response.get('ok'):
+            raise OCRServerError(response.get('error', '알 수 없는 오류'))
+        return response
+
+    def ping(self) -> dict:
+        return self._request({'op': 'ping'})
+
+    def readtext(self, image, **kwargs) -> list:
+        """easyocr.Reader.readtext와 같은 호출 (결과 박스 좌표는 리스트)"""
+        meta, blob = _encode_image(image)
+        response = self._request({'op': 'readtext', 'image': meta, 'kwargs': kwargs}, [blob])
+        return self._denormalize(response['results'])
+
+    def readtext_batched(self, images: list, **kwargs) -> list:
+        """easyocr.Reader.readtext_batched와 같은 호출"""
+        encoded = [_encode_image(image) for image in images]
+        response = self._request({
+            'op': 'readtext_batched',
+            'images': [meta for meta, _ in encoded],
+            'kwargs': kwargs
+        }, [blob for _, blob in encoded])
+        return [self._denormalize(results) for results in response['results']]
+
+    @staticmethod
+    def _denormalize(results: list) -> list:
+        """[bbox, text, conf] 목록 → readtext(detail=1)와 같은 튜플 목록"""
+        return [tuple(item) if isinstance(item, list) else item for item in results]
+
+    def convert_pdf(self, pdf_path: str) -> dict:
+        """PDF 변환 전체를 서버에서 수행하여 설화 JSON 반환"""
+        return self._request({'op': 'pdf', 'path': os.path.abspath(pdf_path)})['story']
+
+    def shutdown(self):
+        """서버 종료 요청"""
+        self._request({'op': 'shutdown'})
+        self.close()
+
+    def close(self):
+        if self._sock is not None:
+            self._sock.close()
+            self._sock = None
@@ -5,21 +5,41 @@ PDF 이미지에서 OCR로 텍스트 추출 후 구조화된 JSON으로 변환
 사용법:
     python pdf_to_json_converter.py --input /path/to/pdfs --output /path/to/json
     python pdf_to_json_converter.py --sample /path/to/single.pdf  # 샘플 테스트
+    python pdf_to_json_converter.py --input /path/to/pdfs --output /path/to/json --workers 4  # 병렬 변환
+    python pdf_to_json_converter.py --input /path/to/pdfs --output /path/to/json --cache-dir .ocr_cache  # OCR 캐시
+    python pdf_to_json_converter.py --input /path/to/pdfs --output /path/to/json --resume  # 중단 지점부터 재개
+    python pdf_to_json_converter.py --reparse /path/to/json  # OCR 없이 raw_text만 다시 파싱
+    python pdf_to_json_converter.py --serve /tmp/jeju_ocr.sock --input /path/to/pdfs  # 상주 OCR 서버 (모델 1회 로드)
+    python pdf_to_json_converter.py --sample /path/to/single.pdf --ocr-server /tmp/jeju_ocr.sock
 """
 
 import os
 import re
+import sys
 import json
+import shutil
+import hashlib
+import tempfile
 import argparse
+import time
+import queue
 import logging
+import threading
+import multiprocessing
+from collections import OrderedDict
 from pathlib import Path
 from datetime import datetime
+from itertools import repeat
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, ThreadPoolExecutor, wait
 
-# PDF/이미지 처리
-import fitz  # PyMuPDF
+# PyMuPDF(fitz)와 EasyOCR은 무거우므로 실제로 렌더링/OCR 할 때 불러온다
+# (--reparse 처럼 raw_text만 다시 파싱할 때는 로드하지 않음)
 
-# OCR
-import easyocr
+from ocr_cache import OCRCache, file_sha256
+from jsonl_sink import RotatingJsonlWriter, write_json_atomic
+from text_analyzer import TextAnalyzer
+from timing_stats import TimingAggregate
+from text_spill import PLACEHOLDER, TextSpill, strip_chunks, dump_json_streaming
 
 # 로깅 설정
 logging.basicConfig(
@@ -32,45 +52,728 @@ logger = logging.getLogger(__name__)
 class JejuFolkloreConverter:
     """제주 설화 PDF를 JSON으로 변환하는 클래스"""
 
-    def __init__(self, use_gpu=True):
+    # OCR 설정
+    LANGUAGES = ['ko', 'en']
+
+    # 적응형 DPI: 1차 OCR DPI, 재렌더링 DPI, 재렌더링 기준 신뢰도
+    BASE_DPI = 150
+    MAX_DPI = 300
+    MIN_CONFIDENCE = 0.6
+    # 신뢰도 낮은 글자가 이 비율을 넘거나 영역이 너무 많으면 페이지 전체 재렌더링
+    PAGE_ESCALATION_RATIO = 0.5
+    MAX_ESCALATION_REGIONS = 12
+    REGION_PADDING_PX = 4
+
+    # 내장 텍스트 레이어 채택 기준 (미달시 OCR로 대체)
+    NATIVE_TEXT_MIN_CHARS = 20
+    NATIVE_TEXT_MIN_CONFIDENCE = 0.6
+
+    # 빈 페이지: 이보다 어두운 픽셀(0~255)의 비율이 기준 이하면 OCR 생략
+    BLANK_INK_LEVEL = 128
+    # (12pt 한 줄짜리 페이지도 0.0005 안팎이므로 기준은 그보다 훨씬 낮게 두고,
+    #  텍스트 레이어에 글자가 하나라도 있으면 빈 페이지로 보지 않음)
+    BLANK_MAX_INK_RATIO = 0.00002
+    # 중복 페이지: 축소 샘플의 바이트 다이제스트가 같은 페이지, 결과를 기억해 둘 최근 페이지 수
+    # (문서가 바뀌어도 유지)
+    DUPLICATE_MEMORY = 1024
+    # 판정용 축소 샘플링 간격 (픽셀)
+    FILTER_SAMPLE_STEP = 4
+
+    # 본문 영역(ROI) 자동 검출: 어두운 픽셀 비율이 이 값을 넘는 행/열을 본문으로 보고,
+    # 그 외곽 사각형에 여백을 더해 자름 (ROI가 페이지의 대부분이면 자르지 않음)
+    ROI_MIN_LINE_INK = 0.005
+    ROI_PADDING_PX = 16
+    ROI_MAX_AREA_RATIO = 0.95
+
+    # 계측 단계 (페이지 단위: 텍스트 레이어 확인 ~ 재렌더링, 파일 단위: 파싱)
+    PAGE_STAGES = ('native', 'cache', 'render', 'filter', 'ocr', 'refine')
+    FILE_STAGES = ('extract', 'parse', 'total')
+
+    # 일괄 변환 중 요약 파일을 다시 쓰는 간격 (파일 수)
+    SUMMARY_FLUSH_EVERY = 10
+
+    def __init__(self, use_gpu=True, cache_dir=None, cache_max_mb=2048,
+                 use_native_text=True, prefetch_pages=2, base_dpi=BASE_DPI, max_dpi=MAX_DPI,
+                 min_confidence=MIN_CONFIDENCE, batch_size=1, grayscale=False,
+                 filter_pages=True, roi=None, stream_pages=False, ocr_server=None):
         """
         Args:
             use_gpu: GPU 사용 여부 (CUDA 가능시)
+            cache_dir: 페이지 OCR 결과 캐시 디렉토리 (None이면 캐시 사용 안함)
+            cache_max_mb: 캐시 최대 용량 (MB, 초과시 LRU 삭제)
+            use_native_text: PDF 내장 텍스트 레이어가 충분하면 OCR 생략
+            prefetch_pages: OCR 대기 중 미리 렌더링해 둘 최대 페이지 수
+            base_dpi: 1차 OCR 렌더링 DPI
+            max_dpi: 신뢰도가 낮은 페이지/영역을 다시 렌더링할 DPI
+            min_confidence: 재렌더링 기준 EasyOCR 신뢰도 (0~1)
+            batch_size: 한 번에 OCR 할 페이지 수 (인식기 배치 크기로도 사용)
+            grayscale: 페이지를 흑백(1채널)으로 렌더링 (픽셀 메모리 1/3)
+            filter_pages: 빈 페이지는 OCR 생략, 이미 OCR 한 페이지와 같은 이미지면 결과 재사용
+            roi: OCR 할 본문 영역. None이면 페이지 전체, 'auto'이면 페이지마다 투영 프로파일로
+                 검출, (x0, y0, x1, y1)이면 페이지 크기 대비 비율(0~1)로 고정
+            stream_pages: 일괄 변환에서 페이지 텍스트를 임시 파일에 쌓으며 분석하고
+                          JSON을 바로 파일로 기록 (convert_pdf_to_file, 문서 길이와 무관한 메모리)
+            ocr_server: 상주 OCR 서버(ocr_server.OCRServer) 소켓 경로. 주어지면 모델을 로드하지 않고
+                        페이지 이미지를 서버로 보내 인식 (렌더링/캐시/적응형 DPI는 로컬에서)
         """
-        logger.info("EasyOCR 초기화 중... (첫 실행시 모델 다운로드)")
-        self.reader = easyocr.Reader(['ko', 'en'], gpu=use_gpu)
-        logger.info("EasyOCR 초기화 완료")
-
-        # 섹션 패턴 정의
-        self.section_patterns = {
-            'summary': r'[①1]\s*개요',
-            'content': r'[②2]\s*내용',
-            'features': r'[③3]\s*특징',
-            'keywords': r'[④4]\s*핵심어',
-            'source': r'[⑤5]\s*원전\s*서지사항',
-            'related': r'[⑥6]\s*관련\s*자료'
+        # 워커 프로세스에서 동일한 설정으로 변환기를 다시 만들기 위해 보관
+        self.init_kwargs = {
+            'use_gpu': use_gpu,
+            'cache_dir': cache_dir,
+            'cache_max_mb': cache_max_mb,
+            'use_native_text': use_native_text,
+            'prefetch_pages': prefetch_pages,
+            'base_dpi': base_dpi,
+            'max_dpi': max_dpi,
+            'min_confidence': min_confidence,
+            'batch_size': batch_size,
+            'grayscale': grayscale,
+            'filter_pages': filter_pages,
+            'roi': roi,
+            'stream_pages': stream_pages,
+            'ocr_server': ocr_server
         }
+        self.use_native_text = use_native_text
+        self.prefetch_pages = max(1, prefetch_pages)
+        self.base_dpi = base_dpi
+        self.max_dpi = max_dpi
+        self.min_confidence = min_confidence
+        self.batch_size = max(1, batch_size)
+        self.grayscale = grayscale
+        self.filter_pages = filter_pages
+        self.roi = roi
+        self.stream_pages = stream_pages
+
+        # 중복 판정 키 '<이미지 크기>:<샘플 다이제스트>' → 페이지 OCR 기록 (최근 사용 순, 소비자 스레드 전용)
+        self._seen_pages = OrderedDict()
+
+        self.cache = None
+        if cache_dir:
+            self.cache = OCRCache(cache_dir, max_bytes=cache_max_mb << 20)
+
+        self.use_gpu = use_gpu
+        self.ocr_server = ocr_server
+        self._reader = None
+
+        # 섹션/등장인물/지명/카테고리 분석기 (사전 컴파일, 단일 스캔)
+        self.analyzer = TextAnalyzer()
+
+    @property
+    def reader(self):
+        """EasyOCR Reader (처음 OCR 할 때 생성, ocr_server가 있으면 서버 클라이언트)"""
+        if self._reader is None and self.ocr_server:
+            from ocr_server import OCRClient
+
+            self._reader = OCRClient(self.ocr_server)
+            logger.info(f"OCR 서버 사용: {self.ocr_server} (작업 {self._reader.ping()['jobs']}개 처리됨)")
+
+        if self._reader is None:
+            import easyocr
+
+            logger.info("EasyOCR 초기화 중... (첫 실행시 모델 다운로드)")
+            self._reader = easyocr.Reader(self.LANGUAGES, gpu=self.use_gpu)
+            logger.info("EasyOCR 초기화 완료")
+        return self._reader
+
+    def extract_text_from_pdf(self, pdf_path: str, page_log: list = None) -> str:
+        """PDF에서 텍스트 추출 (iter_page_texts의 페이지 텍스트를 빈 줄로 이어 붙임)"""
+        return '\n\n'.join(self.iter_page_texts(pdf_path, page_log=page_log))
+
+    def iter_page_texts(self, pdf_path: str, page_log: list = None):
+        """PDF에서 페이지 순서대로 페이지 텍스트를 생성
+
+        페이지마다 내장 텍스트 레이어를 먼저 확인하고, 품질 기준을 넘지 못하는
+        (이미지 전용) 페이지만 렌더링 후 OCR 한다.
+
+        렌더링 스레드(_render_pages)가 크기 제한 큐에 페이지 이미지를 채우는 동안
+        현재 스레드는 큐를 비우며 OCR을 수행하므로 래스터화와 OCR 모델이 겹쳐 돈다.
+        큐 크기(prefetch_pages)가 메모리에 올라가는 렌더링 결과 수의 상한이다.
+        OCR 대상 페이지는 batch_size 개씩 모아 한 번에 인식하고(_ocr_batch),
+        신뢰도가 낮은 페이지/영역만 높은 DPI로 다시 렌더링한다.
+        filter_pages이면 렌더링 이미지로 빈 페이지를 건너뛰고, 앞서 OCR 한 페이지
+        (다른 문서 포함)와 같은 이미지면 그 결과를 재사용한다 (_find_duplicate).
+        roi가 설정되면 본문 영역만 잘라 인식기에 넘기고 박스 좌표는 페이지 좌표로 되돌린다.
+
+        앞 페이지들이 모두 끝나는 즉시 내보내므로 메모리에 남는 페이지 결과는
+        prefetch/배치 크기 정도로 문서 길이와 무관하다.
+
+        Args:
+            pdf_path: PDF 파일 경로
+            page_log: 주어지면 페이지별 {'page', 'source', 'dpi', 'confidence',
+                      'escalated', 'refined_regions', 'chars', 'seconds', 'stages'} 기록을 추가
+                      (source: native / cache / ocr / blank / duplicate,
+                       stages: 단계명 → 초, 단계는 PAGE_STAGES 참고)
+        """
+        import fitz  # PyMuPDF
 
-    def extract_text_from_pdf(self, pdf_path: str) -> str:
-        """PDF에서 텍스트 추출 (OCR 사용)"""
         doc = fitz.open(pdf_path)
-        full_text = []
+        # 문서 객체는 렌더링 스레드와 재렌더링(고해상도) 단계가 공유하므로 잠금으로 직렬화
+        doc_lock = threading.Lock()
+        # 배치를 채우는 동안에도 렌더링이 멈추지 않도록 큐는 배치 크기 이상
+        page_queue = queue.Queue(maxsize=max(self.prefetch_pages, self.batch_size))
+        stop_event = threading.Event()
+        renderer = threading.Thread(
+            target=self._render_pages,
+            args=(pdf_path, doc, doc_lock, page_queue, stop_event),
+            name='pdf-render',
+            daemon=True
+        )
+        renderer.start()
+
+        records = {}  # 아직 내보내지 않은 page_num → (source, 페이지 기록, 단계별 소요 시간)
+        pending = []  # OCR 배치 대기 중인 큐 항목
+        next_page = 0
+        try:
+            while True:
+                item = page_queue.get()
+                if isinstance(item, Exception):
+                    raise item
+
+                if item is None:
+                    if pending:
+                        records.update(self._ocr_batch(doc, doc_lock, pending))
+
+                elif item[1] == 'ocr':
+                    page_num, _, (_, _, _, cache_key, page_key), stages = item
+                    record = self._find_duplicate(page_key)
+                    if record is not None:
+                        # 이미지가 바이트 단위로 같으므로 이 페이지의 캐시 키로도 저장 (재실행시 캐시 적중)
+                        logger.debug(f"페이지 {page_num + 1} 중복 페이지 결과 재사용")
+                        if cache_key:
+                            self.cache.put(cache_key, record)
+                        records[page_num] = ('duplicate', record, stages)
+                    else:
+                        pending.append(item)
+                        if len(pending) >= self.batch_size:
+                            records.update(self._ocr_batch(doc, doc_lock, pending))
+                            pending = []
+
+                else:
+                    page_num, source, payload, stages = item
+                    if source == 'native':
+                        record = {'text': payload, 'dpi': None, 'confidence': 1.0, 'escalated': None}
+                        logger.debug(f"페이지 {page_num + 1} 내장 텍스트 사용")
+                    elif source == 'blank':
+                        record = {'boxes': [], 'dpi': self.base_dpi, 'confidence': 0.0, 'escalated': None}
+                        if payload:
+                            self.cache.put(payload, record)
+                        logger.debug(f"페이지 {page_num + 1} 빈 페이지 (OCR 생략)")
+                    else:
+                        record = payload
+                        # 뒤 페이지가 이 페이지와 같으면 다시 OCR 하지 않도록 기억
+                        self._remember_page(record.get('page_key'), record)
+                        logger.debug(f"페이지 {page_num + 1} OCR 캐시 사용")
+                    records[page_num] = (source, record, stages)
+
+                while next_page in records:
+                    yield self._page_text(next_page, records.pop(next_page), page_log)
+                    next_page += 1
+
+                if item is None:
+                    break
+        finally:
+            # OCR 단계에서 예외가 나거나 호출자가 중간에 멈춰도
+            # 렌더링 스레드가 큐에 막혀 남지 않도록 정지
+            stop_event.set()
+            renderer.join()
+            doc.close()
+
+    def _page_text(self, page_num: int, entry: tuple, page_log: list = None) -> str:
+        """페이지 결과 (source, 기록, 단계별 시간) → 텍스트 (page_log가 있으면 기록 추가)"""
+        source, record, stages = entry
+        page_text = record.get('text')
+        if page_text is None:
+            page_text = self._boxes_to_text(record['boxes'])
+
+        if page_log is not None:
+            page_log.append({
+                'page': page_num + 1,
+                'source': source,
+                'dpi': record['dpi'],
+                'confidence': record['confidence'],
+                'escalated': record['escalated'],
+                'refined_regions': record.get('refined_regions', []),
+                'chars': len(page_text),
+                'seconds': round(sum(stages.values()), 3),
+                'stages': {name: round(sec, 4) for name, sec in stages.items()}
+            })
+        return page_text
+
+    def _ocr_batch(self, doc, doc_lock: threading.Lock, items: list) -> dict:
+        """렌더링된 페이지 여러 장을 한 번에 OCR
+
+        같은 크기의 이미지끼리 readtext_batched로 묶어 검출/인식 모델 호출 비용을
+        페이지 수만큼 나눠 내고, 이후 페이지별로 저신뢰 영역을 재렌더링한다.
+        ROI로 잘라 크기가 제각각인 이미지는 오른쪽/아래를 흰색으로 채워 크기를 맞춘다.
+
+        Returns:
+            page_num → ('ocr', 페이지 기록, 단계별 소요 시간)
+            (렌더링 단계 시간에 배치 몫 'ocr'과 재렌더링 'refine' 시간을 더함)
+        """
+        start = time.perf_counter()
+
+        images = {page_num: image for page_num, _, (_, image, _, _, _), _ in items}
+        if self.roi is not None and len(items) > 1:
+            images = self._pad_images(images)
+
+        groups = {}
+        for page_num, image in images.items():
+            groups.setdefault(image.shape, []).append(page_num)
+
+        first_pass = {}
+        for page_nums in groups.values():
+            batch = self._readtext_boxes_batched([images[page_num] for page_num in page_nums])
+            first_pass.update(zip(page_nums, batch))
+        del images, groups
+        batch_share = (time.perf_counter() - start) / len(items)
+
+        results = {}
+        for page_num, _, (_, _, roi, cache_key, page_key), stages in items:
+            refine_start = time.perf_counter()
+            boxes = first_pass[page_num]
+            if roi:
+                boxes = self._offset_boxes(boxes, roi[0], roi[1])
+            record = self._refine_page(doc, doc_lock, page_num, boxes, roi=roi)
+            if page_key:
+                record['page_key'] = page_key
+            if cache_key:
+                self.cache.put(cache_key, record)
+            self._remember_page(page_key, record)
+            logger.debug(f"페이지 {page_num + 1} OCR 완료 "
+                         f"(DPI {record['dpi']}, 신뢰도 {record['confidence']})")
+            stages = dict(stages, ocr=batch_share, refine=time.perf_counter() - refine_start)
+            results[page_num] = ('ocr', record, stages)
 
-        for page_num in range(len(doc)):
-            page = doc[page_num]
-            # 고해상도로 이미지 렌더링
-            pix = page.get_pixmap(dpi=200)
-            img_bytes = pix.tobytes("png")
+        return results
 
-            # OCR 수행
-            results = self.reader.readtext(img_bytes, detail=0, paragraph=True)
-            page_text = '\n'.join(results)
-            full_text.append(page_text)
+    def _render_pages(self, pdf_path: str, doc, doc_lock: threading.Lock,
+                      page_queue: queue.Queue, stop_event: threading.Event):
+        """렌더링 스레드 (생산자): 페이지를 순서대로 준비하여 큐에 넣음
+
+        큐 항목은 (page_num, source, payload, stages) 이며
+            native → payload: 내장 텍스트
+            cache  → payload: 캐시된 페이지 OCR 기록 (_refine_page 반환값)
+            blank  → payload: 캐시 키 (OCR 생략)
+            ocr    → payload: (1차 DPI로 렌더링한 Pixmap, OCR 할 ndarray (Pixmap 버퍼 뷰 또는 ROI),
+                               ROI (x0, y0, x1, y1) 픽셀 또는 None, 캐시 키, 중복 판정 키 또는 None)
+        stages는 이 스레드에서 쓴 단계별 시간 (native / cache / render / filter).
+        끝나면 None, 오류가 나면 예외 객체를 넣는다.
+        """
+        try:
+            # 캐시 키는 파일 내용 기준 (경로/파일명 변경과 무관)
+            pdf_hash = file_sha256(pdf_path) if self.cache else None
+
+            for page_num in range(len(doc)):
+                if stop_event.is_set():
+                    return
+                stages = {}
+
+                # 1) 내장 텍스트 레이어 (렌더링/OCR 불필요)
+                if self.use_native_text:
+                    start = time.perf_counter()
+                    with doc_lock:
+                        native_text = doc[page_num].get_text().strip()
+                    stages['native'] = time.perf_counter() - start
+                else:
+                    native_text = ''
+
+                if self._is_usable_text_layer(native_text):
+                    item = (page_num, 'native', native_text)
+
+                else:
+                    # 2) OCR 캐시
+                    cache_key = None
+                    record = None
+                    if self.cache:
+                        cache_key = OCRCache.make_key(pdf_hash, page_num, self.base_dpi,
+                                                      self.LANGUAGES, variant=self._ocr_variant())
+                        start = time.perf_counter()
+                        record = self.cache.get(cache_key)
+                        stages['cache'] = time.perf_counter() - start
+
+                    if record is not None:
+                        item = (page_num, 'cache', record)
+                    else:
+                        # 3) 1차 DPI로 이미지 렌더링 (OCR은 소비자 쪽에서)
+                        start = time.perf_counter()
+                        with doc_lock:
+                            pix, image = self._render_image(doc[page_num], self.base_dpi)
+                        stages['render'] = time.perf_counter() - start
+
+                        # 4) 빈 페이지 판정 / 중복 판정용 지문 (OCR 전, 축소 샘플 기준)
+                        page_key = None
+                        if self.filter_pages:
+                            start = time.perf_counter()
+                            ink_ratio, page_key = self._page_signature(image)
+                            stages['filter'] = time.perf_counter() - start
+
+                        is_blank = page_key and ink_ratio <= self.BLANK_MAX_INK_RATIO
+                        if is_blank and not self.use_native_text:
+                            # --force-ocr 라도 빈 페이지 판정에는 텍스트 레이어 확인
+                            start = time.perf_counter()
+                            with doc_lock:
+                                native_text = doc[page_num].get_text().strip()
+                            stages['filter'] += time.perf_counter() - start
+
+                        if is_blank and not native_text:
+                            del image, pix
+                            item = (page_num, 'blank', cache_key)
+                        else:
+                            # 5) 본문 영역만 남김 (헤더/푸터/여백 제외)
+                            roi = None
+                            if self.roi is not None:
+                                start = time.perf_counter()
+                                image, roi = self._crop_to_roi(image)
+                                stages['filter'] = stages.get('filter', 0.0) + time.perf_counter() - start
+                            item = (page_num, 'ocr', (pix, image, roi, cache_key, page_key))
+
+                item += (stages,)
+                if not self._put_page(page_queue, item, stop_event):
+                    return
+        except Exception as e:
+            self._put_page(page_queue, e, stop_event)
+            return
+
+        self._put_page(page_queue, None, stop_event)
+
+    @staticmethod
+    def _put_page(page_queue: queue.Queue, item, stop_event: threading.Event) -> bool:
+        """큐가 찬 동안 대기하되, 소비자가 중단하면 포기 (False 반환)"""
+        while not stop_event.is_set():
+            try:
+                page_queue.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def _render_image(self, page, dpi: int, clip=None) -> tuple:
+        """페이지(또는 clip 영역)를 렌더링하여 (Pixmap, ndarray 뷰) 반환
+
+        PNG 인코딩/디코딩 없이 Pixmap 픽셀 버퍼를 복사하지 않고 그대로 감싸
+        EasyOCR에 넘긴다 (흑백이면 (높이, 너비), 컬러면 (높이, 너비, 3) RGB).
+        배열은 Pixmap 메모리를 가리키므로 OCR이 끝날 때까지 Pixmap을 함께 보관하고,
+        놓을 때는 배열을 먼저 놓아야 한다.
+        """
+        import fitz  # PyMuPDF
+        import numpy as np
 
-            logger.debug(f"페이지 {page_num + 1} OCR 완료")
+        colorspace = fitz.csGRAY if self.grayscale else fitz.csRGB
+        pix = page.get_pixmap(dpi=dpi, clip=clip, colorspace=colorspace, alpha=False)
 
-        doc.close()
-        return '\n\n'.join(full_text)
+        image = np.frombuffer(pix.samples_mv, dtype=np.uint8)
+        image = image.reshape(pix.height, pix.stride)[:, :pix.width * pix.n]
+        if pix.n == 1:
+            image = image.reshape(pix.height, pix.width)
+        else:
+            image = image.reshape(pix.height, pix.width, pix.n)
+        return pix, image
+
+    def _gray_sample(self, image):
+        """FILTER_SAMPLE_STEP 간격으로 샘플링한 흑백 이미지 (float32)"""
+        import numpy as np
+
+        step = self.FILTER_SAMPLE_STEP
+        sample = image[::step, ::step]
+        if sample.ndim == 3:
+            return sample.mean(axis=2, dtype=np.float32)
+        return sample.astype(np.float32)
+
+    def _find_roi(self, image):
+        """OCR 할 본문 영역 (x0, y0, x1, y1) 픽셀 좌표, 자를 필요가 없으면 None
+
+        roi='auto'이면 샘플 이미지의 행/열 투영 프로파일(어두운 픽셀 비율)이
+        ROI_MIN_LINE_INK를 넘는 첫/마지막 행과 열로 본문 사각형을 잡고 ROI_PADDING_PX만큼 넓힌다.
+        """
+        import numpy as np
+
+        height, width = image.shape[:2]
+        if self.roi == 'auto':
+            ink = self._gray_sample(image) < self.BLANK_INK_LEVEL
+            rows = np.flatnonzero(ink.mean(axis=1) > self.ROI_MIN_LINE_INK)
+            cols = np.flatnonzero(ink.mean(axis=0) > self.ROI_MIN_LINE_INK)
+            if not len(rows) or not len(cols):
+                return None
+            step, pad = self.FILTER_SAMPLE_STEP, self.ROI_PADDING_PX
+            x0 = max(0, int(cols[0]) * step - pad)
+            y0 = max(0, int(rows[0]) * step - pad)
+            x1 = min(width, (int(cols[-1]) + 1) * step + pad)
+            y1 = min(height, (int(rows[-1]) + 1) * step + pad)
+        else:
+            fx0, fy0, fx1, fy1 = self.roi
+            x0, y0 = int(fx0 * width), int(fy0 * height)
+            x1, y1 = int(round(fx1 * width)), int(round(fy1 * height))
+
+        if x1 <= x0 or y1 <= y0 \
+                or (x1 - x0) * (y1 - y0) > width * height * self.ROI_MAX_AREA_RATIO:
+            return None
+        return x0, y0, x1, y1
+
+    def _crop_to_roi(self, image) -> tuple:
+        """(본문 영역 이미지, ROI) - ROI가 없으면 (원본, None)
+
+        잘라낸 영역은 인식기가 연속 메모리를 요구하므로 복사한다 (페이지 전체보다 작음).
+        """
+        import numpy as np
+
+        roi = self._find_roi(image)
+        if roi is None:
+            return image, None
+        x0, y0, x1, y1 = roi
+        return np.ascontiguousarray(image[y0:y1, x0:x1]), roi
+
+    @staticmethod
+    def _pad_images(images: dict) -> dict:
+        """크기가 다른 이미지들의 오른쪽/아래를 흰색으로 채워 같은 크기로 맞춤 (좌표 원점 유지)"""
+        import numpy as np
+
+        height = max(image.shape[0] for image in images.values())
+        width = max(image.shape[1] for image in images.values())
+
+        padded = {}
+        for key, image in images.items():
+            if image.shape[:2] != (height, width):
+                canvas = np.full((height, width) + image.shape[2:], 255, dtype=image.dtype)
+                canvas[:image.shape[0], :image.shape[1]] = image
+                image = canvas
+            padded[key] = image
+        return padded
+
+    @staticmethod
+    def _offset_boxes(boxes: list, dx: float, dy: float) -> list:
+        """잘라낸 영역 기준 박스 좌표를 페이지 좌표로 이동"""
+        return [
+            [[[x + dx, y + dy] for x, y in bbox], text, conf]
+            for bbox, text, conf in boxes
+        ]
+
+    def _page_signature(self, image) -> tuple:
+        """렌더링 이미지의 (잉크 비율, 중복 판정 키)
+
+        FILTER_SAMPLE_STEP 간격으로 샘플링한 흑백 이미지에서
+        - 잉크 비율: BLANK_INK_LEVEL보다 어두운 픽셀 비율
+        - 중복 판정 키: '<이미지 크기>:<샘플 바이트의 BLAKE2b 다이제스트>'
+          글자가 적은 페이지는 지각 해시(dHash 등)로는 내용이 달라도 거의 같게 나오므로
+          샘플 픽셀이 바이트 단위로 같을 때만 같은 페이지로 본다.
+          OCR 기록에도 저장하여(page_key) 캐시에서 읽은 페이지도 중복 판정에 쓴다.
+        """
+        gray = self._gray_sample(image)
+        ink_ratio = float((gray < self.BLANK_INK_LEVEL).mean())
+        digest = hashlib.blake2b(gray.tobytes(), digest_size=16).hexdigest()
+        return ink_ratio, f"{'x'.join(map(str, image.shape))}:{digest}"
+
+    def _find_duplicate(self, page_key):
+        """최근 OCR 한 (또는 캐시에서 읽은) 페이지 중 중복 판정 키가 같은 페이지의 기록"""
+        if page_key is None:
+            return None
+
+        record = self._seen_pages.get(page_key)
+        if record is not None:
+            self._seen_pages.move_to_end(page_key)
+        return record
+
+    def _remember_page(self, page_key, record: dict):
+        """페이지 기록을 중복 판정용으로 기억 (DUPLICATE_MEMORY 개 초과시 오래된 것부터 삭제)"""
+        if page_key is None:
+            return
+        self._seen_pages[page_key] = record
+        self._seen_pages.move_to_end(page_key)
+        while len(self._seen_pages) > self.DUPLICATE_MEMORY:
+            self._seen_pages.popitem(last=False)
+
+    def _ocr_variant(self) -> str:
+        """캐시 키에 들어갈 OCR 설정 (설정이 바뀌면 다른 엔트리가 됨)"""
+        # 'regions': 페이지 평균과 무관하게 저신뢰 박스를 영역 재인식 (이전 캐시 기록과 구분)
+        variant = f"adaptive:{self.base_dpi}-{self.max_dpi}@{self.min_confidence}:regions"
+        if self.grayscale:
+            variant += ":gray"
+        if not self.filter_pages:
+            # 빈 페이지로 캐시된 기록을 필터를 끈 실행에서 쓰지 않도록 구분
+            variant += ":nofilter"
+        if self.roi is not None:
+            variant += f":roi={self.roi if self.roi == 'auto' else ','.join(map(str, self.roi))}"
+        return variant
+
+    @staticmethod
+    def _normalize_boxes(results: list) -> list:
+        """readtext(detail=1) 결과를 JSON 저장 가능한 [bbox, text, confidence] 목록으로 변환"""
+        return [
+            [[[float(x), float(y)] for x, y in bbox], str(text), float(conf)]
+            for bbox, text, conf in results
+        ]
+
+    def _readtext_boxes(self, image) -> list:
+        """이미지 한 장 OCR (detail=1)"""
+        results = self.reader.readtext(image, detail=1, paragraph=False,
+                                       batch_size=self.batch_size)
+        return self._normalize_boxes(results)
+
+    def _readtext_boxes_batched(self, images: list) -> list:
+        """같은 크기의 이미지 여러 장을 검출/인식 모델에 한 번에 넣어 OCR"""
+        if len(images) == 1:
+            return [self._readtext_boxes(images[0])]
+        results = self.reader.readtext_batched(images, detail=1, paragraph=False,
+                                               batch_size=self.batch_size)
+        return [self._normalize_boxes(page_results) for page_results in results]
+
+    def _refine_page(self, doc, doc_lock: threading.Lock, page_num: int, boxes: list,
+                     roi: tuple = None) -> dict:
+        """신뢰도 기반 적응형 DPI OCR (1차 OCR 결과 보정)
+
+        1차 DPI 이미지의 OCR 박스별 EasyOCR 신뢰도를 본다 (페이지 평균과 무관하게 박스 단위).
+        - 기준 미만 박스가 없으면 그대로 사용
+        - 페이지 전체가 고르게 나쁘면 (박스가 없거나, 낮은 글자가 PAGE_ESCALATION_RATIO를 넘거나,
+          낮은 박스가 MAX_ESCALATION_REGIONS개를 넘으면) 페이지 전체(ROI가 있으면 ROI)를
+          max_dpi로 다시 OCR
+        - 그 외에는 낮은 박스 영역만 max_dpi로 다시 렌더링하여 재인식
+          (페이지 DPI는 1차 DPI 그대로, 바뀐 영역은 'refined_regions'에 기록)
+
+        Args:
+            boxes: 1차 OCR 박스 (페이지 픽셀 좌표)
+            roi: 1차 OCR에 쓴 본문 영역 (x0, y0, x1, y1) 픽셀 좌표 또는 None
+
+        Returns:
+            {'boxes', 'dpi', 'confidence', 'escalated'(None/'regions'/'page')}
+            (+ ROI를 쓰면 'roi', 영역 재인식으로 바뀐 박스가 있으면
+               'refined_regions': 1차 DPI 픽셀 좌표 [x0, y0, x1, y1] 목록)
+        """
+        import fitz  # PyMuPDF
+
+        record = {
+            'boxes': boxes,
+            'dpi': self.base_dpi,
+            'confidence': self._boxes_confidence(boxes),
+            'escalated': None
+        }
+        if roi:
+            record['roi'] = list(roi)
+        if self.max_dpi <= self.base_dpi:
+            return record
+
+        low_boxes = [box for box in boxes if box[2] < self.min_confidence]
+        if boxes and not low_boxes:
+            return record
+        low_chars = sum(len(box[1]) for box in low_boxes)
+        total_chars = sum(len(box[1]) for box in boxes)
+
+        if not boxes or len(low_boxes) > self.MAX_ESCALATION_REGIONS \
+                or low_chars > total_chars * self.PAGE_ESCALATION_RATIO:
+            # 페이지 전체(또는 ROI) 재렌더링
+            clip = None
+            if roi:
+                clip = fitz.Rect(*(v * 72.0 / self.base_dpi for v in roi))
+            with doc_lock:
+                pix, hi_image = self._render_image(doc[page_num], self.max_dpi, clip=clip)
+            hi_boxes = self._readtext_boxes(hi_image)
+            del hi_image, pix  # 배열 뷰를 먼저 놓아야 Pixmap 버퍼를 해제할 수 있음
+            if roi:
+                hi_scale = self.max_dpi / self.base_dpi
+                hi_boxes = self._offset_boxes(hi_boxes, roi[0] * hi_scale, roi[1] * hi_scale)
+            hi_confidence = self._boxes_confidence(hi_boxes)
+            if hi_confidence > record['confidence']:
+                record.update(boxes=hi_boxes, dpi=self.max_dpi,
+                              confidence=hi_confidence, escalated='page')
+            return record
+
+        # 신뢰도가 낮은 영역만 재렌더링 (픽셀 좌표 → PDF 포인트 좌표)
+        scale = 72.0 / self.base_dpi
+        pad = self.REGION_PADDING_PX
+        refined = []
+        for box in low_boxes:
+            xs = [p[0] for p in box[0]]
+            ys = [p[1] for p in box[0]]
+            region = [min(xs) - pad, min(ys) - pad, max(xs) + pad, max(ys) + pad]
+            clip = fitz.Rect(*(v * scale for v in region))
+            with doc_lock:
+                pix, region_image = self._render_image(doc[page_num], self.max_dpi, clip=clip)
+            region_boxes = self._readtext_boxes(region_image)
+            del region_image, pix
+            region_confidence = self._boxes_confidence(region_boxes)
+            if region_boxes and region_confidence > box[2]:
+                box[1] = ' '.join(b[1] for b in sorted(region_boxes, key=lambda b: b[0][0][0]))
+                box[2] = region_confidence
+                refined.append([round(v, 1) for v in region])
+
+        if refined:
+            record['confidence'] = self._boxes_confidence(boxes)
+            record['escalated'] = 'regions'
+            record['refined_regions'] = refined
+        return record
+
+    @staticmethod
+    def _boxes_confidence(boxes: list) -> float:
+        """글자 수 가중 평균 EasyOCR 신뢰도"""
+        total_chars = sum(len(text) for _, text, _ in boxes)
+        if total_chars == 0:
+            return 0.0
+        weighted = sum(len(text) * conf for _, text, conf in boxes)
+        return round(weighted / total_chars, 3)
+
+    @staticmethod
+    def _boxes_to_text(boxes: list) -> str:
+        """박스를 읽기 순서(위→아래, 왼→오른쪽)의 줄 단위 텍스트로 조립
+
+        세로 중심이 현재 줄의 높이 범위 안에 있으면 같은 줄로 본다.
+        """
+        lines = []  # [중심 y, 반높이, [(x, text)]]
+        for bbox, text, _ in sorted(boxes, key=lambda b: min(p[1] for p in b[0])):
+            xs = [p[0] for p in bbox]
+            ys = [p[1] for p in bbox]
+            center = (min(ys) + max(ys)) / 2
+            half = (max(ys) - min(ys)) / 2
+            if lines and abs(center - lines[-1][0]) <= lines[-1][1]:
+                lines[-1][2].append((min(xs), text))
+            else:
+                lines.append([center, half, [(min(xs), text)]])
+
+        return '\n'.join(
+            ' '.join(text for _, text in sorted(words, key=lambda w: w[0]))
+            for _, _, words in lines
+        )
+
+    def _is_usable_text_layer(self, text: str) -> bool:
+        """내장 텍스트 레이어를 OCR 대신 써도 되는지 판정
+
+        스캔 PDF에 붙은 빈/깨진 텍스트 레이어를 걸러내기 위해
+        최소 길이와 _calculate_confidence 점수를 함께 본다.
+        """
+        if len(text) < self.NATIVE_TEXT_MIN_CHARS:
+            return False
+        return self._calculate_confidence(text) >= self.NATIVE_TEXT_MIN_CONFIDENCE
+
+    @staticmethod
+    def _summarize_extraction(page_log: list) -> dict:
+        """페이지 기록을 경로별 페이지 수/소요 시간으로 요약 (metadata.extraction)"""
+        summary = {'native_pages': 0, 'cache_pages': 0, 'ocr_pages': 0,
+                   'blank_pages': 0, 'duplicate_pages': 0, 'escalated_pages': 0, 'seconds': {}}
+        for entry in page_log:
+            source = entry['source']
+            summary[f"{source}_pages"] += 1
+            if entry['escalated']:
+                summary['escalated_pages'] += 1
+            summary['seconds'][source] = round(
+                summary['seconds'].get(source, 0.0) + entry['seconds'], 3
+            )
+        return summary
+
+    @staticmethod
+    def _summarize_confidence(page_log: list) -> dict:
+        """페이지별 DPI/신뢰도와 글자 수 가중 평균 (metadata.ocr_confidence)
+
+        영역 재인식한 페이지에는 바뀐 영역(1차 DPI 픽셀 좌표)을 'refined_regions'로 덧붙인다.
+        """
+        total_chars = sum(entry['chars'] for entry in page_log)
+        mean = 0.0
+        if total_chars:
+            mean = sum(entry['confidence'] * entry['chars'] for entry in page_log) / total_chars
+
+        pages = []
+        for entry in page_log:
+            page = {key: entry[key] for key in ('page', 'source', 'dpi', 'confidence')}
+            if entry.get('refined_regions'):
+                page['refined_regions'] = entry['refined_regions']
+            pages.append(page)
+        return {'mean': round(mean, 3), 'pages': pages}
 
     def parse_file_code(self, filename: str) -> dict:
         """파일명에서 코드 정보 추출
@@ -101,86 +804,150 @@ class JejuFolkloreConverter:
 
     def parse_sections(self, text: str) -> dict:
         """텍스트에서 섹션별 내용 추출"""
-        sections = {
-            'summary': '',
-            'content': '',
-            'features': '',
-            'keywords': [],
-            'source': '',
-            'related': ''
-        }
-
-        # 섹션 위치 찾기
-        section_positions = []
-        for section_name, pattern in self.section_patterns.items():
-            match = re.search(pattern, text)
-            if match:
-                section_positions.append((match.start(), section_name, match.end()))
-
-        # 위치순 정렬
-        section_positions.sort(key=lambda x: x[0])
-
-        # 각 섹션 내용 추출
-        for i, (start, name, content_start) in enumerate(section_positions):
-            if i + 1 < len(section_positions):
-                end = section_positions[i + 1][0]
-            else:
-                end = len(text)
-
-            content = text[content_start:end].strip()
-
-            if name == 'keywords':
-                # 키워드는 쉼표나 마침표로 분리
-                keywords = re.split(r'[,，.。\n]', content)
-                sections[name] = [kw.strip() for kw in keywords if kw.strip()]
-            else:
-                sections[name] = content
-
-        return sections
+        return self.analyzer.split_sections(text, self.analyzer.find_sections(text))[0]
 
     def extract_characters(self, text: str) -> list:
         """텍스트에서 등장인물 추출 (간단한 휴리스틱)"""
-        characters = []
-
-        # 일반적인 등장인물 패턴
-        patterns = [
-            r'설문대할망', r'오백장군', r'영등신', r'삼승할망',
-            r'할아버지', r'할머니', r'할망', r'하르방',
-            r'장닭', r'사왕', r'용왕', r'도깨비', r'도채비',
-            r'부자', r'선비', r'처녀', r'총각'
-        ]
-
-        for pattern in patterns:
-            if re.search(pattern, text):
-                characters.append(pattern)
-
-        return list(set(characters))
+        return self.analyzer.analyze(text)['characters']
 
     def extract_locations(self, text: str) -> list:
         """텍스트에서 장소 추출"""
-        locations = []
-
-        # 제주 지명 패턴
-        patterns = [
-            r'한라산', r'백록담', r'성산일출봉', r'우도',
-            r'산방산', r'송악산', r'영실', r'물영아리',
-            r'효돈천', r'쇠소깍', r'천지연', r'정방폭포',
-            r'[\w]+리', r'[\w]+동', r'[\w]+읍'
-        ]
+        return self.analyzer.analyze(text)['locations']
+
+    def convert_pdf_to_json(self, pdf_path: str, stats: dict = None) -> dict:
+        """PDF 파일을 JSON 구조로 변환
+
+        Args:
+            pdf_path: PDF 파일 경로
+            stats: 주어지면 _collect_stats 결과(단계별 시간, 페이지/글자 수)를 채움
+        """
+        pdf_path = Path(pdf_path)
+        logger.info(f"변환 중: {pdf_path.name}")
+        start = time.perf_counter()
+
+        # 텍스트 추출 (내장 텍스트 레이어 우선, 이미지 페이지만 OCR)
+        page_log = []
+        raw_text = self.extract_text_from_pdf(str(pdf_path), page_log=page_log)
+        extracted = time.perf_counter()
+
+        story_json = self.build_story_json(pdf_path.name, raw_text, {
+            "ocr_confidence": self._summarize_confidence(page_log),
+            "extraction": self._summarize_extraction(page_log)
+        })
+        finished = time.perf_counter()
+
+        if stats is not None:
+            stats.update(self._collect_stats(page_log, len(raw_text), {
+                'extract': extracted - start,
+                'parse': finished - extracted,
+                'total': finished - start
+            }))
+        return story_json
 
-        for pattern in patterns:
-            matches = re.findall(pattern, text)
-            locations.extend(matches)
+    def convert_pdf_to_file(self, pdf_path: str, out, stats: dict = None, indent: int = 2) -> dict:
+        """convert_pdf_to_json과 같은 JSON을 페이지 단위 스트리밍으로 out에 기록
 
-        return list(set(locations))
+        페이지 텍스트는 나오는 대로 임시 파일(TextSpill)에 쌓으면서 분석(StreamingAnalysis)하고,
+        JSON의 raw_text와 섹션 내용은 임시 파일에서 조각 단위로 읽어 기록한다.
+        문서 전체 텍스트를 메모리에 올리지 않으므로 페이지 수와 무관하게 메모리가 일정하다.
 
-    def convert_pdf_to_json(self, pdf_path: str) -> dict:
-        """PDF 파일을 JSON 구조로 변환"""
+        Args:
+            pdf_path: PDF 파일 경로
+            out: 텍스트 파일 객체
+            stats: 주어지면 _collect_stats 결과를 채움
+            indent: JSON 들여쓰기 (None이면 한 줄)
+
+        Returns:
+            기록한 설화의 metadata
+        """
         pdf_path = Path(pdf_path)
-        filename = pdf_path.name
+        logger.info(f"변환 중 (스트리밍): {pdf_path.name}")
+        start = time.perf_counter()
+
+        page_log = []
+        with TextSpill() as spill:
+            analysis = self.analyzer.stream()
+            for i, page_text in enumerate(self.iter_page_texts(str(pdf_path), page_log=page_log)):
+                if i:
+                    spill.write('\n\n')
+                    analysis.feed('\n\n')
+                spill.write(page_text)
+                analysis.feed(page_text)
+            extracted = time.perf_counter()
+
+            result = analysis.finish()
+            spans = result['spans']
+            keywords = []
+            if 'keywords' in spans:
+                keywords = TextAnalyzer.split_keywords(spill.read(*spans['keywords']).strip())
+
+            streams = {PLACEHOLDER.format('raw_text'): spill.iter_chunks(0, spill.length)}
+            sections = {'keywords': keywords}
+            for name in ('summary', 'content', 'features', 'source'):
+                sections[name] = PLACEHOLDER.format(name)
+                chunks = spill.iter_chunks(*spans[name]) if name in spans else ()
+                streams[sections[name]] = strip_chunks(chunks)
+
+            story_json = self.build_story_json(pdf_path.name, PLACEHOLDER.format('raw_text'), {
+                "ocr_confidence": self._summarize_confidence(page_log),
+                "extraction": self._summarize_extraction(page_log)
+            }, analysis=dict(result, sections=sections))
+            dump_json_streaming(story_json, out, streams, indent=indent)
+            chars = spill.length
+        finished = time.perf_counter()
+
+        if stats is not None:
+            stats.update(self._collect_stats(page_log, chars, {
+                'extract': extracted - start,
+                'parse': finished - extracted,
+                'total': finished - start
+            }))
+        return story_json['metadata']
+
+    def _collect_stats(self, page_log: list, chars: int, file_seconds: dict) -> dict:
+        """파일 하나의 계측 결과
+
+        Returns:
+            {
+                'pages', 'chars', 'pages_per_sec',
+                'blank_pages', 'duplicate_pages': OCR을 생략한 빈/중복 페이지 수,
+                'seconds': 단계명 → 초 (페이지 단계 합계 + FILE_STAGES),
+                'page_seconds': 단계명 → 페이지별 초 목록 ('page'는 페이지 전체)
+            }
+        """
+        seconds = {}
+        page_seconds = {'page': []}
+        for entry in page_log:
+            page_seconds['page'].append(entry['seconds'])
+            for name, sec in entry['stages'].items():
+                seconds[name] = seconds.get(name, 0.0) + sec
+                page_seconds.setdefault(name, []).append(sec)
+
+        seconds = {name: round(seconds[name], 3) for name in self.PAGE_STAGES if name in seconds}
+        seconds.update({name: round(sec, 3) for name, sec in file_seconds.items()})
+
+        total = file_seconds['total']
+        return {
+            'pages': len(page_log),
+            'chars': chars,
+            'pages_per_sec': round(len(page_log) / total, 2) if total > 0 else None,
+            'blank_pages': sum(entry['source'] == 'blank' for entry in page_log),
+            'duplicate_pages': sum(entry['source'] == 'duplicate' for entry in page_log),
+            'seconds': seconds,
+            'page_seconds': page_seconds
+        }
 
-        logger.info(f"변환 중: {filename}")
+    def build_story_json(self, filename: str, raw_text: str, ocr_metadata: dict,
+                         analysis: dict = None) -> dict:
+        """추출된 텍스트를 파싱하여 설화 JSON 구조 생성
 
+        Args:
+            filename: 원본 PDF 파일명 (코드/제목 파싱용)
+            raw_text: 추출된 전체 텍스트
+            ocr_metadata: metadata에 그대로 넣을 텍스트 추출 정보
+                          (ocr_confidence, extraction)
+            analysis: 이미 분석한 결과 (TextAnalyzer.analyze 형식, None이면 raw_text 분석)
+        """
         # 파일 코드 파싱
         file_info = self.parse_file_code(filename)
         if not file_info:
@@ -191,25 +958,22 @@ class JejuFolkloreConverter:
                 'category': 'unknown',
                 'category_code': 'U',
                 'number': '000',
-                'title': pdf_path.stem
+                'title': Path(filename).stem
             }
 
-        # OCR로 텍스트 추출
-        raw_text = self.extract_text_from_pdf(str(pdf_path))
-
-        # 섹션 파싱
-        sections = self.parse_sections(raw_text)
-
-        # 등장인물/장소 추출
-        characters = self.extract_characters(raw_text)
-        locations = self.extract_locations(raw_text)
+        # 섹션 파싱 + 등장인물/장소/카테고리 추출 (한 번의 스캔)
+        if analysis is None:
+            analysis = self.analyzer.analyze(raw_text)
+        sections = analysis['sections']
+        characters = analysis['characters']
+        locations = analysis['locations']
 
         # JSON 구조 생성
         story_json = {
             "id": f"story_{file_info['category_code']}_{file_info['number']}",
             "title": file_info['title'],
             "type": file_info['category'],
-            "category": self._determine_category(sections.get('content', '')),
+            "category": analysis['category'],
 
             "content": {
                 "summary": sections.get('summary', ''),
@@ -235,12 +999,57 @@ class JejuFolkloreConverter:
                 "source_id": f"{file_info['type_code']}_{file_info['category_code']}_{file_info['number']}",
                 "converted_at": datetime.now().isoformat(),
                 "converter_version": "2.0.0",
-                "ocr_confidence": self._calculate_confidence(raw_text)
+                **ocr_metadata
             }
         }
 
         return story_json
 
+    def reparse_directory(self, json_dir: str, output_dir: str = None) -> dict:
+        """기존 변환 결과의 content.raw_text로 설화 JSON을 다시 생성 (OCR 없음)
+
+        파싱 규칙(섹션/등장인물/지명/카테고리)만 바뀌었을 때 사용한다.
+        OCR 관련 metadata(ocr_confidence, extraction, converted_at)는 그대로 유지한다.
+
+        Args:
+            json_dir: 기존 변환 JSON 디렉토리
+            output_dir: 저장 디렉토리 (None이면 제자리 덮어쓰기)
+        """
+        input_path = Path(json_dir)
+        output_path = Path(output_dir) if output_dir else input_path
+        output_path.mkdir(parents=True, exist_ok=True)
+
+        results = {'success': 0, 'failed': 0}
+        for json_file in sorted(input_path.glob('*.json')):
+            if json_file.name.startswith('_'):  # 요약/매니페스트 제외
+                continue
+
+            try:
+                with open(json_file, 'r', encoding='utf-8') as f:
+                    old_story = json.load(f)
+
+                old_metadata = old_story.get('metadata', {})
+                story_json = self.build_story_json(
+                    old_story['sources'][0]['file'],
+                    old_story['content']['raw_text'],
+                    {key: old_metadata[key] for key in ('ocr_confidence', 'extraction')
+                     if key in old_metadata}
+                )
+                story_json['metadata']['converted_at'] = old_metadata.get(
+                    'converted_at', story_json['metadata']['converted_at'])
+                story_json['metadata']['reparsed_at'] = datetime.now().isoformat()
+
+                with open(output_path / json_file.name, 'w', encoding='utf-8') as f:
+                    json.dump(story_json, f, ensure_ascii=False, indent=2)
+                results['success'] += 1
+
+            except Exception as e:
+                logger.error(f"재파싱 실패 [{json_file.name}]: {e}")
+                results['failed'] += 1
+
+        logger.info(f"재파싱 완료: 성공 {results['success']}, 실패 {results['failed']}")
+        return results
+
     def _calculate_confidence(self, text: str) -> float:
         """OCR 신뢰도 추정 (휴리스틱)"""
         if not text:
@@ -265,19 +1074,146 @@ class JejuFolkloreConverter:
 
     def _determine_category(self, content: str) -> str:
         """내용 기반 세부 카테고리 추정"""
-        if any(kw in content for kw in ['창조', '만들', '생겨']):
-            return '창조신화'
-        elif any(kw in content for kw in ['지명', '이름', '불리']):
-            return '지명유래'
-        elif any(kw in content for kw in ['굿', '제사', '신앙']):
-            return '의례'
-        elif any(kw in content for kw in ['도깨비', '도채비', '귀신']):
-            return '자연전설'
-        else:
-            return '기타'
+        hits = {}
+        for _, _, _, (kind, category) in self.analyzer.automaton.iter_matches(content):
+            if kind == 'category':
+                hits[category] = hits.get(category, 0) + 1
+        return self.analyzer.pick_category(hits)
+
+    def _convert_safely(self, pdf_file: str, indent: int = 2) -> dict:
+        """PDF 하나 변환 후 {'story' 또는 'error', 'started_at', 'seconds', 'stats'} 반환
+
+        예외를 결과로 돌려주므로 직렬/워커 실행 모두 같은 형태로 처리할 수 있다.
+        stats는 _collect_stats 결과 (실패하면 빈 dict).
+        stream_pages이면 'story' 대신 JSON을 기록한 임시 파일 경로('story_file')와
+        'source_id'를 돌려준다 (indent는 그 파일의 들여쓰기).
+        """
+        result = {'started_at': datetime.now().isoformat()}
+        stats = {}
+        start = time.perf_counter()
+        try:
+            if self.stream_pages:
+                with tempfile.NamedTemporaryFile('w', encoding='utf-8', suffix='.json',
+                                                 delete=False) as f:
+                    story_file = f.name
+                    try:
+                        metadata = self.convert_pdf_to_file(pdf_file, f, stats=stats, indent=indent)
+                    except BaseException:
+                        f.close()
+                        os.remove(story_file)
+                        raise
+                result['story_file'] = story_file
+                result['source_id'] = metadata['source_id']
+            else:
+                result['story'] = self.convert_pdf_to_json(pdf_file, stats=stats)
+        except Exception as e:
+            result['error'] = str(e)
+        result['seconds'] = round(time.perf_counter() - start, 3)
+        result['stats'] = stats
+        return result
+
+    def iter_conversions(self, pdf_files: list, workers: int = 1, indent: int = 2,
+                         poll_interval: float = None):
+        """PDF 목록을 변환하여 (pdf_file, result) 반환
+
+        result는 _convert_safely의 반환값이다.
+        workers > 1 이면 프로세스 풀을 사용한다. 각 워커는 Reader를 한 번만
+        만들고, torch 스레드 수를 코어 수 / 워커 수로 제한하여 과다 구독을 막는다.
+
+        poll_interval(초)이 없으면 입력 순서대로 내보낸다.
+        있으면 끝나는 순서대로 내보내고, 그 시간 동안 끝난 변환이 없을 때마다 None을 내보내
+        호출자가 멈춘 변환을 기다리는 중에도 대기 시간 초과를 확인할 수 있게 한다
+        (workers <= 1 이면 변환을 스레드 하나에서 실행).
+        """
+        if workers <= 1 and poll_interval is None:
+            for pdf_file in pdf_files:
+                yield pdf_file, self._convert_safely(str(pdf_file), indent=indent)
+            return
+
+        executor, convert = self._conversion_executor(workers)
+        with executor:
+            if poll_interval is None:
+                # map은 입력 순서대로 결과를 돌려준다
+                results = executor.map(convert, [str(p) for p in pdf_files], repeat(indent))
+                yield from zip(pdf_files, results)
+                return
+
+            futures = {executor.submit(convert, str(pdf_file), indent): (i, pdf_file)
+                       for i, pdf_file in enumerate(pdf_files)}
+            pending = set(futures)
+            while pending:
+                done, pending = wait(pending, timeout=poll_interval, return_when=FIRST_COMPLETED)
+                if not done:
+                    yield None
+                for future in sorted(done, key=lambda f: futures[f][0]):
+                    yield futures[future][1], future.result()
+
+    def _conversion_executor(self, workers: int) -> tuple:
+        """(executor, 변환 함수) - workers > 1 이면 워커 프로세스 풀, 아니면 스레드 하나"""
+        if workers <= 1:
+            return ThreadPoolExecutor(max_workers=1), self._convert_safely
+
+        torch_threads = max(1, (os.cpu_count() or 1) // workers)
+        logger.info(f"병렬 변환: 워커 {workers}개 (워커당 torch 스레드 {torch_threads}개)")
+
+        # CUDA/torch 상태를 fork로 복제하지 않도록 spawn 사용
+        executor = ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=multiprocessing.get_context('spawn'),
+            initializer=_init_worker,
+            initargs=(self.init_kwargs, torch_threads)
+        )
+        return executor, _convert_in_worker
+
+    @staticmethod
+    def _load_manifest(manifest_file: Path) -> dict:
+        """체크포인트 매니페스트 로드 (입력 경로 → 마지막 기록)
+
+        중단 시점에 쓰다 만 마지막 줄은 건너뛴다.
+        """
+        records = {}
+        if not manifest_file.exists():
+            return records
+
+        with open(manifest_file, 'r', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    continue
+                records[record['input']] = record
+        return records
+
+    @staticmethod
+    def _is_done(record: dict, input_hash: str) -> bool:
+        """이전 실행에서 성공했고 입력이 바뀌지 않았으며 출력이 남아 있는지"""
+        return (
+            record is not None
+            and record.get('status') == 'success'
+            and record.get('sha256') == input_hash
+            and record.get('output') is not None
+            and Path(record['output']).exists()
+        )
+
+    def process_directory(self, input_dir: str, output_dir: str, limit: int = None,
+                          workers: int = 1, resume: bool = False, output_format: str = 'json',
+                          jsonl_max_mb: int = 64):
+        """디렉토리 내 모든 PDF 처리
+
+        파일 하나가 끝날 때마다 `_conversion_manifest.jsonl`에 입력 해시, 출력 경로,
+        상태, 소요 시간을 추가 기록한다. resume=True 이면 매니페스트상 이미 성공했고
+        내용이 바뀌지 않은 파일은 건너뛰고, 실패했거나 새로운 파일만 다시 변환한다.
+
+        파일별 계측(페이지/글자 수, 단계별 시간, pages/sec)은 요약의 files 항목에,
+        단계별 p50/p95 보고서는 요약의 timing 항목에 넣고 마지막에 출력한다.
+        요약은 SUMMARY_FLUSH_EVERY 파일마다 원자적으로 다시 써서 진행 상황을 볼 수 있다.
 
-    def process_directory(self, input_dir: str, output_dir: str, limit: int = None):
-        """디렉토리 내 모든 PDF 처리"""
+        Args:
+            output_format: 'json'이면 설화마다 `<source_id>.json` (indent=2),
+                           'jsonl'이면 변환 즉시 `stories-NNNNN.jsonl`에 한 줄씩 추가
+                           (jsonl_max_mb를 넘으면 다음 파일로). jsonl에서는 파일별 기록을
+                           메모리에 모으지 않고 매니페스트에만 남긴다.
+        """
         input_path = Path(input_dir)
         output_path = Path(output_dir)
         output_path.mkdir(parents=True, exist_ok=True)
@@ -291,46 +1227,253 @@ class JejuFolkloreConverter:
         results = {
             'success': 0,
             'failed': 0,
+            'skipped': 0,
+            'pending': 0,
             'files': []
         }
 
-        for i, pdf_file in enumerate(pdf_files, 1):
-            try:
-                logger.info(f"[{i}/{len(pdf_files)}] 처리 중: {pdf_file.name}")
-
-                story_json = self.convert_pdf_to_json(str(pdf_file))
-
-                # JSON 저장 (source_id로 저장하여 C_/T_ 구분 유지)
-                source_id = story_json['metadata']['source_id']  # C_F_001 또는 T_F_001
-                output_file = output_path / f"{source_id}.json"
-                with open(output_file, 'w', encoding='utf-8') as f:
-                    json.dump(story_json, f, ensure_ascii=False, indent=2)
-
-                results['success'] += 1
-                results['files'].append({
-                    'input': str(pdf_file),
-                    'output': str(output_file),
-                    'status': 'success'
-                })
-
-            except Exception as e:
-                logger.error(f"변환 실패 [{pdf_file.name}]: {e}")
-                results['failed'] += 1
-                results['files'].append({
+        manifest_file = output_path / '_conversion_manifest.jsonl'
+        summary_file = output_path / '_conversion_summary.json'
+        previous = self._load_manifest(manifest_file) if resume else {}
+
+        file_entries = results['files']
+        if output_format == 'jsonl':
+            # 파일별 기록은 매니페스트로 충분 (요약은 개수/계측만)
+            del results['files']
+            results['manifest'] = str(manifest_file)
+            file_entries = None
+
+        input_hashes = {}
+        pending = []
+        for pdf_file in pdf_files:
+            input_hash = file_sha256(str(pdf_file))
+            input_hashes[pdf_file] = input_hash
+            record = previous.get(str(pdf_file))
+            if self._is_done(record, input_hash):
+                results['skipped'] += 1
+                if file_entries is not None:
+                    file_entries.append({
+                        'input': str(pdf_file),
+                        'output': record['output'],
+                        'status': 'skipped'
+                    })
+            else:
+                pending.append(pdf_file)
+        results['pending'] = len(pending)
+
+        if resume:
+            logger.info(f"이어서 변환: 완료 {results['skipped']}개 건너뜀, {len(pending)}개 남음")
+
+        sink = None
+        if output_format == 'jsonl':
+            sink = RotatingJsonlWriter(output_path, max_bytes=jsonl_max_mb << 20, resume=resume)
+
+        # 파일별 계측은 누적한 뒤 버림 (메모리가 코퍼스 페이지 수에 비례하지 않게)
+        timing = TimingAggregate(self.PAGE_STAGES, self.FILE_STAGES)
+        run_start = time.perf_counter()
+        with open(manifest_file, 'a' if resume else 'w', encoding='utf-8') as manifest:
+            conversions = self.iter_conversions(pending, workers=workers,
+                                                 indent=None if sink else 2)
+            for i, (pdf_file, result) in enumerate(conversions, 1):
+                error = result.get('error')
+                output_file = None
+                if error is None and 'story_file' in result:
+                    # 스트리밍 변환: 워커가 기록한 임시 JSON 파일을 옮기거나 이어 붙임
+                    story_file = result['story_file']
+                    try:
+                        if sink:
+                            output_file = sink.write_file(story_file)
+                            os.remove(story_file)
+                        else:
+                            output_file = output_path / f"{result['source_id']}.json"
+                            shutil.move(story_file, output_file)
+                    except Exception as e:
+                        error = str(e)
+                        output_file = None
+                elif error is None:
+                    try:
+                        story_json = result['story']
+                        if sink:
+                            output_file = sink.write(story_json)
+                        else:
+                            # JSON 저장 (source_id로 저장하여 C_/T_ 구분 유지)
+                            source_id = story_json['metadata']['source_id']  # C_F_001 또는 T_F_001
+                            output_file = output_path / f"{source_id}.json"
+                            with open(output_file, 'w', encoding='utf-8') as f:
+                                json.dump(story_json, f, ensure_ascii=False, indent=2)
+                    except Exception as e:
+                        error = str(e)
+                        output_file = None
+
+                stats = result.get('stats') or {}
+                file_stats = {key: value for key, value in stats.items() if key != 'page_seconds'}
+
+                if error is None:
+                    logger.info(f"[{i}/{len(pending)}] 완료: {pdf_file.name} "
+                                f"({stats['pages']}페이지, {stats['pages_per_sec']} 페이지/초)")
+                    results['success'] += 1
+                    if file_entries is not None:
+                        file_entries.append({
+                            'input': str(pdf_file),
+                            'output': str(output_file),
+                            'status': 'success',
+                            'stats': file_stats
+                        })
+                    timing.add(stats)
+                else:
+                    logger.error(f"[{i}/{len(pending)}] 변환 실패 [{pdf_file.name}]: {error}")
+                    results['failed'] += 1
+                    if file_entries is not None:
+                        file_entries.append({
+                            'input': str(pdf_file),
+                            'output': None,
+                            'status': 'failed',
+                            'error': error
+                        })
+                results['pending'] -= 1
+
+                # 체크포인트: 파일마다 즉시 디스크에 기록
+                record = {
                     'input': str(pdf_file),
-                    'output': None,
-                    'status': 'failed',
-                    'error': str(e)
-                })
+                    'sha256': input_hashes[pdf_file],
+                    'output': str(output_file) if output_file else None,
+                    'status': 'success' if error is None else 'failed',
+                    'started_at': result.get('started_at'),
+                    'seconds': result.get('seconds')
+                }
+                if file_stats:
+                    record['stats'] = file_stats
+                if error is not None:
+                    record['error'] = error
+                manifest.write(json.dumps(record, ensure_ascii=False) + '\n')
+                manifest.flush()
+                os.fsync(manifest.fileno())
+
+                if i % self.SUMMARY_FLUSH_EVERY == 0:
+                    write_json_atomic(summary_file, results)
+
+        if sink:
+            sink.close()
+
+        results['timing'] = timing.report(time.perf_counter() - run_start)
 
         # 결과 요약 저장
-        summary_file = output_path / '_conversion_summary.json'
-        with open(summary_file, 'w', encoding='utf-8') as f:
-            json.dump(results, f, ensure_ascii=False, indent=2)
+        write_json_atomic(summary_file, results)
 
-        logger.info(f"변환 완료: 성공 {results['success']}, 실패 {results['failed']}")
+        logger.info(f"변환 완료: 성공 {results['success']}, 실패 {results['failed']}, "
+                    f"건너뜀 {results['skipped']}")
+        self._print_timing_report(results['timing'])
         return results
 
+    @staticmethod
+    def _print_timing_report(timing: dict):
+        """TimingAggregate.report 결과를 표로 출력"""
+        print("\n" + "=" * 60)
+        print("⏱️ 단계별 처리 시간")
+        print("=" * 60)
+        print(f"{'단계':<12}{'횟수':>8}{'p50(초)':>10}{'p95(초)':>10}{'합계(초)':>12}")
+
+        for title, rows in (("페이지당", timing['per_page']), ("파일당", timing['per_file'])):
+            if not rows:
+                continue
+            print(f"-- {title}")
+            for name, row in rows.items():
+                print(f"{name:<12}{row['count']:>8}{row['p50']:>10.3f}"
+                      f"{row['p95']:>10.3f}{row['total']:>12.1f}")
+
+        print("-" * 60)
+        print(f"파일 {timing['files']}개, 페이지 {timing['pages']}개, 글자 {timing['chars']:,}개")
+        print(f"OCR 생략: 빈 페이지 {timing['blank_pages']}개, 중복 페이지 {timing['duplicate_pages']}개")
+        print(f"처리량: {timing['pages_per_sec']} 페이지/초 (경과 {timing['wall_seconds']}초)")
+        print("=" * 60)
+
+
+# 워커 프로세스 전용 변환기 (프로세스당 한 번 생성)
+_worker_converter = None
+
+
+def _init_worker(converter_kwargs: dict, torch_threads: int):
+    """워커 초기화: torch 스레드 수 제한 후 Reader를 한 번만 생성
+
+    OCR 서버 클라이언트로만 동작하면(ocr_server) 모델을 돌리지 않으므로 torch를 불러오지 않는다.
+    """
+    global _worker_converter
+    if not converter_kwargs.get('ocr_server'):
+        import torch
+        torch.set_num_threads(torch_threads)
+    _worker_converter = JejuFolkloreConverter(**converter_kwargs)
+    _worker_converter.reader  # 첫 작업 전에 모델 로드
+
+
+def _convert_in_worker(pdf_file: str, indent: int = 2) -> dict:
+    """워커에서 PDF 하나 변환 (예외는 부모 프로세스로 전달하기 위해 결과로 반환)"""
+    return _worker_converter._convert_safely(pdf_file, indent=indent)
+
+
+def parse_roi(value: str):
+    """--roi 인자: 'auto' 또는 0~1 비율 'x0,y0,x1,y1' → 'auto' / 튜플"""
+    if value == 'auto':
+        return value
+    try:
+        roi = tuple(float(v) for v in value.split(','))
+    except ValueError:
+        roi = ()
+    if len(roi) != 4 or not (0 <= roi[0] < roi[2] <= 1 and 0 <= roi[1] < roi[3] <= 1):
+        raise argparse.ArgumentTypeError(f"ROI 형식 오류: {value} ('auto' 또는 0~1 비율 x0,y0,x1,y1)")
+    return roi
+
+
+def add_converter_arguments(parser: argparse.ArgumentParser):
+    """변환기(JejuFolkloreConverter) 설정 인자 추가 (이 스크립트와 story_pipeline.py가 공유)"""
+    parser.add_argument('--no-gpu', action='store_true', help='GPU 사용 안함')
+    parser.add_argument('--ocr-server', metavar='SOCKET',
+                        help='모델을 로드하지 않고 --serve로 띄운 OCR 서버에 인식 요청')
+    parser.add_argument('--force-ocr', action='store_true',
+                        help='PDF 내장 텍스트 레이어를 무시하고 모든 페이지 OCR')
+    parser.add_argument('--prefetch', type=int, default=2,
+                        help='OCR 중 미리 렌더링해 둘 페이지 수 (기본 2, 메모리 상한)')
+    parser.add_argument('--dpi', type=int, default=JejuFolkloreConverter.BASE_DPI,
+                        help=f'1차 OCR 렌더링 DPI (기본 {JejuFolkloreConverter.BASE_DPI})')
+    parser.add_argument('--max-dpi', type=int, default=JejuFolkloreConverter.MAX_DPI,
+                        help=f'저신뢰 페이지/영역 재렌더링 DPI (기본 {JejuFolkloreConverter.MAX_DPI})')
+    parser.add_argument('--min-confidence', type=float,
+                        default=JejuFolkloreConverter.MIN_CONFIDENCE,
+                        help=f'재렌더링 기준 OCR 신뢰도 (기본 {JejuFolkloreConverter.MIN_CONFIDENCE})')
+    parser.add_argument('--batch-size', type=int, default=1,
+                        help='한 번에 OCR 할 페이지 수 / 인식기 배치 크기 (기본 1)')
+    parser.add_argument('--no-page-filter', action='store_true',
+                        help='빈 페이지 생략 / 중복 페이지 결과 재사용을 끔')
+    parser.add_argument('--roi', type=parse_roi,
+                        help="OCR 할 본문 영역: 'auto'(투영 프로파일로 검출) 또는 "
+                             "페이지 비율 'x0,y0,x1,y1' (예: 0.05,0.08,0.95,0.92)")
+    parser.add_argument('--stream-pages', action='store_true',
+                        help='페이지 텍스트를 임시 파일에 쌓으며 분석/기록 (대용량 PDF 메모리 상한)')
+    parser.add_argument('--grayscale', action='store_true',
+                        help='페이지를 흑백으로 렌더링하여 OCR (메모리 절감)')
+    parser.add_argument('--cache-dir', help='페이지 OCR 결과 캐시 디렉토리')
+    parser.add_argument('--cache-size-mb', type=int, default=2048,
+                        help='OCR 캐시 최대 용량 MB (기본 2048, 초과시 LRU 삭제)')
+
+
+def converter_from_args(args: argparse.Namespace) -> JejuFolkloreConverter:
+    """add_converter_arguments로 받은 인자로 변환기 생성"""
+    return JejuFolkloreConverter(
+        use_gpu=not args.no_gpu,
+        cache_dir=args.cache_dir,
+        cache_max_mb=args.cache_size_mb,
+        use_native_text=not args.force_ocr,
+        prefetch_pages=args.prefetch,
+        base_dpi=args.dpi,
+        max_dpi=args.max_dpi,
+        min_confidence=args.min_confidence,
+        batch_size=args.batch_size,
+        grayscale=args.grayscale,
+        filter_pages=not args.no_page_filter,
+        roi=args.roi,
+        stream_pages=args.stream_pages,
+        ocr_server=args.ocr_server
+    )
+
 
 def main():
     parser = argparse.ArgumentParser(
@@ -341,21 +1484,50 @@ def main():
     parser.add_argument('--input', '-i', help='입력 PDF 디렉토리')
     parser.add_argument('--output', '-o', help='출력 JSON 디렉토리')
     parser.add_argument('--sample', '-s', help='샘플 PDF 파일 (단일 파일 테스트)')
+    parser.add_argument('--reparse', help='기존 변환 JSON 디렉토리의 raw_text를 OCR 없이 다시 파싱 '
+                                          '(--output 생략시 제자리 덮어쓰기)')
+    parser.add_argument('--serve', metavar='SOCKET',
+                        help='모델을 한 번 로드하고 Unix 소켓으로 OCR 작업을 받는 서버로 실행')
     parser.add_argument('--limit', '-l', type=int, help='처리 개수 제한')
-    parser.add_argument('--no-gpu', action='store_true', help='GPU 사용 안함')
+    parser.add_argument('--format', choices=['json', 'jsonl'], default='json',
+                        help='출력 형식: 설화별 JSON 파일 또는 분할 JSONL 스트림 (기본 json)')
+    parser.add_argument('--jsonl-max-mb', type=int, default=64,
+                        help='JSONL 파일 하나의 최대 크기 MB (기본 64, 넘으면 다음 파일)')
+    parser.add_argument('--workers', '-w', type=int, default=1,
+                        help='병렬 변환 워커 프로세스 수 (기본 1)')
+    parser.add_argument('--resume', action='store_true',
+                        help='매니페스트 기준으로 완료된 파일은 건너뛰고 실패/신규 파일만 변환')
+    add_converter_arguments(parser)
 
     args = parser.parse_args()
 
-    converter = JejuFolkloreConverter(use_gpu=not args.no_gpu)
+    # Reader는 처음 OCR 할 때 생성 (병렬 모드에서는 워커에서만)
+    converter = converter_from_args(args)
 
-    if args.sample:
+    if args.serve:
+        # 상주 OCR 서버 (shutdown 요청 또는 Ctrl+C까지)
+        from ocr_server import OCRServer
+        # PDF 경로째 맡기는 작업은 --input 디렉토리 아래 파일만 허용
+        OCRServer(converter, args.serve, input_root=args.input).serve_forever()
+
+    elif args.reparse:
+        # OCR 없이 파싱만 다시
+        converter.reparse_directory(args.reparse, args.output)
+
+    elif args.sample:
         # 단일 파일 테스트
-        result = converter.convert_pdf_to_json(args.sample)
-        print(json.dumps(result, ensure_ascii=False, indent=2))
+        if args.stream_pages:
+            converter.convert_pdf_to_file(args.sample, sys.stdout)
+            print()
+        else:
+            result = converter.convert_pdf_to_json(args.sample)
+            print(json.dumps(result, ensure_ascii=False, indent=2))
 
     elif args.input and args.output:
         # 디렉토리 일괄 처리
-        converter.process_directory(args.input, args.output, limit=args.limit)
+        converter.process_directory(args.input, args.output, limit=args.limit,
+                                    workers=args.workers, resume=args.resume,
+                                    output_format=args.format, jsonl_max_mb=args.jsonl_max_mb)
 
     else:
         parser.print_help()
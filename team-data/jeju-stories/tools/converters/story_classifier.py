@@ -0,0 +1,174 @@
+"""
+병합기용 세부 카테고리 / 구연자 분류기
+C_+T_ 텍스트를 KeywordAutomaton으로 한 번 훑어 카테고리별 점수와 구연자 성별 단서를
+함께 모으고, 구연자 이름/나이/지역은 미리 컴파일한 정규식으로 T_ 텍스트에서 찾는다.
+
+- 카테고리 점수: 카테고리별로 나온 서로 다른 키워드 수 (같은 키워드 반복은 hits에만 반영)
+- 선택: 점수 → 출현 수 → 패턴 순서 (동점이어도 항상 같은 결과)
+- 구연자 성별: '구연자' 표시 뒤 NARRATOR_WINDOW 글자 안에서 앞뒤가 단어 경계인 첫 성별 단어
+  (본문의 '설문대할망' 같은 합성어나 표시 밖의 단어는 구연자 성별로 보지 않음, 없으면 비움)
+
+키워드 사전이 커져도 분류 비용은 텍스트 길이에 비례한다.
+"""
+
+import re
+
+from jeju_text import KeywordAutomaton
+
+# 세부 카테고리 추정 키워드 (앞에 있을수록 동점일 때 우선)
+SUBCATEGORY_PATTERNS = {
+    '창조신화': ['창조', '만들', '생겨', '태초', '세상'],
+    '본풀이': ['본풀이', '굿', '제사', '신앙', '무속'],
+    '지명유래': ['지명', '이름', '불리', '마을', '오름'],
+    '역사전설': ['역사', '조선', '왕', '장수', '전쟁'],
+    '인물전설': ['인물', '효자', '열녀', '선비', '부자'],
+    '자연전설': ['도깨비', '도채비', '귀신', '용', '뱀'],
+    '동물담': ['개', '닭', '소', '말', '돼지', '동물'],
+    '교훈담': ['교훈', '착한', '욕심', '벌', '복']
+}
+
+# 유형별 기본 세부 카테고리 (키워드가 하나도 없을 때)
+DEFAULT_SUBCATEGORIES = {'M': '기타 신화', 'F': '기타 민담', 'L': '기타 전설'}
+
+# 구연자 성별 단어
+GENDER_WORDS = {
+    '남': ['남자', '남성', '할아버지', '하르방'],
+    '여': ['여자', '여성', '할머니', '할망']
+}
+
+# '구연자' 표시 뒤에서 성별/나이/지역을 찾는 범위 (글자 수)
+NARRATOR_WINDOW = 80
+
+NARRATOR_MARK_REGEX = re.compile(r'구연자')
+NARRATOR_NAME_REGEX = re.compile(r'구연자[:\s]*([가-힣]+)')
+NARRATOR_AGE_REGEX = re.compile(r'(\d{2,3})\s*세')
+NARRATOR_LOCATION_REGEX = re.compile(r'([가-힣]+[리읍면동])')
+
+# 성별 단어 앞뒤 단어 경계 (한글/영문/숫자가 이어지면 합성어의 일부로 봄)
+WORD_CHAR_REGEX = re.compile(r'[가-힣A-Za-z0-9]')
+# 성별 단어 바로 뒤에 붙어도 되는 조사 (예: '할머니가', '할망은')
+GENDER_WORD_PARTICLES = frozenset('이가은는의께')
+
+
+class StoryClassifier:
+    """세부 카테고리 점수와 구연자 정보를 한 번의 스캔으로 구하는 사전 컴파일 분류기"""
+
+    def __init__(self, subcategory_patterns: dict = None, gender_words: dict = None):
+        """
+        Args:
+            subcategory_patterns: {카테고리: [키워드...]} 우선순위 순 (기본 SUBCATEGORY_PATTERNS)
+            gender_words: {성별: [단어...]} (기본 GENDER_WORDS)
+        """
+        subcategory_patterns = subcategory_patterns or SUBCATEGORY_PATTERNS
+        self.categories = list(subcategory_patterns)
+        self.category_rank = {category: rank for rank, category in enumerate(self.categories)}
+
+        self.automaton = KeywordAutomaton()
+        for category, keywords in subcategory_patterns.items():
+            for keyword in keywords:
+                self.automaton.add(keyword, ('category', category))
+        for gender, words in (gender_words or GENDER_WORDS).items():
+            for word in words:
+                self.automaton.add(word, ('gender', gender))
+        self.automaton.build()
+
+    def classify(self, c_text: str = '', t_text: str = '', category_code: str = None) -> dict:
+        """C_/T_ 텍스트 분류 (c_text + t_text를 이어 붙이지 않고 차례로 스캔)
+
+        Returns:
+            {
+                'subcategory': 선택된 세부 카테고리,
+                'scores': 카테고리 → 서로 다른 키워드 수 (키워드가 나온 카테고리만),
+                'hits': 카테고리 → 키워드 출현 수,
+                'narrator': 구연자 정보 dict 또는 None (T_ 텍스트에서만)
+            }
+        """
+        keywords = {}
+        hits = {}
+        genders = []  # T_ 텍스트 기준 (시작, 끝, 성별)
+
+        stream = self.automaton.stream()
+        t_offset = len(c_text)
+        for text in (c_text, t_text):
+            for start, end, keyword, (kind, name) in stream.feed(text):
+                if kind == 'category':
+                    keywords.setdefault(name, set()).add(keyword)
+                    hits[name] = hits.get(name, 0) + 1
+                elif start >= t_offset:
+                    genders.append((start - t_offset, end - t_offset, name))
+
+        scores = {category: len(found) for category, found in keywords.items()}
+        return {
+            'subcategory': self.pick_subcategory(scores, hits, category_code),
+            'scores': scores,
+            'hits': hits,
+            'narrator': self.extract_narrator(t_text, genders) if t_text else None
+        }
+
+    def pick_subcategory(self, scores: dict, hits: dict, category_code: str = None) -> str:
+        """점수 → 출현 수 → 패턴 순서로 세부 카테고리 선택"""
+        if not scores:
+            return DEFAULT_SUBCATEGORIES.get(category_code, '기타')
+        return min(scores, key=lambda c: (-scores[c], -hits[c], self.category_rank[c]))
+
+    def extract_narrator(self, text: str, genders: list = None) -> dict:
+        """T_ 텍스트에서 구연자 정보 추출
+
+        성별은 '구연자' 표시 뒤 NARRATOR_WINDOW 안에서만 찾는다 (본문에서 추정하지 않음).
+
+        Args:
+            genders: classify가 모은 [(시작, 끝, 성별)] (없으면 여기서 스캔)
+        """
+        if genders is None:
+            genders = [(start, end, name) for start, end, _, (kind, name)
+                       in self.automaton.iter_matches(text) if kind == 'gender']
+
+        narrator = {}
+        mark = NARRATOR_MARK_REGEX.search(text)
+        window = (mark.start(), mark.start() + NARRATOR_WINDOW) if mark else None
+
+        name_match = NARRATOR_NAME_REGEX.search(text)
+        if name_match:
+            narrator['name'] = name_match.group(1)
+
+        gender = self._first_gender(text, genders, window)
+        if gender:
+            narrator['gender'] = gender
+
+        age_match = self._search(NARRATOR_AGE_REGEX, text, window)
+        if age_match:
+            narrator['age'] = int(age_match.group(1))
+
+        location_match = self._search(NARRATOR_LOCATION_REGEX, text, window)
+        if location_match:
+            narrator['location'] = location_match.group(1)
+
+        return narrator if narrator else None
+
+    @staticmethod
+    def _first_gender(text: str, genders: list, window: tuple = None) -> str:
+        """구연자 표시 범위 안에서 앞뒤가 단어 경계인 첫 성별 단어의 성별 (없으면 '')"""
+        if window is None:
+            return ''
+        for start, end, gender in genders:
+            if window[0] <= start < window[1] and StoryClassifier._is_token(text, start, end):
+                return gender
+        return ''
+
+    @staticmethod
+    def _is_token(text: str, start: int, end: int) -> bool:
+        """text[start:end]가 합성어의 일부가 아닌 단어인지 (뒤에는 조사 한 글자까지 허용)"""
+        if start > 0 and WORD_CHAR_REGEX.match(text, start - 1):
+            return False
+        if end < len(text) and text[end] in GENDER_WORD_PARTICLES:
+            end += 1
+        return end >= len(text) or not WORD_CHAR_REGEX.match(text, end)
+
+    @staticmethod
+    def _search(regex, text: str, window: tuple = None):
+        """구연자 표시 근처에서 먼저 찾고, 없으면 텍스트 전체에서"""
+        if window:
+            match = regex.search(text, *window)
+            if match:
+                return match
+        return regex.search(text)
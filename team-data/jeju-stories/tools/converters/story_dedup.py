@@ -0,0 +1,318 @@
+"""
+병합된 설화의 유사 중복(이본) 검출 - MinHash + LSH
+설문대할망, 오백장군처럼 같은 이야기의 여러 채록본을 학습 전에 묶거나 걸러낼 수 있도록
+모든 쌍을 비교하지 않고(O(n²)) 거의 선형 시간에 중복 후보 묶음을 찾는다.
+
+1. 제목 + content 아래 모든 문자열을 공백/문장부호 없이 이어 붙여 글자 k-gram(shingle) 집합으로
+2. shingle마다 crc32 → 해시 함수 num_perm개의 최솟값 = MinHash 서명 (NumPy 벡터 연산)
+3. 서명을 bands개 구간으로 나눠 구간이 같은 설화끼리만 후보 쌍 (LSH)
+4. 후보 쌍 중 서명 일치율(자카드 유사도 추정)이 threshold 이상이면 같은 묶음 (union-find)
+
+사용법:
+    python story_dedup.py --input ../../data/stories --output ../../data/stories/_duplicates.json
+    python story_dedup.py -i ./merged --threshold 0.6 --shingle 5
+"""
+
+import re
+import json
+import zlib
+import argparse
+import logging
+from pathlib import Path
+from collections import defaultdict
+
+import numpy as np
+
+from jsonl_sink import iter_jsonl, write_json_atomic
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+_MERSENNE_PRIME = np.uint64((1 << 61) - 1)
+_MAX_HASH = np.uint64((1 << 32) - 1)
+
+
+class MinHasher:
+    """글자 shingle 집합의 MinHash 서명 계산기 (seed가 같으면 실행마다 같은 서명)"""
+
+    BLOCK = 4096  # 한 번에 num_perm개 해시를 계산할 shingle 수 (메모리 상한)
+
+    def __init__(self, num_perm: int = 128, shingle_size: int = 4, seed: int = 1):
+        """
+        Args:
+            num_perm: 해시 함수(서명 길이) 수
+            shingle_size: shingle 글자 수
+            seed: 해시 함수 계수 난수 시드
+        """
+        self.num_perm = num_perm
+        self.shingle_size = shingle_size
+        rng = np.random.RandomState(seed)
+        # h(x) = (a * x + b) mod p (64비트 곱은 넘치면 버림, 결과는 32비트로)
+        self._a = rng.randint(1, _MERSENNE_PRIME, size=num_perm, dtype=np.uint64)
+        self._b = rng.randint(0, _MERSENNE_PRIME, size=num_perm, dtype=np.uint64)
+        self._normalize = re.compile(r'[\W_]+')
+
+    def shingles(self, text: str) -> set:
+        """공백/문장부호를 뺀 글자 k-gram 집합 (k보다 짧으면 텍스트 전체 하나)"""
+        text = self._normalize.sub('', text)
+        k = self.shingle_size
+        if len(text) <= k:
+            return {text} if text else set()
+        return {text[i:i + k] for i in range(len(text) - k + 1)}
+
+    def signature(self, text: str):
+        """MinHash 서명 (uint64 배열, shingle이 없으면 None)"""
+        shingles = self.shingles(text)
+        if not shingles:
+            return None
+        hashes = np.fromiter((zlib.crc32(s.encode('utf-8')) for s in shingles),
+                             dtype=np.uint64, count=len(shingles))
+
+        signature = np.full(self.num_perm, _MAX_HASH, dtype=np.uint64)
+        with np.errstate(over='ignore'):
+            for start in range(0, len(hashes), self.BLOCK):
+                block = hashes[start:start + self.BLOCK, None]
+                permuted = (block * self._a + self._b) % _MERSENNE_PRIME & _MAX_HASH
+                np.minimum(signature, permuted.min(axis=0), out=signature)
+        return signature
+
+
+class LSHIndex:
+    """MinHash 서명 밴드 버킷 인덱스 - 밴드 하나라도 같은 항목이 후보"""
+
+    def __init__(self, num_perm: int = 128, bands: int = 32):
+        """
+        Args:
+            num_perm: 서명 길이 (bands로 나누어떨어져야 함)
+            bands: 밴드 수 (많을수록 낮은 유사도까지 후보로 잡음)
+        """
+        if num_perm % bands:
+            raise ValueError(f"num_perm({num_perm})은 bands({bands})로 나누어떨어져야 합니다")
+        self.bands = bands
+        self.rows = num_perm // bands
+        self._buckets = [defaultdict(list) for _ in range(bands)]
+
+    @property
+    def threshold(self) -> float:
+        """후보가 될 확률이 1/2쯤 되는 유사도 ≈ (1/b)^(1/r)"""
+        return (1 / self.bands) ** (1 / self.rows)
+
+    def add(self, key, signature):
+        for band, buckets in enumerate(self._buckets):
+            chunk = signature[band * self.rows:(band + 1) * self.rows]
+            buckets[chunk.tobytes()].append(key)
+
+    def candidate_pairs(self) -> set:
+        """같은 버킷에 들어간 (key1, key2) 쌍 (key1 < key2)"""
+        pairs = set()
+        for buckets in self._buckets:
+            for keys in buckets.values():
+                if len(keys) < 2:
+                    continue
+                for i, first in enumerate(keys):
+                    for second in keys[i + 1:]:
+                        pairs.add((first, second) if first < second else (second, first))
+        return pairs
+
+
+def story_text(story: dict) -> str:
+    """설화 JSON에서 비교할 텍스트 (제목 + content 아래 모든 문자열)"""
+    parts = [story.get('title', '')]
+    stack = [story.get('content', {})]
+    while stack:
+        value = stack.pop()
+        if isinstance(value, str):
+            parts.append(value)
+        elif isinstance(value, dict):
+            stack.extend(reversed(list(value.values())))
+        elif isinstance(value, list):
+            stack.extend(reversed(value))
+    return '\n'.join(parts)
+
+
+def iter_stories(input_dir: str):
+    """디렉토리 아래 설화 JSON 파일(메타 파일 '_*' 제외)과 JSONL 스트림 출력의 (출처, 설화)"""
+    input_path = Path(input_dir)
+    for path in sorted(input_path.rglob('*.json')):
+        if path.name.startswith('_'):
+            continue
+        try:
+            story = json.loads(path.read_bytes())
+        except ValueError:
+            logger.warning(f"JSON 읽기 실패, 건너뜀: {path}")
+            continue
+        if isinstance(story, dict):
+            yield str(path), story
+
+    for story in iter_jsonl(input_path):
+        yield story.get('id', ''), story
+
+
+class StoryDeduplicator:
+    """설화 묶음에서 유사 중복 후보 묶음(클러스터)을 찾는다"""
+
+    def __init__(self, threshold: float = 0.5, num_perm: int = 128, bands: int = 32,
+                 shingle_size: int = 4):
+        """
+        Args:
+            threshold: 같은 묶음으로 볼 최소 자카드 유사도 (서명 일치율로 추정)
+            num_perm: MinHash 서명 길이
+            bands: LSH 밴드 수 (후보 기준 ≈ (1/bands)^(bands/num_perm), threshold보다 낮게)
+            shingle_size: shingle 글자 수
+        """
+        self.threshold = threshold
+        self.hasher = MinHasher(num_perm=num_perm, shingle_size=shingle_size)
+        self.index = LSHIndex(num_perm=num_perm, bands=bands)
+        self.signatures = []
+        self.entries = []  # [{'id', 'source', 'title', 'chars'}]
+        # 서명이 완전히 같은 설화는 첫 항목만 LSH에 넣고 나머지는 바로 묶음
+        # (같은 텍스트가 수천 개여도 버킷 안 후보 쌍이 제곱으로 늘지 않게)
+        self._exact = {}  # 서명 바이트 -> 첫 key
+        self._aliases = []  # [(key, 첫 key)]
+
+    def add(self, story: dict, source: str = '') -> bool:
+        """설화 하나 추가 (비교할 텍스트가 없으면 False)"""
+        text = story_text(story)
+        signature = self.hasher.signature(text)
+        if signature is None:
+            return False
+
+        key = len(self.entries)
+        self.entries.append({
+            'id': story.get('id', source),
+            'source': source,
+            'title': story.get('title', ''),
+            'chars': len(text)
+        })
+        self.signatures.append(signature)
+
+        first = self._exact.setdefault(signature.tobytes(), key)
+        if first == key:
+            self.index.add(key, signature)
+        else:
+            self._aliases.append((key, first))
+        return True
+
+    def similarity(self, first: int, second: int) -> float:
+        """서명 일치율 (자카드 유사도 추정값)"""
+        agree = np.count_nonzero(self.signatures[first] == self.signatures[second])
+        return agree / self.hasher.num_perm
+
+    def clusters(self) -> list:
+        """유사 중복 묶음 목록 (2개 이상인 것만, 큰 묶음부터)
+
+        Returns:
+            [{'representative': 가장 긴 설화 id, 'members': [{id, source, title, chars}],
+              'min_similarity': 묶음을 이은 쌍들의 최소 유사도}]
+        """
+        parent = list(range(len(self.entries)))
+
+        def find(x):
+            while parent[x] != x:
+                parent[x] = parent[parent[x]]
+                x = parent[x]
+            return x
+
+        def union(first, second):
+            root1, root2 = find(first), find(second)
+            if root1 != root2:
+                parent[max(root1, root2)] = min(root1, root2)
+
+        edges = {}
+        for key, first in self._aliases:
+            edges[(first, key)] = 1.0
+            union(first, key)
+
+        for first, second in sorted(self.index.candidate_pairs()):
+            if find(first) == find(second):
+                continue  # 이미 같은 묶음 (조밀한 묶음에서 비교 수를 줄임)
+            similarity = self.similarity(first, second)
+            if similarity >= self.threshold:
+                edges[(first, second)] = similarity
+                union(first, second)
+
+        groups = defaultdict(list)
+        for key in range(len(self.entries)):
+            groups[find(key)].append(key)
+
+        min_similarity = {}
+        for (first, _), similarity in edges.items():
+            root = find(first)
+            min_similarity[root] = min(similarity, min_similarity.get(root, 1.0))
+
+        clusters = []
+        for root, keys in groups.items():
+            if len(keys) < 2:
+                continue
+            members = [self.entries[key] for key in keys]
+            clusters.append({
+                'representative': max(members, key=lambda m: m['chars'])['id'],
+                'members': members,
+                'min_similarity': round(min_similarity[root], 3)
+            })
+
+        clusters.sort(key=lambda c: (-len(c['members']), c['representative']))
+        return clusters
+
+    def duplicate_ids(self, clusters: list = None) -> set:
+        """묶음마다 대표를 뺀 나머지 id (학습 데이터에서 뺄 이본)"""
+        duplicates = set()
+        for cluster in clusters if clusters is not None else self.clusters():
+            duplicates.update(m['id'] for m in cluster['members']
+                              if m['id'] != cluster['representative'])
+        return duplicates
+
+
+def find_duplicates(input_dir: str, output_file: str = None, **kwargs) -> dict:
+    """디렉토리의 설화들로 중복 후보 묶음을 찾아 보고서 반환 (output_file이 있으면 저장)"""
+    dedup = StoryDeduplicator(**kwargs)
+    total = 0
+    for source, story in iter_stories(input_dir):
+        total += 1
+        dedup.add(story, source)
+
+    clusters = dedup.clusters()
+    report = {
+        'stories': total,
+        'compared': len(dedup.entries),
+        'threshold': dedup.threshold,
+        'lsh_threshold': round(dedup.index.threshold, 3),
+        'clusters': len(clusters),
+        'duplicates': len(dedup.duplicate_ids(clusters)),
+        'groups': clusters
+    }
+    logger.info(f"설화 {total}개 중 유사 중복 묶음 {len(clusters)}개 "
+                f"(대표 외 {report['duplicates']}개)")
+
+    if output_file:
+        write_json_atomic(output_file, report)
+        logger.info(f"중복 보고서 저장: {output_file}")
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description='설화 유사 중복 검출 (MinHash/LSH)')
+    parser.add_argument('--input', '-i', required=True,
+                        help='병합된 설화 JSON 디렉토리 (하위 폴더, stories-*.jsonl 포함)')
+    parser.add_argument('--output', '-o', help='중복 보고서 JSON 경로 (생략시 요약만 출력)')
+    parser.add_argument('--threshold', type=float, default=0.5,
+                        help='같은 묶음으로 볼 최소 유사도 (기본 0.5)')
+    parser.add_argument('--num-perm', type=int, default=128, help='MinHash 서명 길이 (기본 128)')
+    parser.add_argument('--bands', type=int, default=32, help='LSH 밴드 수 (기본 32)')
+    parser.add_argument('--shingle', type=int, default=4, help='shingle 글자 수 (기본 4)')
+    args = parser.parse_args()
+
+    report = find_duplicates(args.input, args.output, threshold=args.threshold,
+                             num_perm=args.num_perm, bands=args.bands,
+                             shingle_size=args.shingle)
+
+    for cluster in report['groups']:
+        titles = ', '.join(m['title'] or m['id'] for m in cluster['members'])
+        print(f"[{cluster['min_similarity']:.2f}] {cluster['representative']}: {titles}")
+
+
+if __name__ == '__main__':
+    main()
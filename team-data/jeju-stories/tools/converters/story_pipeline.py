@@ -0,0 +1,271 @@
+"""
+PDF 변환 → C_/T_ 병합 파이프라인 (한 프로세스)
+변환기 결과를 파일로 쓰고 다시 읽는 대신 메모리에서 바로 pair_key별로 짝을 지어
+두 쪽(또는 대기 시간 초과)이 모이는 즉시 병합 결과를 기록한다.
+
+사용법:
+    python story_pipeline.py --input ../../sources/pdf-downloads --output ../../data/stories
+    python story_pipeline.py -i ./pdfs -o ./stories --intermediate ./ocr --workers 4
+"""
+
+import os
+import time
+import json
+import shutil
+import argparse
+import logging
+from pathlib import Path
+
+from pdf_to_json_converter import JejuFolkloreConverter, add_converter_arguments, converter_from_args
+from merge_paired_stories import StoryMerger
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+
+class PairBuffer:
+    """pair_key별로 C_/T_ 절반을 모아 두는 버퍼
+
+    입력 목록에서 기대되는 절반(expect)이 모두 도착하면(변환 실패도 도착으로 침)
+    바로 꺼내고, 기다린 시간이 timeout을 넘은 쌍은 있는 절반만으로 꺼낸다.
+    시간 초과로 꺼낸 쌍도 버퍼에 남겨 두어, 나머지 절반이 늦게 오면 완성된 쌍으로 다시 꺼낸다.
+    """
+
+    def __init__(self, timeout: float = 600):
+        """
+        Args:
+            timeout: 짝을 기다리는 최대 시간 (초)
+        """
+        self.timeout = timeout
+        self._pending = {}  # pair_key -> {'C', 'T', 'expected', 'arrived', 'since', 'expired'}
+
+    def __len__(self):
+        return len(self._pending)
+
+    def _entry(self, pair_key: str) -> dict:
+        entry = self._pending.get(pair_key)
+        if entry is None:
+            entry = {'C': None, 'T': None, 'expected': set(), 'arrived': set(),
+                     'since': None, 'expired': False}
+            self._pending[pair_key] = entry
+        return entry
+
+    def expect(self, pair_key: str, type_code: str):
+        """입력 목록에 있는 절반 등록 (도착하면 이것들이 다 모였는지로 완료 판단)"""
+        self._entry(pair_key)['expected'].add(type_code)
+
+    def add(self, pair_key: str, type_code: str, half: dict = None) -> dict:
+        """절반 도착 (변환 실패면 half=None) → 쌍이 완성되면 꺼내서 반환, 아니면 None"""
+        entry = self._entry(pair_key)
+        entry[type_code] = half
+        entry['arrived'].add(type_code)
+        if entry['since'] is None:
+            entry['since'] = time.monotonic()
+
+        if entry['arrived'] >= (entry['expected'] or {'C', 'T'}):
+            return self._pending.pop(pair_key)
+        return None
+
+    def expire(self, now: float = None) -> list:
+        """timeout을 새로 넘긴 쌍을 [(pair_key, entry)]로 반환 (버퍼에는 남겨 둠)"""
+        now = time.monotonic() if now is None else now
+        expired = []
+        for key, entry in self._pending.items():
+            if (not entry['expired'] and entry['since'] is not None
+                    and now - entry['since'] >= self.timeout):
+                entry['expired'] = True
+                expired.append((key, entry))
+        return expired
+
+    def drain(self) -> list:
+        """아직 꺼내지 않은 쌍을 모두 [(pair_key, entry)]로 반환 (입력이 끝났을 때)"""
+        drained = [(key, entry) for key, entry in self._pending.items()
+                   if entry['arrived'] and not entry['expired']]
+        self._pending.clear()
+        return drained
+
+
+class StoryPipeline:
+    """JejuFolkloreConverter 결과를 StoryMerger로 바로 넘기는 파이프라인"""
+
+    # 변환 결과가 오지 않아도 짝 대기 시간 초과를 확인하는 간격 (초, pair_timeout보다 길지 않게)
+    POLL_INTERVAL = 5.0
+
+    def __init__(self, converter: JejuFolkloreConverter, merger: StoryMerger,
+                 intermediate_dir: str = None, pair_timeout: float = 600):
+        """
+        Args:
+            converter: PDF 변환기
+            merger: 병합기 (output_dir에 병합 결과 기록, stats에 통계)
+            intermediate_dir: 지정하면 변환 결과(C_/T_ JSON)도 `<PDF 이름>.json`으로 저장
+                              (merge_paired_stories.py로 다시 병합 가능한 이름)
+            pair_timeout: 짝을 기다리는 최대 시간 (초)
+        """
+        self.converter = converter
+        self.merger = merger
+        self.intermediate_dir = Path(intermediate_dir) if intermediate_dir else None
+        self.buffer = PairBuffer(timeout=pair_timeout)
+        self.stats = {'converted': 0, 'conversion_errors': 0, 'skipped': 0}
+
+    def _plan(self, input_dir: str, limit: int = None) -> list:
+        """변환할 PDF 목록 [(pdf_file, info)]
+
+        같은 pair_key의 C_/T_가 연달아 변환되도록 정렬하여 버퍼에 오래 머무는
+        절반이 없게 한다. 파일명 규칙에 맞지 않으면 병합할 수 없으므로 변환하지 않는다.
+        """
+        planned = []
+        for pdf_file in Path(input_dir).glob('**/*.pdf'):
+            info = self.merger.parse_file_id(f"{pdf_file.stem}.json")
+            if info is None:
+                logger.warning(f"파일명 규칙에 맞지 않아 건너뜀: {pdf_file.name}")
+                self.stats['skipped'] += 1
+                continue
+            planned.append((pdf_file, info))
+
+        planned.sort(key=lambda item: (item[1]['pair_key'], item[1]['type_code'], str(item[0])))
+        if limit:
+            planned = planned[:limit]
+        return planned
+
+    def _half(self, pdf_file: Path, info: dict, result: dict) -> dict:
+        """변환 결과 → 병합기 입력 형태 {'file', 'info', 'content'}"""
+        name = f"{pdf_file.stem}.json"
+
+        if 'story_file' in result:
+            # 스트리밍 변환: 워커가 기록한 임시 파일
+            story_file = result['story_file']
+            try:
+                story = self.merger.load_json(story_file)
+                if self.intermediate_dir:
+                    # 임시 파일은 시스템 임시 디렉토리에 있어 다른 파일시스템일 수 있음 (os.replace 불가)
+                    shutil.move(story_file, self.intermediate_dir / name)
+            finally:
+                if os.path.exists(story_file):
+                    os.remove(story_file)
+        else:
+            story = result['story']
+            if self.intermediate_dir:
+                with open(self.intermediate_dir / name, 'w', encoding='utf-8') as f:
+                    json.dump(story, f, ensure_ascii=False, indent=2)
+
+        # 병합기는 파일 이름만 쓰므로 (sources[].file) 중간 파일이 없어도 같은 이름을 둔다
+        file_path = (self.intermediate_dir or Path()) / name
+        return {'file': file_path, 'info': info, 'content': story}
+
+    def _emit(self, pair_key: str, entry: dict):
+        """모인 절반들을 병합하여 기록
+
+        시간 초과로 한쪽만 병합했던 쌍이면 같은 파일을 덮어쓰고 이전 통계를 되돌린다.
+        """
+        c_data, t_data = entry['C'], entry['T']
+        if not c_data and not t_data:
+            return  # 두 쪽 모두 변환 실패 (이미 conversion_errors에 집계)
+
+        previous = entry.get('emitted')
+        if previous:
+            stats = self.merger.stats
+            prev_pair, prev_result = previous
+            stats[self.merger.pair_kind(prev_pair)] -= 1
+            stats['merged' if prev_result['error'] is None else 'errors'] -= 1
+
+        pair = {'C': c_data, 'T': t_data}
+        result = self.merger.merge_and_save(
+            pair_key, pair,
+            c_content=c_data['content'] if c_data else {},
+            t_content=t_data['content'] if t_data else {}
+        )
+        self.merger.record_result(pair, result)
+        entry['emitted'] = (pair, result)
+
+    def run(self, input_dir: str, limit: int = None, workers: int = 1) -> dict:
+        """입력 디렉토리의 PDF를 변환하면서 병합 (병합기 stats + 변환 통계 반환)"""
+        planned = self._plan(input_dir, limit)
+        logger.info(f"총 {len(planned)}개 PDF 파일 발견")
+
+        self.merger.prepare_output()
+        if self.intermediate_dir:
+            self.intermediate_dir.mkdir(parents=True, exist_ok=True)
+
+        for _, info in planned:
+            self.buffer.expect(info['pair_key'], info['type_code'])
+
+        infos = {pdf_file: info for pdf_file, info in planned}
+        # 끝나는 순서대로 받되, 멈춘 변환이 있어도 poll_interval마다 None을 받아 대기 시간 초과를 확인
+        poll_interval = max(0.1, min(self.POLL_INTERVAL, self.buffer.timeout))
+        conversions = self.converter.iter_conversions([pdf_file for pdf_file, _ in planned],
+                                                       workers=workers, poll_interval=poll_interval)
+        i = 0
+        for conversion in conversions:
+            if conversion is not None:
+                pdf_file, result = conversion
+                i += 1
+                self._receive(i, len(planned), pdf_file, result, infos[pdf_file])
+
+            for pair_key, expired in self.buffer.expire():
+                logger.warning(f"짝 대기 시간 초과, 한쪽만 병합: {pair_key}")
+                self._emit(pair_key, expired)
+
+        for pair_key, entry in self.buffer.drain():
+            self._emit(pair_key, entry)
+
+        return dict(self.merger.stats, **self.stats)
+
+    def _receive(self, i: int, total: int, pdf_file: Path, result: dict, info: dict):
+        """변환 결과 하나를 버퍼에 넣고, 쌍이 완성되면 병합"""
+        half = None
+        error = result.get('error')
+        if error is None:
+            try:
+                half = self._half(pdf_file, info, result)
+            except Exception as e:
+                error = str(e)
+
+        if error is None:
+            self.stats['converted'] += 1
+            logger.info(f"[{i}/{total}] 변환 완료: {pdf_file.name}")
+        else:
+            self.stats['conversion_errors'] += 1
+            logger.error(f"[{i}/{total}] 변환 실패 [{pdf_file.name}]: {error}")
+
+        entry = self.buffer.add(info['pair_key'], info['type_code'], half)
+        if entry is not None:
+            self._emit(info['pair_key'], entry)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='제주 설화 PDF 변환 + C_/T_ 병합 파이프라인'
+    )
+
+    parser.add_argument('--input', '-i', required=True, help='입력 PDF 디렉토리')
+    parser.add_argument('--output', '-o', required=True, help='병합 결과 저장 디렉토리')
+    parser.add_argument('--intermediate', help='변환 결과(C_/T_ JSON)도 저장할 디렉토리 (기본: 저장 안함)')
+    parser.add_argument('--pair-timeout', type=float, default=600,
+                        help='C_/T_ 짝을 기다리는 최대 시간 초 (기본 600, 넘으면 한쪽만 병합)')
+    parser.add_argument('--limit', '-l', type=int, help='처리 개수 제한')
+    parser.add_argument('--workers', '-w', type=int, default=1,
+                        help='병렬 변환 워커 프로세스 수 (기본 1)')
+    # 변환기 설정 (캐시, DPI/재렌더링, OCR 서버 등)은 pdf_to_json_converter.py와 같은 인자
+    add_converter_arguments(parser)
+
+    args = parser.parse_args()
+
+    converter = converter_from_args(args)
+    # 병합기의 입력은 변환 결과 디렉토리 (파이프라인은 디렉토리를 읽지 않고 메모리에서 넘기므로
+    # --intermediate가 없으면 병합 결과 디렉토리를 둠)
+    merger = StoryMerger(args.intermediate or args.output, args.output)
+
+    pipeline = StoryPipeline(converter, merger, intermediate_dir=args.intermediate,
+                             pair_timeout=args.pair_timeout)
+    stats = pipeline.run(args.input, limit=args.limit, workers=args.workers)
+
+    merger.print_summary()
+    print(f"변환: 성공 {stats['converted']}, 실패 {stats['conversion_errors']}, "
+          f"파일명 규칙 불일치 {stats['skipped']}")
+
+
+if __name__ == '__main__':
+    main()
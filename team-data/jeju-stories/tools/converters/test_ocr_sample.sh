@@ -87,7 +87,10 @@ with open('$json_file') as f:
     data = json.load(f)
 print(f\"  제목: {data.get('title', 'N/A')}\")
 print(f\"  유형: {data.get('type', 'N/A')}\")
-print(f\"  OCR 신뢰도: {data.get('metadata', {}).get('ocr_confidence', 'N/A')}\")
+confidence = data.get('metadata', {}).get('ocr_confidence', {})
+print(f\"  OCR 신뢰도: {confidence.get('mean', 'N/A')}\")
+for page in confidence.get('pages', []):
+    print(f\"    p.{page['page']}: {page['source']} DPI={page['dpi']} 신뢰도={page['confidence']}\")
 content = data.get('content', {})
 raw_len = len(content.get('raw_text', ''))
 print(f\"  추출 텍스트 길이: {raw_len}자\")
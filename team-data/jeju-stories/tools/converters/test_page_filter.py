@@ -0,0 +1,52 @@
+"""
+빈 페이지 판정 테스트 (렌더링은 PyMuPDF, OCR 모델은 가짜 인식기로 대체)
+
+    python -m pytest test_page_filter.py
+"""
+
+import pytest
+
+fitz = pytest.importorskip('fitz')
+pytest.importorskip('numpy')
+
+from pdf_to_json_converter import JejuFolkloreConverter
+
+
+def _fake_readtext(images):
+    return [[[[[0, 0], [1, 0], [1, 1], [0, 1]], '제주', 0.99]] for _ in images]
+
+
+def _page_sources(pdf_path, **kwargs) -> list:
+    converter = JejuFolkloreConverter(use_gpu=False, **kwargs)
+    converter._readtext_boxes_batched = _fake_readtext
+    page_log = []
+    converter.extract_text_from_pdf(str(pdf_path), page_log=page_log)
+    return [entry['source'] for entry in page_log]
+
+
+def _image_only_page(doc, text: str):
+    """글자를 그린 페이지를 이미지로 만들어 새 페이지에 붙임 (텍스트 레이어 없음)"""
+    source = fitz.open()
+    page = source.new_page()
+    page.insert_text((50, 100), text, fontsize=12, fontname='korea')
+    pix = page.get_pixmap(dpi=150)
+    doc.new_page().insert_image(doc[-1].rect, pixmap=pix)
+
+
+def test_sparse_one_line_scan_is_not_blank(tmp_path):
+    doc = fitz.open()
+    _image_only_page(doc, '제주 설화 한 줄')
+    doc.new_page()  # 완전히 빈 페이지
+    pdf_path = tmp_path / 'sparse.pdf'
+    doc.save(pdf_path)
+
+    assert _page_sources(pdf_path) == ['ocr', 'blank']
+
+
+def test_text_layer_page_is_not_blank_under_force_ocr(tmp_path):
+    doc = fitz.open()
+    doc.new_page().insert_text((50, 100), '.', fontsize=12)
+    pdf_path = tmp_path / 'dot.pdf'
+    doc.save(pdf_path)
+
+    assert _page_sources(pdf_path, use_native_text=False) == ['ocr']
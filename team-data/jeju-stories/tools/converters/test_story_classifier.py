@@ -0,0 +1,30 @@
+"""
+구연자 성별 추출 테스트
+
+    python -m pytest test_story_classifier.py
+"""
+
+from story_classifier import StoryClassifier
+
+
+def test_narrator_gender_ignores_compound_words_in_story_body():
+    t_text = ('설문대할망이 치마폭에 흙을 날라 한라산을 만들었다.\n'
+              '구연자: 김철수 (72세, 애월읍)')
+    narrator = StoryClassifier().classify(t_text=t_text)['narrator']
+
+    assert narrator['name'] == '김철수'
+    assert 'gender' not in narrator
+
+
+def test_narrator_gender_ignores_compound_words_after_marker():
+    narrator = StoryClassifier().extract_narrator('구연자: 김철수. 설문대할망 이야기')
+
+    assert 'gender' not in narrator
+
+
+def test_narrator_gender_from_marker_window():
+    t_text = '옛날 하르방이 살았다.\n구연자: 김순자 할머니 (80세)'
+    narrator = StoryClassifier().classify(t_text=t_text)['narrator']
+
+    assert narrator['gender'] == '여'
+    assert narrator['age'] == 80
@@ -0,0 +1,316 @@
+"""
+설화 텍스트 분석 엔진
+OCR 텍스트를 한 번 훑어 섹션 위치, 등장인물, 지명, 세부 카테고리 키워드를 함께 찾는다
+
+- 섹션 헤더: 6개 패턴을 이름 그룹으로 합친 정규식 하나 (finditer 1회)
+- 고유명 키워드 (등장인물/지명/카테고리): Aho-Corasick 오토마톤 하나 (스캔 1회)
+- 접미사 지명 (~리, ~동, ~읍): 단어 정규식 하나 (finditer 1회)
+
+키워드 사전이 수천 개로 늘어나도 분석 비용은 텍스트 길이에 비례한다.
+StreamingAnalysis는 같은 분석을 텍스트 조각(페이지) 단위로 나눠 받아 수행하므로
+텍스트 전체를 메모리에 올리지 않아도 된다.
+"""
+
+import re
+from collections import deque
+
+from jeju_text import KeywordAutomaton
+
+# 섹션 헤더 (C_ 해설본 구조: ① 개요 ~ ⑥ 관련 자료)
+SECTION_PATTERNS = {
+    'summary': r'[①1]\s*개요',
+    'content': r'[②2]\s*내용',
+    'features': r'[③3]\s*특징',
+    'keywords': r'[④4]\s*핵심어',
+    'source': r'[⑤5]\s*원전\s*서지사항',
+    'related': r'[⑥6]\s*관련\s*자료'
+}
+
+# 일반적인 등장인물
+CHARACTER_NAMES = [
+    '설문대할망', '오백장군', '영등신', '삼승할망',
+    '할아버지', '할머니', '할망', '하르방',
+    '장닭', '사왕', '용왕', '도깨비', '도채비',
+    '부자', '선비', '처녀', '총각'
+]
+
+# 제주 지명
+PLACE_NAMES = [
+    '한라산', '백록담', '성산일출봉', '우도',
+    '산방산', '송악산', '영실', '물영아리',
+    '효돈천', '쇠소깍', '천지연', '정방폭포'
+]
+
+# 행정구역 접미사 (단어가 이 글자로 끝나면 지명 후보)
+PLACE_SUFFIXES = '리동읍'
+
+# 세부 카테고리 키워드 (앞에 있을수록 우선)
+CATEGORY_KEYWORDS = [
+    ('창조신화', ['창조', '만들', '생겨']),
+    ('지명유래', ['지명', '이름', '불리']),
+    ('의례', ['굿', '제사', '신앙']),
+    ('자연전설', ['도깨비', '도채비', '귀신'])
+]
+DEFAULT_CATEGORY = '기타'
+
+
+class TextAnalyzer:
+    """섹션/등장인물/지명/카테고리를 한 번에 추출하는 사전 컴파일 분석기"""
+
+    def __init__(self, characters: list = None, places: list = None,
+                 category_keywords: list = None):
+        """
+        Args:
+            characters: 등장인물 사전 (기본 CHARACTER_NAMES)
+            places: 지명 사전 (기본 PLACE_NAMES)
+            category_keywords: [(카테고리, [키워드...])] 우선순위 순 (기본 CATEGORY_KEYWORDS)
+        """
+        self.section_regex = re.compile('|'.join(
+            f'(?P<{name}>{pattern})' for name, pattern in SECTION_PATTERNS.items()
+        ))
+        self.word_regex = re.compile(r'\w+')
+
+        category_keywords = category_keywords or CATEGORY_KEYWORDS
+        self.category_rank = {category: rank for rank, (category, _) in enumerate(category_keywords)}
+
+        self.automaton = KeywordAutomaton()
+        for name in characters or CHARACTER_NAMES:
+            self.automaton.add(name, ('character', name))
+        for name in places or PLACE_NAMES:
+            self.automaton.add(name, ('place', name))
+        for category, keywords in category_keywords:
+            for keyword in keywords:
+                self.automaton.add(keyword, ('category', category))
+        self.automaton.build()
+
+    def find_sections(self, text: str) -> list:
+        """섹션 헤더 위치 [(헤더 시작, 섹션명, 내용 시작)] (섹션별 첫 출현, 위치순)"""
+        positions = {}
+        for match in self.section_regex.finditer(text):
+            name = match.lastgroup
+            if name not in positions:
+                positions[name] = (match.start(), name, match.end())
+        return sorted(positions.values())
+
+    @staticmethod
+    def section_spans(positions: list, text_length: int) -> dict:
+        """헤더 위치 → 섹션명별 (내용 시작, 내용 끝) - 다음 헤더 또는 텍스트 끝까지"""
+        spans = {}
+        for i, (_, name, content_start) in enumerate(positions):
+            if i + 1 < len(positions):
+                end = positions[i + 1][0]
+            else:
+                end = text_length
+            spans[name] = (content_start, end)
+        return spans
+
+    @staticmethod
+    def split_keywords(content: str) -> list:
+        """핵심어 섹션 내용을 키워드 목록으로 (쉼표나 마침표로 분리)"""
+        keywords = re.split(r'[,，.。\n]', content)
+        return [kw.strip() for kw in keywords if kw.strip()]
+
+    def split_sections(self, text: str, positions: list) -> tuple:
+        """헤더 위치로 섹션 내용을 잘라냄
+
+        Returns:
+            (sections, spans) - spans는 섹션명 → (내용 시작, 내용 끝)
+        """
+        sections = {
+            'summary': '',
+            'content': '',
+            'features': '',
+            'keywords': [],
+            'source': '',
+            'related': ''
+        }
+        spans = self.section_spans(positions, len(text))
+
+        for name, (content_start, end) in spans.items():
+            content = text[content_start:end].strip()
+
+            if name == 'keywords':
+                sections[name] = self.split_keywords(content)
+            else:
+                sections[name] = content
+
+        return sections, spans
+
+    def iter_place_words(self, text: str):
+        """접미사 지명 후보 (시작 위치, 단어) - 단어마다 접미사 글자의 마지막 위치까지
+
+        예전 `[\\w]+리`, `[\\w]+동`, `[\\w]+읍` 정규식 세 개의 findall 결과와 같다.
+        """
+        for match in self.word_regex.finditer(text):
+            word = match.group()
+            for suffix in PLACE_SUFFIXES:
+                idx = word.rfind(suffix)
+                if idx >= 1:
+                    yield match.start(), word[:idx + 1]
+
+    def analyze(self, text: str) -> dict:
+        """텍스트 전체 분석
+
+        Returns:
+            {
+                'sections': parse_sections 결과,
+                'characters': 등장인물 (첫 출현 순),
+                'locations': 지명 (첫 출현 순),
+                'category': 내용 섹션 기준 세부 카테고리,
+                'category_hits': 카테고리 → 내용 섹션 내 키워드 출현 수
+            }
+        """
+        sections, spans = self.split_sections(text, self.find_sections(text))
+        content_start, content_end = spans.get('content', (0, 0))
+
+        characters = {}
+        places = {}
+        category_hits = {}
+        for start, end, _, (kind, name) in self.automaton.iter_matches(text):
+            if kind == 'character':
+                characters.setdefault(name, start)
+            elif kind == 'place':
+                places.setdefault(name, start)
+            elif content_start <= start and end <= content_end:
+                category_hits[name] = category_hits.get(name, 0) + 1
+
+        for start, word in self.iter_place_words(text):
+            if start < places.get(word, len(text)):
+                places[word] = start
+
+        return {
+            'sections': sections,
+            'characters': sorted(characters, key=characters.get),
+            'locations': sorted(places, key=places.get),
+            'category': self.pick_category(category_hits),
+            'category_hits': category_hits
+        }
+
+    def pick_category(self, category_hits: dict) -> str:
+        """키워드가 나온 카테고리 중 우선순위가 가장 높은 것"""
+        if not category_hits:
+            return DEFAULT_CATEGORY
+        return min(category_hits, key=self.category_rank.get)
+
+    def stream(self):
+        """텍스트를 조각 단위로 받는 분석 (StreamingAnalysis)"""
+        return StreamingAnalysis(self)
+
+
+class StreamingAnalysis:
+    """TextAnalyzer.analyze를 텍스트 조각 단위로 수행
+
+    조각 경계에 걸친 섹션 헤더/접미사 지명 단어는 경계 근처 글자를 다음 조각으로
+    넘겨(carry) 이어 붙여 찾고, 키워드 오토마톤은 상태를 이어 간다. 카테고리 키워드는
+    그 위치까지 헤더 검색이 확정되는 대로 내용 섹션 안인지 판정하여 개수만 남긴다.
+    메모리에 남는 것은 경계 근처 글자와 등장인물/지명 사전뿐이므로 텍스트 길이와 무관하다.
+    섹션 내용은 finish()가 돌려주는 spans로 원문(예: 임시 파일)에서 잘라 읽는다.
+    """
+
+    # 섹션 헤더 최대 길이 (이보다 긴 헤더는 조각 경계에서 놓칠 수 있음)
+    SECTION_CARRY = 64
+
+    def __init__(self, analyzer: TextAnalyzer):
+        self.analyzer = analyzer
+        self.length = 0  # 지금까지 받은 글자 수
+
+        self._keywords = analyzer.automaton.stream()
+        self._section_carry = ''  # 아직 헤더 검색이 끝나지 않은 꼬리
+        self._word_carry = ''  # 조각 끝에 걸친 단어
+        self._sections = {}  # 섹션명 → (헤더 시작, 섹션명, 내용 시작)
+        self._characters = {}
+        self._places = {}
+        self._category_matches = deque()  # 아직 판정하지 않은 (start, end, category)
+        self._category_hits = {}
+        self._content_end = None  # 내용 섹션 다음 헤더 시작 (확정되면)
+
+    def feed(self, text: str):
+        """조각 하나 추가"""
+        if not text:
+            return
+
+        for start, end, _, (kind, name) in self._keywords.feed(text):
+            if kind == 'character':
+                self._characters.setdefault(name, start)
+            elif kind == 'place':
+                self._places.setdefault(name, start)
+            else:
+                self._category_matches.append((start, end, name))
+
+        self._scan_sections(self._section_carry + text, self.length - len(self._section_carry))
+        self._scan_words(self._word_carry + text, self.length - len(self._word_carry))
+        self.length += len(text)
+        self._count_categories(self.length - len(self._section_carry))
+
+    def _count_categories(self, confirmed: int):
+        """헤더 검색이 끝난 위치(confirmed)까지의 카테고리 키워드를 내용 섹션 기준으로 판정"""
+        content = self._sections.get('content')
+        if content and self._content_end is None:
+            later = [start for start, name, _ in self._sections.values() if start > content[0]]
+            if later:
+                self._content_end = min(later)
+
+        matches = self._category_matches
+        while matches and matches[0][1] <= confirmed:
+            start, end, category = matches.popleft()
+            if content and content[2] <= start and \
+                    (self._content_end is None or end <= self._content_end):
+                self._category_hits[category] = self._category_hits.get(category, 0) + 1
+
+    def _scan_sections(self, window: str, base: int, final: bool = False):
+        """헤더 검색 - 창 끝 SECTION_CARRY 글자 안에서 시작하는 매치는 다음 조각에서 확정"""
+        limit = len(window) if final else len(window) - self.SECTION_CARRY
+        resume_at = max(0, limit)
+        for match in self.analyzer.section_regex.finditer(window):
+            if match.start() >= limit:
+                break
+            name = match.lastgroup
+            if name not in self._sections:
+                self._sections[name] = (base + match.start(), name, base + match.end())
+            resume_at = max(resume_at, match.end())
+        self._section_carry = window[resume_at:]
+
+    def _scan_words(self, window: str, base: int, final: bool = False):
+        """접미사 지명 - 창 끝에 닿은 단어는 다음 조각과 이어 붙여 판단"""
+        cut = len(window)
+        if not final:
+            last = None
+            for last in self.analyzer.word_regex.finditer(window):
+                pass
+            if last is not None and last.end() == len(window):
+                cut = last.start()
+
+        places = self._places
+        for start, word in self.analyzer.iter_place_words(window[:cut]):
+            start += base
+            if start < places.get(word, start + 1):
+                places[word] = start
+        self._word_carry = window[cut:]
+
+    def finish(self) -> dict:
+        """남은 꼬리를 처리하고 결과 반환
+
+        Returns:
+            {
+                'spans': 섹션명 → (내용 시작, 내용 끝) (strip 전),
+                'characters', 'locations', 'category', 'category_hits': analyze와 같음,
+                'length': 전체 글자 수
+            }
+        """
+        end = self.length
+        self._scan_sections(self._section_carry, end - len(self._section_carry), final=True)
+        self._scan_words(self._word_carry, end - len(self._word_carry), final=True)
+        self._count_categories(end)
+
+        positions = sorted(self._sections.values())
+        spans = self.analyzer.section_spans(positions, end)
+        category_hits = self._category_hits
+
+        return {
+            'spans': spans,
+            'characters': sorted(self._characters, key=self._characters.get),
+            'locations': sorted(self._places, key=self._places.get),
+            'category': self.analyzer.pick_category(category_hits),
+            'category_hits': category_hits,
+            'length': end
+        }
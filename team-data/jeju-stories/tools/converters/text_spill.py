@@ -0,0 +1,99 @@
+"""
+대용량 PDF 스트리밍 변환용 임시 텍스트 저장소와 JSON 스트리밍 기록
+페이지 텍스트를 메모리 대신 임시 파일에 쌓아 두고, 설화 JSON을 쓸 때
+raw_text와 섹션 내용을 파일에서 조각 단위로 읽어 바로 기록한다.
+"""
+
+import re
+import json
+import tempfile
+
+# 스트리밍으로 채울 JSON 문자열 값 자리표시 (일반 텍스트에 나오지 않는 NUL로 감쌈)
+PLACEHOLDER = '\x00{}\x00'
+
+
+class TextSpill:
+    """글자 위치로 다시 읽을 수 있는 임시 텍스트 파일
+
+    UTF-32(글자당 4바이트)로 저장하여 글자 위치 → 바이트 위치가 곱셈 한 번으로 정해진다.
+    닫으면 파일은 자동으로 삭제된다.
+    """
+
+    ENCODING = 'utf-32-le'
+    CHAR_BYTES = 4
+
+    def __init__(self, spill_dir: str = None):
+        self._file = tempfile.TemporaryFile(dir=spill_dir)
+        self.length = 0  # 저장된 글자 수
+
+    def write(self, text: str):
+        """텍스트를 끝에 추가"""
+        self._file.seek(0, 2)
+        self._file.write(text.encode(self.ENCODING, 'surrogatepass'))
+        self.length += len(text)
+
+    def read(self, start: int, end: int) -> str:
+        """[start, end) 글자 읽기"""
+        self._file.seek(start * self.CHAR_BYTES)
+        data = self._file.read((end - start) * self.CHAR_BYTES)
+        return data.decode(self.ENCODING, 'surrogatepass')
+
+    def iter_chunks(self, start: int, end: int, chunk_chars: int = 1 << 16):
+        """[start, end)를 chunk_chars 글자씩 나눠 생성"""
+        for pos in range(start, end, chunk_chars):
+            yield self.read(pos, min(pos + chunk_chars, end))
+
+    def close(self):
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def strip_chunks(chunks):
+    """조각 스트림 전체에 str.strip()을 적용한 것과 같은 조각 생성
+
+    앞쪽 공백은 버리고, 조각 끝의 공백은 뒤에 공백 아닌 글자가 올 때만 내보낸다.
+    """
+    started = False
+    trailing = ''
+    for chunk in chunks:
+        if not started:
+            chunk = chunk.lstrip()
+            if not chunk:
+                continue
+            started = True
+
+        body = chunk.rstrip()
+        if body:
+            yield trailing + body
+            trailing = chunk[len(body):]
+        else:
+            trailing += chunk
+
+
+def dump_json_streaming(obj, out, streams: dict, indent: int = None):
+    """json.dump(obj, out, ensure_ascii=False, indent=indent)와 같은 결과를 기록하되
+    자리표시 문자열 값은 streams의 조각으로 채움
+
+    Args:
+        obj: 자리표시(PLACEHOLDER.format(이름))를 값으로 가진 JSON 객체
+        out: 텍스트 파일 객체
+        streams: 자리표시 → 문자열 조각 iterable (각 자리표시는 obj에 한 번만 나와야 함)
+    """
+    text = json.dumps(obj, ensure_ascii=False, indent=indent)
+    quoted = {json.dumps(key, ensure_ascii=False): key for key in streams}
+    pattern = re.compile('|'.join(re.escape(q) for q in quoted))
+
+    pos = 0
+    for match in pattern.finditer(text):
+        out.write(text[pos:match.start()])
+        out.write('"')
+        for chunk in streams[quoted[match.group()]]:
+            out.write(json.dumps(chunk, ensure_ascii=False)[1:-1])
+        out.write('"')
+        pos = match.end()
+    out.write(text[pos:])
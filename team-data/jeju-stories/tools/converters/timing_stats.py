@@ -0,0 +1,123 @@
+"""
+일괄 변환 계측 집계
+파일마다 _collect_stats 결과를 받아 합계/개수와 고정 구간 히스토그램만 유지하므로
+코퍼스의 전체 페이지 수와 무관한 메모리로 단계별 p50/p95를 낼 수 있다.
+"""
+
+import math
+
+
+class DurationHistogram:
+    """소요 시간(초)의 로그 간격 고정 구간 히스토그램
+
+    MIN_SECONDS ~ MAX_SECONDS를 10배마다 BUCKETS_PER_DECADE 구간으로 나눈다.
+    백분위수는 해당 순위가 속한 구간의 상한(관측 최소/최대로 제한)이므로
+    상대 오차는 구간 폭(10^(1/BUCKETS_PER_DECADE), 약 12%) 이내다.
+    """
+
+    MIN_SECONDS = 1e-4
+    MAX_SECONDS = 1e4
+    BUCKETS_PER_DECADE = 20
+
+    def __init__(self):
+        decades = round(math.log10(self.MAX_SECONDS / self.MIN_SECONDS))
+        # [0]: MIN_SECONDS 미만, [-1]: MAX_SECONDS 이상
+        self.counts = [0] * (decades * self.BUCKETS_PER_DECADE + 2)
+        self.count = 0
+        self.total = 0.0
+        self.min = None
+        self.max = None
+
+    def _bucket(self, value: float) -> int:
+        if value < self.MIN_SECONDS:
+            return 0
+        index = int(math.log10(value / self.MIN_SECONDS) * self.BUCKETS_PER_DECADE) + 1
+        return min(index, len(self.counts) - 1)
+
+    def _upper(self, bucket: int) -> float:
+        """구간의 상한 (초)"""
+        return self.MIN_SECONDS * 10 ** (bucket / self.BUCKETS_PER_DECADE)
+
+    def add(self, value: float):
+        self.counts[self._bucket(value)] += 1
+        self.count += 1
+        self.total += value
+        self.min = value if self.min is None else min(self.min, value)
+        self.max = value if self.max is None else max(self.max, value)
+
+    def update(self, values):
+        for value in values:
+            self.add(value)
+
+    def percentile(self, q: float) -> float:
+        """nearest-rank 백분위수 근사값 (비어 있으면 None)"""
+        if not self.count:
+            return None
+        rank = max(1, -(-self.count * q // 100))  # ceil(n * q / 100)
+        seen = 0
+        for bucket, count in enumerate(self.counts):
+            seen += count
+            if seen >= rank:
+                return min(max(self._upper(bucket), self.min), self.max)
+        return self.max
+
+    def describe(self) -> dict:
+        return {
+            'count': self.count,
+            'p50': round(self.percentile(50), 4),
+            'p95': round(self.percentile(95), 4),
+            'total': round(self.total, 3)
+        }
+
+
+class TimingAggregate:
+    """파일별 _collect_stats 결과를 누적하는 집계 (파일 결과는 넣은 뒤 버려도 됨)"""
+
+    def __init__(self, page_stages: tuple, file_stages: tuple):
+        """
+        Args:
+            page_stages: 페이지 단위 단계 이름 (보고서 순서, 'page'는 항상 맨 앞)
+            file_stages: 파일 단위 단계 이름
+        """
+        self.page_stages = ('page',) + tuple(page_stages)
+        self.file_stages = tuple(file_stages)
+        self.per_page = {}  # 단계명 → DurationHistogram
+        self.per_file = {name: DurationHistogram() for name in self.file_stages}
+        self.files = 0
+        self.pages = 0
+        self.chars = 0
+        self.blank_pages = 0
+        self.duplicate_pages = 0
+
+    def add(self, stats: dict):
+        """성공한 파일 하나의 _collect_stats 결과를 누적"""
+        self.files += 1
+        self.pages += stats['pages']
+        self.chars += stats['chars']
+        self.blank_pages += stats['blank_pages']
+        self.duplicate_pages += stats['duplicate_pages']
+        for name, values in stats['page_seconds'].items():
+            self.per_page.setdefault(name, DurationHistogram()).update(values)
+        for name in self.file_stages:
+            self.per_file[name].add(stats['seconds'][name])
+
+    def report(self, wall_seconds: float) -> dict:
+        """단계별 {'count', 'p50', 'p95', 'total'}과 합계 (요약의 timing 항목)"""
+        return {
+            'files': self.files,
+            'pages': self.pages,
+            'chars': self.chars,
+            'blank_pages': self.blank_pages,
+            'duplicate_pages': self.duplicate_pages,
+            'wall_seconds': round(wall_seconds, 3),
+            'pages_per_sec': round(self.pages / wall_seconds, 2) if wall_seconds > 0 else None,
+            'per_page': {
+                name: self.per_page[name].describe()
+                for name in self.page_stages
+                if name in self.per_page and self.per_page[name].count
+            },
+            'per_file': {
+                name: histogram.describe()
+                for name, histogram in self.per_file.items() if self.files
+            }
+        }